@@ -0,0 +1,49 @@
+"""Admin API controller.
+
+Endpoints:
+- GET /api/admin/profiles       → profiles kept in memory by this process, newest first (without stacks)
+- GET /api/admin/profiles/{id}  → folded stacks of one profile (text/plain), ready for flamegraph.pl,
+                                  inferno or speedscope
+
+Only available with `PROFILING_ENABLED`; profiles are recorded for requests sent with
+`X-Profile: 1` and for jobs queued with `POST /api/scraping/run?profile=true`.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from backscrap.app.utils.config import PROFILING_ENABLED
+from backscrap.app.utils.Global import Console
+from backscrap.app.utils.profiling import profile_store
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["Admin"],
+)
+
+
+def _require_profiling() -> None:
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (set PROFILING_ENABLED=true).")
+
+
+@router.get("/profiles")
+async def list_profiles() -> Any:
+    """Summaries of the stored profiles: id, kind (request/job), name, duration and sample count."""
+    _require_profiling()
+    Console.log("Received request: list profiles.")
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str) -> PlainTextResponse:
+    """Folded stacks of a profile, one `thread;frame;...;frame count` line per distinct stack."""
+    _require_profiling()
+    stored = profile_store.get(profile_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' not found (only the last ones are kept).")
+    return PlainTextResponse(stored["folded"])
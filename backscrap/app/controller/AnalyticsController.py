@@ -0,0 +1,110 @@
+"""Analytics API controller.
+
+Endpoints (all accept an optional `window_hours` and `source`):
+- GET /api/analytics/market-cap       → average market cap per coin (top N)
+- GET /api/analytics/change24h        → average 24h change per coin and source (heatmap pivot)
+- GET /api/analytics/volatility       → std of the 24h change per symbol (top N)
+- GET /api/analytics/top              → top N coins by market cap in each source's latest snapshot
+- GET /api/analytics/moving-average   → price and trailing moving average for one symbol
+- GET /api/analytics/series           → price series downsampled to the chart width (LTTB or min/max)
+
+Aggregates are computed by Mongo pipelines and cached per data version.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from backscrap.app.repository.AnalyticsRepository import AnalyticsRepository
+from backscrap.app.services.AnalyticsService import AnalyticsService
+from backscrap.app.utils.downsampling import DownsamplingMethod
+from backscrap.app.utils.Global import Console
+
+analytics_service = AnalyticsService(AnalyticsRepository())
+
+router = APIRouter(
+    prefix="/api/analytics",
+    tags=["Analytics"],
+)
+
+WindowQuery = Query(None, gt=0, description="Optional. Only consider snapshots from the last N hours.")
+SourceQuery = Query(None, description="Optional. Restrict the aggregate to a single source.")
+
+
+def _unwrap(response) -> Any:
+    """Return the payload of a service response or raise an HTTP 500 with its message."""
+    if response.status != 2:
+        raise HTTPException(status_code=500, detail=response.message)
+    return response.data
+
+
+@router.get("/market-cap")
+async def get_market_cap(
+    window_hours: Optional[float] = WindowQuery,
+    source: Optional[str] = SourceQuery,
+    limit: int = Query(10, ge=1, le=100),
+) -> Any:
+    """Average market capitalization per coin, largest first."""
+    Console.log(f"Received request: market-cap ranking (window={window_hours}h, source={source}).")
+    return _unwrap(await analytics_service.market_cap(window_hours, source, limit))
+
+
+@router.get("/change24h")
+async def get_change24h(
+    window_hours: Optional[float] = WindowQuery,
+    source: Optional[str] = SourceQuery,
+) -> Any:
+    """Average 24h percentage change per coin and source, as rows and as a name → source pivot."""
+    Console.log(f"Received request: change24h pivot (window={window_hours}h, source={source}).")
+    return _unwrap(await analytics_service.change24h(window_hours, source))
+
+
+@router.get("/volatility")
+async def get_volatility(
+    window_hours: Optional[float] = WindowQuery,
+    source: Optional[str] = SourceQuery,
+    limit: int = Query(10, ge=1, le=100),
+) -> Any:
+    """Symbols ranked by the standard deviation of their 24h change."""
+    Console.log(f"Received request: volatility ranking (window={window_hours}h, source={source}).")
+    return _unwrap(await analytics_service.volatility(window_hours, source, limit))
+
+
+@router.get("/top")
+async def get_top(
+    window_hours: Optional[float] = WindowQuery,
+    source: Optional[str] = SourceQuery,
+    limit: int = Query(10, ge=1, le=100),
+) -> Any:
+    """Top N coins by market capitalization in the latest snapshot of each source."""
+    Console.log(f"Received request: top {limit} per source (window={window_hours}h, source={source}).")
+    return _unwrap(await analytics_service.top(window_hours, source, limit))
+
+
+@router.get("/moving-average")
+async def get_moving_average(
+    symbol: str = Query(..., description="Coin symbol, e.g. BTC."),
+    window: int = Query(10, ge=1, le=1000, description="Number of snapshots in the trailing window."),
+    window_hours: Optional[float] = WindowQuery,
+    source: Optional[str] = SourceQuery,
+) -> Any:
+    """Price series for one symbol with a trailing moving average, per source."""
+    Console.log(f"Received request: moving average for '{symbol}' (window={window}).")
+    return _unwrap(await analytics_service.moving_average(window_hours, source, symbol, window))
+
+
+@router.get("/series")
+async def get_price_series(
+    symbols: List[str] = Query(..., description="Coin symbols, e.g. symbols=BTC&symbols=ETH."),
+    start: Optional[datetime] = Query(None, description="Optional. First timestamp of the range (ISO 8601)."),
+    end: Optional[datetime] = Query(None, description="Optional. Last timestamp of the range (ISO 8601)."),
+    source: Optional[str] = SourceQuery,
+    width: int = Query(800, ge=10, le=10000, description="Chart width in pixels: maximum points per series."),
+    method: DownsamplingMethod = Query(DownsamplingMethod.LTTB, description="lttb (shape) or minmax (keeps spikes)."),
+) -> Any:
+    """Price series per symbol and source, downsampled to at most `width` points each."""
+    Console.log(f"Received request: price series for {symbols} ({method.value}, width={width}).")
+    return _unwrap(await analytics_service.price_series(symbols, start, end, source, width, method))
@@ -0,0 +1,34 @@
+"""Anomaly alerts API controller.
+
+Endpoint:
+- GET /api/anomalies  → most recent ingest-time alerts (parse, scale, jump, divergence)
+
+Live alerts are streamed by `/api/events/anomaly-stream`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Literal, Optional
+
+from fastapi import APIRouter, Query
+
+from backscrap.app.services.AnomalyService import AnomalyService
+from backscrap.app.utils.Global import Console
+
+anomaly_service = AnomalyService()
+
+router = APIRouter(
+    prefix="/api/anomalies",
+    tags=["Anomalies"],
+)
+
+
+@router.get("")
+async def get_anomalies(
+    limit: int = Query(50, ge=1, le=500),
+    type: Optional[Literal["parse", "scale", "jump", "divergence"]] = Query(None, description="Optional. Alert type."),
+    source: Optional[str] = Query(None, description="Optional. Restrict to a single source."),
+) -> Any:
+    """Return the most recent alerts, newest first."""
+    Console.log(f"Received request: anomalies (type={type}, source={source}).")
+    return anomaly_service.get_alerts(limit, type, source).data
@@ -0,0 +1,55 @@
+"""Cross-source consolidation API controller.
+
+Endpoints:
+- GET /api/consolidated                 → consolidated price and spread per symbol (latest bucket)
+- GET /api/consolidated/mapping         → canonical symbol mapping across sources
+- GET /api/consolidated/{symbol}        → consolidated history of one symbol over the retained buckets
+
+Live updates are streamed by `/api/events/consolidated-stream`.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query
+
+from backscrap.app.repository.ScrappingRepository import ScrappingRepository
+from backscrap.app.services.ConsolidationService import ConsolidationService
+from backscrap.app.utils.Global import Console
+
+consolidation_service = ConsolidationService(ScrappingRepository())
+
+router = APIRouter(
+    prefix="/api/consolidated",
+    tags=["Consolidation"],
+)
+
+
+@router.get("")
+async def get_consolidated() -> Any:
+    """Consolidated price (median across sources) and spread for the most recent bucket."""
+    Console.log("Received request: latest consolidated prices.")
+    response = consolidation_service.get_latest()
+    if response.status != 2:
+        raise HTTPException(status_code=404, detail=response.message)
+    return response.data
+
+
+@router.get("/mapping")
+async def get_symbol_mapping() -> Any:
+    """Canonical symbol → per-source ticker mapping observed so far."""
+    return consolidation_service.get_symbol_map().data
+
+
+@router.get("/{symbol}")
+async def get_consolidated_symbol(
+    symbol: str,
+    limit: int = Query(100, ge=1, le=5000, description="Maximum number of buckets to return (newest last)."),
+) -> Any:
+    """Consolidated price and spread history for one symbol."""
+    Console.log(f"Received request: consolidated history for '{symbol}'.")
+    response = consolidation_service.get_symbol_history(symbol, limit)
+    if response.status != 2:
+        raise HTTPException(status_code=404, detail=response.message)
+    return response.data
@@ -0,0 +1,38 @@
+"""Technical indicator API controller.
+
+Endpoint:
+- GET /api/indicators  → current SMA/EMA/RSI/volatility per (source, symbol)
+
+Values are maintained incrementally on every stored batch; the request only
+reads the in-memory state.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from backscrap.app.repository.IndicatorRepository import IndicatorRepository
+from backscrap.app.services.IndicatorService import IndicatorService
+from backscrap.app.utils.Global import Console
+
+indicator_service = IndicatorService(IndicatorRepository())
+
+router = APIRouter(
+    prefix="/api/indicators",
+    tags=["Indicators"],
+)
+
+
+@router.get("")
+async def get_indicators(
+    source: Optional[str] = Query(None, description="Optional. Restrict to a single source."),
+    symbol: Optional[str] = Query(None, description="Optional. Coin symbol, e.g. BTC."),
+) -> Any:
+    """Return the current indicator values for the matching series."""
+    Console.log(f"Received request: indicators (source={source}, symbol={symbol}).")
+    response = indicator_service.get_indicators(source, symbol)
+    if response.status != 2:
+        raise HTTPException(status_code=404, detail=response.message)
+    return response.data
@@ -0,0 +1,44 @@
+"""Price projection API controller.
+
+Endpoint:
+- GET /api/projections  → forecasts with prediction intervals per (source, symbol)
+
+Models (`model` query parameter): `ewma`, `linear` (rolling regression) and
+`holt_winters`. Fitted state is kept in memory and updated on every stored
+batch; forecasts are cached until the series receives a new point.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from backscrap.app.repository.ScrappingRepository import ScrappingRepository
+from backscrap.app.services.ProjectionService import ProjectionService
+from backscrap.app.utils.Global import Console
+
+projection_service = ProjectionService(ScrappingRepository())
+
+router = APIRouter(
+    prefix="/api/projections",
+    tags=["Projections"],
+)
+
+
+@router.get("")
+async def get_projections(
+    symbol: Optional[str] = Query(None, description="Optional. Coin symbol, e.g. BTC."),
+    source: Optional[str] = Query(None, description="Optional. Restrict to a single source."),
+    model: Literal["ewma", "linear", "holt_winters"] = Query("holt_winters"),
+    horizon: int = Query(10, ge=1, le=500, description="Number of future steps (snapshot intervals)."),
+    level: float = Query(0.95, description="Prediction interval level: 0.8, 0.9, 0.95 or 0.99."),
+) -> Any:
+    """Return forecasts with prediction intervals for the matching series."""
+    Console.log(f"Received request: projections (symbol={symbol}, source={source}, model={model}).")
+    response = projection_service.get_projections(symbol, source, model, horizon, level)
+    if response.status == 4:
+        raise HTTPException(status_code=422, detail=response.message)
+    if response.status != 2:
+        raise HTTPException(status_code=404, detail=response.message)
+    return response.data
@@ -0,0 +1,36 @@
+"""Embedded scheduler API controller.
+
+Endpoint:
+- GET /api/scheduler  → next run, last result and lease per source, plus this worker's view
+
+The scheduler itself only runs when `EMBEDDED_SCHEDULER` is enabled; it is
+started and stopped by the application lifespan.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, HTTPException
+
+from backscrap.app.controller.ScrappingController import job_service, scrapping_service
+from backscrap.app.repository.SchedulerRepository import SchedulerRepository
+from backscrap.app.services.SchedulerService import SchedulerService
+from backscrap.app.utils.Global import Console
+
+scheduler_service = SchedulerService(SchedulerRepository(), scrapping_service, job_service)
+
+router = APIRouter(
+    prefix="/api/scheduler",
+    tags=["Scheduler"],
+)
+
+
+@router.get("")
+async def get_scheduler_state() -> Any:
+    """Return the persisted scheduling state of every source."""
+    Console.log("Received request: embedded scheduler state.")
+    response = await scheduler_service.get_state()
+    if response.status != 2:
+        raise HTTPException(status_code=500, detail=response.message)
+    return response.data
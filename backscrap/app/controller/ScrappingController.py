@@ -2,25 +2,38 @@
 
 Endpoints:
 - GET  /api/scraping/sources      → list available scraping sources
-- POST /api/scraping/run          → start a background scraping task for a given source
-- GET  /api/scraping/results      → fetch stored scraping results (optionally filtered by source)
+- POST   /api/scraping/run          → queue a scraping job for a given source; returns its job id
+                                      (`profile=true` records a profile of the run, see /api/admin/profiles)
+- GET    /api/scraping/jobs         → recent jobs (optionally filtered by status and source)
+- GET    /api/scraping/jobs/{id}    → status, result and per-stage timings of a job
+- DELETE /api/scraping/jobs/{id}    → cancel a queued or running job
+- GET    /api/scraping/results      → fetch stored scraping results (optionally by source, time window, symbols
+                                      and newer than `since`)
+- GET    /api/scraping/symbols      → symbols present in the stored results
+- GET    /api/scraping/health       → circuit-breaker state per source
 
 All runtime behavior and control flow remain unchanged.
 """
 
 from __future__ import annotations
 
+import math
+from datetime import datetime
 from typing import Optional, Any, List
 
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Query
 
+from backscrap.app.services.JobService import JobPriority, JobService, JobStatus
 from backscrap.app.services.ScrappingService import ScrappingService
+from backscrap.app.repository.JobRepository import JobRepository
 from backscrap.app.repository.ScrappingRepository import ScrappingRepository
 from backscrap.app.utils.Global import ResponseUtil, Console  # ResponseUtil kept for compatibility
 
 # Instantiate repository and service (same behavior as before)
 repository = ScrappingRepository()
 scrapping_service = ScrappingService(repository)
+# Bounded worker pool that runs the scrapes; started/stopped by the app lifespan
+job_service = JobService(JobRepository(), scrapping_service)
 
 # Dynamically obtain available sources for validation and documentation (evaluated at import time)
 AVAILABLE_SOURCES: List[str] = scrapping_service.get_available_sources()
@@ -41,30 +54,88 @@ async def get_available_sources() -> list[str]:
 
 @router.post("/run", status_code=202)
 async def run_scraping_task(
-    background_tasks: BackgroundTasks,
     source: str = Query(
         ...,
         description="The data source to scrape. Options are obtained dynamically from the service.",
         enum=AVAILABLE_SOURCES,
     ),
+    priority: JobPriority = Query(
+        JobPriority.MANUAL,
+        description="Queue priority; manual jobs run before scheduled ones.",
+    ),
+    profile: bool = Query(
+        False,
+        description="Record a sampling profile of the scrape (only with PROFILING_ENABLED).",
+    ),
 ) -> dict:
-    """Start a background web-scraping task for the specified source.
+    """Queue a web-scraping job for the specified source.
 
-    The API responds immediately while the task runs in the background.
+    The API responds immediately with the job id; poll /jobs/{id} for the outcome.
     """
     Console.log(f"Received request: start scraping for source '{source}'.")
 
-    try:
-        # Schedule the long-running scraping task in background (logic preserved)
-        background_tasks.add_task(scrapping_service.run_scraping_and_save, source)
-
-        # Immediate response to the client
-        return {"message": f"Scraping task for '{source}' started in the background."}
+    # Don't even queue a task while the source's circuit is open (as last saved by the workers in workers mode)
+    if job_service.remote:
+        await scrapping_service.load_health()
+    retry_after = scrapping_service.health.breaker(source).retry_after()
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Circuit open for '{source}'; retry in {retry_after:.0f}s.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
 
+    try:
+        response = await job_service.submit(source, priority, profiled=profile)
     except Exception as e:  # noqa: BLE001
         Console.error(f"Error dispatching scraping task: {e}")
         raise HTTPException(status_code=500, detail=f"Internal error when starting the task: {str(e)}")
 
+    if response.status == 3:
+        raise HTTPException(status_code=429, detail=response.message)
+    if response.status != 2:
+        raise HTTPException(status_code=500, detail=response.message)
+    return {"jobId": response.data["id"], "status": response.data["status"], "message": response.message}
+
+
+@router.get("/jobs")
+async def list_scraping_jobs(
+    status: Optional[JobStatus] = Query(None, description="Optional. Only jobs in this state."),
+    source: Optional[str] = Query(None, description="Optional. Only jobs for this source.", enum=AVAILABLE_SOURCES),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of jobs, newest first."),
+) -> Any:
+    """Recent scraping jobs, newest first, plus the state of this worker's queue."""
+    Console.log("Received request: list scraping jobs.")
+    response = await job_service.list_jobs(status, source, limit)
+    if response.status != 2:
+        raise HTTPException(status_code=500, detail=response.message)
+    return {"queue": await job_service.stats(), "jobs": response.data}
+
+
+@router.get("/jobs/{job_id}")
+async def get_scraping_job(job_id: str) -> Any:
+    """Status, result and per-stage timings of a scraping job."""
+    Console.log(f"Received request: scraping job '{job_id}'.")
+    response = await job_service.get_job(job_id)
+    if response.status == 3:
+        raise HTTPException(status_code=404, detail=response.message)
+    if response.status != 2:
+        raise HTTPException(status_code=500, detail=response.message)
+    return response.data
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_scraping_job(job_id: str) -> Any:
+    """Cancel a queued job, or interrupt a running one."""
+    Console.log(f"Received request: cancel scraping job '{job_id}'.")
+    response = await job_service.cancel(job_id)
+    if response.status == 3:
+        status_code = 404 if "No existe" in response.message else 409
+        raise HTTPException(status_code=status_code, detail=response.message)
+    if response.status != 2:
+        raise HTTPException(status_code=500, detail=response.message)
+    return response.data
+
 
 @router.get("/results")
 async def get_scrapping_results(
@@ -73,15 +144,50 @@ async def get_scrapping_results(
         description="Optional. Filter results by a specific source. Options are obtained dynamically.",
         enum=AVAILABLE_SOURCES,
     ),
+    since: Optional[datetime] = Query(
+        None,
+        description="Optional. Only snapshots stored strictly after this timestamp (ISO 8601), oldest first.",
+    ),
+    start: Optional[datetime] = Query(None, description="Optional. First timestamp of the window (ISO 8601)."),
+    end: Optional[datetime] = Query(None, description="Optional. Last timestamp of the window (ISO 8601)."),
+    symbols: Optional[List[str]] = Query(
+        None,
+        description="Optional. Keep only these coins' rows, e.g. symbols=BTC&symbols=ETH.",
+    ),
 ) -> Any:
-    """Fetch stored scraping results, optionally filtered by source."""
-    Console.log(f"Received request: fetch results for source '{source or 'all sources'}'.")
+    """Fetch stored scraping results, optionally filtered by source, time window, symbols and timestamp."""
+    Console.log(
+        f"Received request: fetch results for source '{source or 'all sources'}' "
+        f"in [{start or '-'}, {end or '-'}] for {symbols or 'all symbols'} since {since or 'the beginning'}."
+    )
     try:
-        response = await scrapping_service.get_results(source)
+        response = await scrapping_service.get_results(source, since, start, end, symbols)
         # If not success (status != 2), return 404 with the service message (logic preserved)
         if response.status != 2:
             raise HTTPException(status_code=404, detail=response.message)
-        return response.data
+        # ResponseUtil turns an empty list into {}; "nothing new" must stay a list
+        return response.data or []
     except Exception as e:  # noqa: BLE001
         Console.error(f"Controller error while fetching results: {e}")
         raise HTTPException(status_code=500, detail=f"Internal error when fetching results: {str(e)}")
+
+
+@router.get("/symbols", response_model=list[str])
+async def get_symbols(
+    source: Optional[str] = Query(None, description="Optional. Only symbols scraped from this source.", enum=AVAILABLE_SOURCES),
+) -> list[str]:
+    """Sorted list of the symbols present in the stored results."""
+    Console.log("Received request: list stored symbols.")
+    response = await scrapping_service.get_symbols(source)
+    if response.status != 2:
+        raise HTTPException(status_code=500, detail=response.message)
+    return response.data or []
+
+
+@router.get("/health")
+async def get_sources_health() -> Any:
+    """Circuit-breaker state, failure counters and next retry time per source."""
+    Console.log("Received request: sources health.")
+    if job_service.remote:
+        await scrapping_service.load_health()
+    return scrapping_service.get_health().data
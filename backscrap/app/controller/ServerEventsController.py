@@ -1,34 +1,148 @@
-"""Server-Sent Events (SSE) controller (logic preserved, English only).
+"""Server-Sent Events (SSE) controller.
 
-Endpoint:
-- GET /api/events/status-stream  → streams real-time task status updates
+Endpoints:
+- GET /api/events/status-stream        → streams real-time task status updates
+- GET /api/events/consolidated-stream  → streams consolidated price/spread updates per source batch
+- GET /api/events/anomaly-stream       → streams ingest-time anomaly alerts
+- GET /api/events/price-stream         → streams per-scrape quote deltas with Last-Event-ID replay
+- GET /api/events/stats                → subscriber counts, queue depth and lag per channel
+- WS  /api/events/ws                   → filtered (symbols/sources/types) events in batched frames
 
-Behavior is unchanged: subscribes to the 'scraping_events' channel from the shared
-broadcaster and yields incoming messages as SSE data frames.
+Every stream goes through the shared fan-out hub: one broadcaster subscription
+per channel, a bounded queue per client with a configurable overflow policy
+(`?policy=drop_oldest|coalesce|disconnect`, default `SSE_OVERFLOW_POLICY`) and
+keepalive pings every `SSE_HEARTBEAT_SECONDS`. The WebSocket endpoint filters
+events server-side and flushes them in batches every `WS_FLUSH_MS`.
 """
 
 from __future__ import annotations
 
-from typing import AsyncIterator, Dict, Any
+from typing import AsyncIterator, Dict, Any, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Query, WebSocket
 from sse_starlette.sse import EventSourceResponse
 
-from backscrap.app.utils.broadcaster import broadcaster
+from backscrap.app.pojo.enums.enumslist import ListaCanales
+from backscrap.app.repository.ScrappingRepository import ScrappingRepository
+from backscrap.app.services.PriceDeltaService import PriceDeltaService
+from backscrap.app.utils.config import SSE_HEARTBEAT_SECONDS, SSE_SEND_TIMEOUT_SECONDS, WS_FLUSH_MS
+from backscrap.app.utils.fanout import OverflowPolicy, hub
+from backscrap.app.utils.stream_filters import StreamSession
+
+price_delta_service = PriceDeltaService(ScrappingRepository())
 
 router = APIRouter(
     prefix="/api/events",
     tags=["events"],
 )
 
+PolicyQuery = Query(None, description="Optional. Overflow policy for this client when it falls behind.")
+
+
+def _stream(channel: str, event_name: Optional[str], policy: Optional[OverflowPolicy]) -> EventSourceResponse:
+    """Build an SSE response fed by a bounded hub subscription on `channel`."""
+    async def event_generator() -> AsyncIterator[Dict[str, Any]]:
+        async with hub.subscribe(channel, policy=policy) as subscription:
+            async for message in subscription:
+                # Yield the message payload; EventSourceResponse formats it as SSE.
+                yield {"event": event_name, "data": message} if event_name else {"data": message}
+
+    return EventSourceResponse(
+        event_generator(),
+        ping=SSE_HEARTBEAT_SECONDS,
+        send_timeout=SSE_SEND_TIMEOUT_SECONDS,
+    )
+
 
 @router.get("/status-stream")
-async def stream_status() -> EventSourceResponse:
+async def stream_status(policy: Optional[OverflowPolicy] = PolicyQuery) -> EventSourceResponse:
     """SSE endpoint that streams real-time status updates for scraping tasks."""
+    return _stream(ListaCanales.ScrapingEvents.value, None, policy)
+
+
+@router.get("/consolidated-stream")
+async def stream_consolidated(policy: Optional[OverflowPolicy] = PolicyQuery) -> EventSourceResponse:
+    """SSE endpoint that streams the consolidated rows changed by each stored batch."""
+    return _stream(ListaCanales.ConsolidationEvents.value, "consolidated", policy)
+
+
+@router.get("/anomaly-stream")
+async def stream_anomalies(policy: Optional[OverflowPolicy] = PolicyQuery) -> EventSourceResponse:
+    """SSE endpoint that streams anomaly alerts raised while ingesting scraped batches."""
+    return _stream(ListaCanales.AnomalyEvents.value, "anomaly", policy)
+
+
+@router.get("/price-stream")
+async def stream_prices(
+    policy: Optional[OverflowPolicy] = PolicyQuery,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+) -> EventSourceResponse:
+    """SSE endpoint that streams the quotes changed by each scrape as compact deltas.
+
+    A new client (or one too far behind the replay buffer) first receives a
+    `snapshot` event with the current quotes; a reconnecting client receives
+    the buffered deltas after its `Last-Event-ID`. Slow clients are
+    disconnected by default rather than silently losing deltas.
+    """
+    try:
+        last_seen = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_seen = None
+
     async def event_generator() -> AsyncIterator[Dict[str, Any]]:
-        async with broadcaster.subscribe(channel="scraping_events") as subscriber:
-            async for event in subscriber:
-                # Yield the message payload; EventSourceResponse formats it as SSE.
-                yield {"data": event.message}
+        # Subscribe before reading the buffer so nothing published in between is lost
+        async with hub.subscribe(ListaCanales.PriceDeltas.value, policy=policy or OverflowPolicy.DISCONNECT) as subscription:
+            backlog = price_delta_service.replay_since(last_seen)
+            if backlog is None:
+                sent_id, snapshot = price_delta_service.snapshot()
+                yield {"id": str(sent_id), "event": "snapshot", "data": snapshot}
+            else:
+                sent_id = last_seen
+                for event_id, message in backlog:
+                    yield {"id": str(event_id), "event": "delta", "data": message}
+                    sent_id = event_id
+
+            async for message in subscription:
+                event_id = price_delta_service.event_id(message)
+                if event_id <= sent_id:
+                    continue  # Already delivered by the snapshot or the replay
+                sent_id = event_id
+                yield {"id": str(event_id), "event": "delta", "data": message}
+
+    return EventSourceResponse(
+        event_generator(),
+        ping=SSE_HEARTBEAT_SECONDS,
+        send_timeout=SSE_SEND_TIMEOUT_SECONDS,
+    )
+
+
+@router.get("/stats")
+async def get_stream_stats() -> dict:
+    """Fan-out statistics: subscribers, queued messages, lag and drops per channel."""
+    return hub.stats()
+
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    symbols: Optional[str] = None,
+    sources: Optional[str] = None,
+    types: Optional[str] = None,
+    flush_ms: int = WS_FLUSH_MS,
+) -> None:
+    """WebSocket endpoint with server-side filtering and batched frames.
 
-    return EventSourceResponse(event_generator())
+    The initial subscription comes from the query string (comma separated
+    `symbols`, `sources` and `types` among status/price/consolidated/anomaly;
+    empty means all). Clients can change it at any time by sending
+    `{"action": "subscribe", "symbols": [...], "sources": [...], "types": [...], "flushMs": 250}`.
+    Matching events are sent as `{"type": "batch", "events": [{"type", "data"}, ...]}`.
+    """
+    await websocket.accept()
+    try:
+        event_filter = StreamSession.parse_filter({"symbols": symbols, "sources": sources, "types": types})
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close(code=1008)
+        return
+    await StreamSession(websocket, event_filter, flush_ms).run()
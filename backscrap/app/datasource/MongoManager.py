@@ -1,9 +1,47 @@
+import threading
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Any, List
+from pymongo import IndexModel, ReplaceOne, ReturnDocument, monitoring
+from pymongo.errors import BulkWriteError
+from typing import Any, Dict, List, Optional, Tuple
 from bson import ObjectId
 from typing import Union
 from backscrap.app.pojo.enums.enumslist import ListaOperadoresCondicionales
 from backscrap.app.utils.Global import Console
+from backscrap.app.utils.metrics import MONGO_COMMAND_SECONDS
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Registra la latencia de cada comando que envía el driver (find, insert,
+    aggregate, ...) en `mongo_command_duration_seconds`, también los que los
+    repositorios lanzan directamente sobre `db`.
+    """
+
+    def __init__(self):
+        # request_id -> colección del comando, hasta que llega su respuesta
+        self._collections: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        # getMore lleva el id del cursor como valor y la colección aparte
+        key = "collection" if event.command_name == "getMore" else event.command_name
+        target = event.command.get(key)
+        with self._lock:
+            self._collections[event.request_id] = target if isinstance(target, str) else ""
+
+    def _observe(self, event, outcome: str):
+        with self._lock:
+            collection = self._collections.pop(event.request_id, "")
+        MONGO_COMMAND_SECONDS.labels(command=event.command_name, collection=collection, outcome=outcome).observe(
+            event.duration_micros / 1e6
+        )
+
+    def succeeded(self, event):
+        self._observe(event, "success")
+
+    def failed(self, event):
+        self._observe(event, "failure")
+
 
 class MongoManager:
     _instance = None
@@ -12,13 +50,34 @@ class MongoManager:
         if not mongo_uri or not db_name:
             raise ValueError("Se deben proporcionar la URI y el nombre de la base de datos.")
         self.mongo_uri = mongo_uri
-        self.client = AsyncIOMotorClient(self.mongo_uri)
+        self.client = AsyncIOMotorClient(self.mongo_uri, event_listeners=[MongoCommandMetrics()])
         self.db = self.client[db_name]
 
     async def close_connection(self):
         if self.client:
             self.client.close()
-            print("Conexión a MongoDB cerrada.")
+            Console.log("Conexión a MongoDB cerrada.")
+
+    async def ping(self) -> None:
+        """
+        Envía el comando `ping` al servidor. Lanza la excepción del driver si no
+        responde; varias llamadas concurrentes abren varias conexiones del pool.
+        """
+        await self.client.admin.command("ping")
+
+    async def crearIndices(self, collection_name: str, indices: List[IndexModel]) -> List[str]:
+        """
+        Crea los índices que falten en la colección (los existentes no se modifican).
+
+        Args:
+            collection_name (str): Nombre de la colección.
+            indices (list): Definiciones `IndexModel` de pymongo.
+
+        Returns:
+            list: Nombres de los índices.
+        """
+        collection = self.db[collection_name]
+        return await collection.create_indexes(indices)
 
     async def guardar(self, collection_name: str, document_data: dict) -> Union[str, None]:
         """
@@ -34,7 +93,7 @@ class MongoManager:
             None: Si ocurre un error durante la operación.
         """
         if not isinstance(document_data, dict):
-            print("Error: document_data debe ser un diccionario.")
+            Console.error("document_data debe ser un diccionario.")
             return None
 
         try:
@@ -44,7 +103,7 @@ class MongoManager:
             # Retornar el ID del documento insertado como cadena
             return str(result.inserted_id)
         except Exception as e:
-            print(f"Error al guardar documento en {collection_name}: {e}")
+            Console.error(f"Error al guardar documento en {collection_name}: {e}")
             return None
     
     async def actualizar(self, collection_name, document_id, document_data):
@@ -93,7 +152,7 @@ class MongoManager:
                 del document["_id"]
             return document
         except Exception as e:
-            print(f"Error al recuperar documento: {e}")
+            Console.error(f"Error al recuperar documento: {e}")
             return None
     
     async def list(self, collection_name: str) -> list:
@@ -118,7 +177,7 @@ class MongoManager:
 
             return documents
         except Exception as e:
-            print(f"Error al listar documentos: {e}")
+            Console.error(f"Error al listar documentos: {e}")
             return []
     
     async def listWithCondition(
@@ -162,3 +221,221 @@ class MongoManager:
 
         return documents
 
+    async def aggregate(self, collection_name: str, pipeline: List[dict]) -> List[dict]:
+        """
+        Ejecuta un pipeline de agregación sobre la colección especificada.
+
+        Args:
+            collection_name (str): Nombre de la colección.
+            pipeline (list): Etapas del pipeline de agregación de MongoDB.
+
+        Returns:
+            list: Documentos resultantes tal como los devuelve el servidor.
+        """
+        collection = self.db[collection_name]
+        cursor = collection.aggregate(pipeline)
+        return await cursor.to_list(length=None)
+
+    async def lastDocumentId(self, collection_name: str) -> Union[str, None]:
+        """
+        Recupera el _id del documento insertado más recientemente.
+
+        Los ObjectId crecen con el tiempo de inserción, por lo que el mayor _id
+        sirve como versión barata de los datos de la colección.
+
+        Args:
+            collection_name (str): Nombre de la colección.
+
+        Returns:
+            str: _id del último documento como cadena, o None si la colección está vacía.
+        """
+        collection = self.db[collection_name]
+        document = await collection.find_one({}, projection={"_id": 1}, sort=[("_id", -1)])
+        return str(document["_id"]) if document else None
+
+    async def upsertMany(self, collection_name: str, documents: List[dict]) -> int:
+        """
+        Inserta o reemplaza varios documentos por su _id en una sola operación bulk.
+
+        Args:
+            collection_name (str): Nombre de la colección.
+            documents (list): Documentos con un campo "_id" definido por el llamador.
+
+        Returns:
+            int: Número de documentos insertados o modificados.
+        """
+        if not documents:
+            return 0
+        collection = self.db[collection_name]
+        operations = [ReplaceOne({"_id": document["_id"]}, document, upsert=True) for document in documents]
+        result = await collection.bulk_write(operations, ordered=False)
+        return result.upserted_count + result.modified_count
+
+    async def upsertManyIfNewer(self, collection_name: str, documents: List[dict], campo: str) -> int:
+        """
+        Como `upsertMany`, pero solo reemplaza los documentos guardados cuyo `campo`
+        es menor que el del documento nuevo (o no existe): nunca pisa un estado más reciente.
+
+        El upsert de un documento más antiguo choca con el `_id` existente (error
+        11000) y se descarta; los demás se escriben igualmente.
+
+        Args:
+            collection_name (str): Nombre de la colección.
+            documents (list): Documentos con "_id" y `campo` definidos por el llamador.
+            campo (str): Campo de versión (fecha o número) que decide cuál es más reciente.
+
+        Returns:
+            int: Número de documentos insertados o modificados.
+        """
+        if not documents:
+            return 0
+        collection = self.db[collection_name]
+        operations = [
+            ReplaceOne(
+                {"_id": document["_id"], "$or": [{campo: {"$lt": document[campo]}}, {campo: None}]},
+                document,
+                upsert=True,
+            )
+            for document in documents
+        ]
+        try:
+            result = await collection.bulk_write(operations, ordered=False)
+            return result.upserted_count + result.modified_count
+        except BulkWriteError as e:
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+            return e.details.get("nUpserted", 0) + e.details.get("nModified", 0)
+
+    async def insertIfMissing(self, collection_name: str, document: dict) -> bool:
+        """
+        Inserta el documento solo si no existe otro con el mismo _id.
+
+        Args:
+            collection_name (str): Nombre de la colección.
+            document (dict): Documento con un campo "_id" definido por el llamador.
+
+        Returns:
+            bool: True si se insertó, False si ya existía.
+        """
+        collection = self.db[collection_name]
+        result = await collection.update_one({"_id": document["_id"]}, {"$setOnInsert": document}, upsert=True)
+        return result.upserted_id is not None
+
+    async def findOneAndUpdate(
+        self,
+        collection_name: str,
+        filtro: dict,
+        update: dict,
+        sort: Optional[List[Tuple[str, int]]] = None
+    ) -> Union[dict, None]:
+        """
+        Actualiza de forma atómica el primer documento que cumple el filtro.
+
+        Permite operaciones de tipo compare-and-swap: si otro proceso modificó
+        el documento antes, el filtro deja de cumplirse y no se actualiza nada.
+
+        Args:
+            collection_name (str): Nombre de la colección.
+            filtro (dict): Condición de MongoDB que debe cumplir el documento.
+            update (dict): Operadores de actualización ($set, $inc, ...).
+            sort (list): Pares (campo, dirección) que deciden qué documento se toma, opcional.
+
+        Returns:
+            dict: Documento ya actualizado, o None si ninguno cumplía el filtro.
+        """
+        collection = self.db[collection_name]
+        return await collection.find_one_and_update(filtro, update, sort=sort, return_document=ReturnDocument.AFTER)
+
+    async def updateOne(self, collection_name: str, filtro: dict, update: dict) -> int:
+        """
+        Actualiza el primer documento que cumple el filtro.
+
+        Args:
+            collection_name (str): Nombre de la colección.
+            filtro (dict): Condición de MongoDB que debe cumplir el documento.
+            update (dict): Operadores de actualización ($set, $inc, ...).
+
+        Returns:
+            int: Número de documentos modificados (0 o 1).
+        """
+        collection = self.db[collection_name]
+        result = await collection.update_one(filtro, update)
+        return result.modified_count
+
+    async def updateMany(self, collection_name: str, filtro: dict, update: dict) -> int:
+        """
+        Actualiza todos los documentos que cumplen el filtro.
+
+        Args:
+            collection_name (str): Nombre de la colección.
+            filtro (dict): Condición de MongoDB que deben cumplir los documentos.
+            update (dict): Operadores de actualización ($set, $inc, ...).
+
+        Returns:
+            int: Número de documentos modificados.
+        """
+        collection = self.db[collection_name]
+        result = await collection.update_many(filtro, update)
+        return result.modified_count
+
+    async def distinct(self, collection_name: str, campo: str, filtro: Optional[dict] = None) -> list:
+        """
+        Recupera los valores distintos de un campo (admite rutas como "data.symbol").
+
+        Args:
+            collection_name (str): Nombre de la colección.
+            campo (str): Campo o ruta con notación de puntos.
+            filtro (dict): Condición de MongoDB, opcional.
+
+        Returns:
+            list: Valores distintos, sin orden garantizado.
+        """
+        collection = self.db[collection_name]
+        return await collection.distinct(campo, filtro or {})
+
+    async def countDocuments(self, collection_name: str, filtro: dict) -> int:
+        """
+        Cuenta los documentos que cumplen un filtro de MongoDB.
+
+        Args:
+            collection_name (str): Nombre de la colección.
+            filtro (dict): Condición de MongoDB.
+
+        Returns:
+            int: Número de documentos.
+        """
+        collection = self.db[collection_name]
+        return await collection.count_documents(filtro)
+
+    async def find(
+        self,
+        collection_name: str,
+        filtro: dict,
+        sort: Optional[List[Tuple[str, int]]] = None,
+        limit: int = 0
+    ) -> List[dict]:
+        """
+        Recupera los documentos que cumplen un filtro de MongoDB arbitrario.
+
+        Args:
+            collection_name (str): Nombre de la colección.
+            filtro (dict): Condición de MongoDB.
+            sort (list): Pares (campo, dirección) para ordenar, opcional.
+            limit (int): Máximo de documentos (0 = sin límite).
+
+        Returns:
+            list: Documentos con el campo "id" como cadena.
+        """
+        collection = self.db[collection_name]
+        cursor = collection.find(filtro)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        documents = await cursor.to_list(length=None)
+
+        for document in documents:
+            document["id"] = str(document["_id"])
+            del document["_id"]
+
+        return documents
@@ -1,16 +1,33 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+import os
+import threading
+
 from backscrap.app.datasource.MongoManager import MongoManager
 from backscrap.app.utils.config import MONGO_DATABASE_URL, MONGO_DATABASE_NAME
 
 class MongoManagerCriptoScrapping(MongoManager):
     _instance = None
+    _pid = None
+    _lock = threading.Lock()
 
     @staticmethod
     def getInstance():
-        """Obtiene la instancia única de la clase."""
-        if MongoManagerCriptoScrapping._instance is None:
-            MongoManagerCriptoScrapping._instance = MongoManagerCriptoScrapping()
-        return MongoManagerCriptoScrapping._instance
+        """
+        Obtiene la instancia única de la clase para el proceso actual.
+
+        La instancia se crea en el primer uso (no al importar) y bajo un lock.
+        Si el proceso fue bifurcado (fork) después de crearla, el cliente de
+        Motor heredado no es utilizable: se crea uno nuevo para este proceso.
+        """
+        pid = os.getpid()
+        instance = MongoManagerCriptoScrapping._instance
+        if instance is not None and MongoManagerCriptoScrapping._pid == pid:
+            return instance
+        with MongoManagerCriptoScrapping._lock:
+            if MongoManagerCriptoScrapping._instance is None or MongoManagerCriptoScrapping._pid != pid:
+                MongoManagerCriptoScrapping._instance = None
+                MongoManagerCriptoScrapping._instance = MongoManagerCriptoScrapping()
+                MongoManagerCriptoScrapping._pid = pid
+            return MongoManagerCriptoScrapping._instance
 
     def __init__(self):
         """Inicializa la conexión para la base de datos `CriptoScrapping`."""
@@ -24,4 +41,4 @@ class MongoManagerCriptoScrapping(MongoManager):
         self.db_name = MONGO_DATABASE_NAME
 
         # Llamar al constructor de la clase base con los argumentos necesarios
-        super().__init__(self.mongo_uri, self.db_name)
\ No newline at end of file
+        super().__init__(self.mongo_uri, self.db_name)
@@ -1,7 +1,16 @@
 """FastAPI application factory (logic preserved).
 
-- Registers existing routers (ScrappingController, ServerEventsController).
-- Provides a /health endpoint.
+- Registers existing routers (ScrappingController, ServerEventsController, AnalyticsController,
+  ConsolidationController, ProjectionController, IndicatorController, AnomalyController,
+  SchedulerController, AdminController) and wires the incremental ingest engines; with a
+  cross-process broadcaster only the API process holding the ingest lease publishes their events.
+- Starts the scraping job queue, and the embedded scheduler when `EMBEDDED_SCHEDULER` is enabled.
+- Opt-in profiling of requests (`X-Profile: 1`) and jobs, served by AdminController.
+- Runs a warm-up (Mongo pool, indexes, browser launch, engine caches) and serves its
+  state on /ready (503 until it succeeded and while Mongo does not answer).
+- Provides a /health endpoint, and /metrics in the Prometheus text format (request
+  latency and size per route, Mongo command latency, scrape stage timings).
+- Logs through the queue-backed structured logger, each request tagged with its X-Request-Id.
 - Adds permissive CORS to keep local dev friction low (safe default).
 - Uses a lifespan context to start/stop the SSE broadcaster.
 - Tries to warm up Mongo if available (without failing if the import path differs).
@@ -9,22 +18,50 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Iterable
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from backscrap.app.repository.JobRepository import JobRepository
+from backscrap.app.repository.LeaseRepository import LeaseRepository
+from backscrap.app.repository.ScrappingRepository import ScrappingRepository
+from backscrap.app.services.IngestLeaderService import IngestLeaderService
+from backscrap.app.services.ReadinessService import ReadinessService
+from backscrap.app.utils.config import (
+    PROMETHEUS_MULTIPROC_DIR,
+    WARMUP_BROWSER,
+    mongo_settings_summary,
+)
+from backscrap.app.utils.logger import CorrelationIdMiddleware, logger, start_logging, stop_logging
+from backscrap.app.utils.metrics import CONTENT_TYPE, MetricsMiddleware, prune_dead_processes, render_metrics
+from backscrap.app.utils.profiling import ProfilingMiddleware
 
 # Optional imports — do not fail if module paths differ in the project.
 try:
-    from backscrap.app.utils.broadcaster import broadcast_startup, broadcast_shutdown
+    from backscrap.app.utils.broadcaster import broadcast_backend, broadcast_startup, broadcast_shutdown, is_process_local
 except ImportError:
+    def broadcast_backend() -> str:  # type: ignore[no-redef]
+        return "memory://"
+
+    def is_process_local() -> bool:  # type: ignore[no-redef]
+        return True
+
     async def broadcast_startup() -> None:  # type: ignore[no-redef]
         return None
 
     async def broadcast_shutdown() -> None:  # type: ignore[no-redef]
         return None
 
+try:
+    from backscrap.app.utils.fanout import hub as fanout_hub
+except ImportError:
+    fanout_hub = None  # type: ignore[assignment]
+
 try:
     # If your project exposes a singleton that initializes Mongo, touch it at startup.
     from backscrap.app.datasource.MongoManagerCriptoScrapping import MongoManagerCriptoScrapping
@@ -35,23 +72,111 @@ except ImportError:
 # Routers: keep import paths stable with your project layout.
 # If your modules use different names, only adjust these two import lines.
 try:
-    from backscrap.app.controller.ScrappingController import router as scrapping_router
+    from backscrap.app.controller.ScrappingController import router as scrapping_router, scrapping_service, job_service
 except ImportError:
     scrapping_router = None  # type: ignore[assignment]
+    scrapping_service = None  # type: ignore[assignment]
+    job_service = None  # type: ignore[assignment]
 
 try:
-    from backscrap.app.controller.ServerEventsController import router as sse_router
+    from backscrap.app.controller.ServerEventsController import router as sse_router, price_delta_service
 except ImportError:
     sse_router = None  # type: ignore[assignment]
+    price_delta_service = None  # type: ignore[assignment]
+
+try:
+    from backscrap.app.controller.AnalyticsController import router as analytics_router
+except ImportError:
+    analytics_router = None  # type: ignore[assignment]
+
+try:
+    from backscrap.app.controller.ConsolidationController import router as consolidation_router, consolidation_service
+except ImportError:
+    consolidation_router = None  # type: ignore[assignment]
+    consolidation_service = None  # type: ignore[assignment]
+
+try:
+    from backscrap.app.controller.ProjectionController import router as projection_router, projection_service
+except ImportError:
+    projection_router = None  # type: ignore[assignment]
+    projection_service = None  # type: ignore[assignment]
+
+try:
+    from backscrap.app.controller.IndicatorController import router as indicator_router, indicator_service
+except ImportError:
+    indicator_router = None  # type: ignore[assignment]
+    indicator_service = None  # type: ignore[assignment]
+
+try:
+    from backscrap.app.controller.AnomalyController import router as anomaly_router, anomaly_service
+except ImportError:
+    anomaly_router = None  # type: ignore[assignment]
+    anomaly_service = None  # type: ignore[assignment]
+
+try:
+    from backscrap.app.controller.AdminController import router as admin_router
+except ImportError:
+    admin_router = None  # type: ignore[assignment]
+
+try:
+    from backscrap.app.controller.SchedulerController import router as scheduler_router, scheduler_service
+    from backscrap.app.utils.config import EMBEDDED_SCHEDULER
+except ImportError:
+    scheduler_router = None  # type: ignore[assignment]
+    scheduler_service = None  # type: ignore[assignment]
+    EMBEDDED_SCHEDULER = False
+
+
+def _ingest_engines() -> list:
+    """Incremental engines fed with every batch stored by the scraping service.
+
+    Anomaly detection goes first: alerts are published before the other engines run, and
+    those receive the batch without the rows it flagged (unparseable or `scale` prices).
+    """
+    engines = (anomaly_service, price_delta_service, consolidation_service, projection_service, indicator_service)
+    return [engine for engine in engines if engine is not None]
+
+
+# Only one API process publishes the engines' events (and persists their state)
+ingest_leader = IngestLeaderService(
+    LeaseRepository(), [engine for engine in _ingest_engines() if hasattr(engine, "publishes")]
+)
+
+
+async def _warm_up_engines() -> dict:
+    """Rebuild the recent state of the ingest engines; raises if any of them could not."""
+    warmed, errors = [], []
+    for engine in _ingest_engines():
+        try:
+            await engine.warm_up()
+            warmed.append(type(engine).__name__)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Warm-up skipped for {type(engine).__name__}: {exc}")
+            errors.append(f"{type(engine).__name__}: {exc}")
+    if errors:
+        raise RuntimeError("; ".join(errors))
+    return {"engines": warmed}
+
+
+# Warm-up and /ready; the browser launch is only checked when this process runs the scrapes
+readiness_service = ReadinessService(
+    ScrappingRepository(),
+    JobRepository(),
+    scrapping_service,
+    check_browser=WARMUP_BROWSER and job_service is not None and not job_service.remote,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manejador del ciclo de vida de la aplicación."""
+    start_logging()
+    logger.info(mongo_settings_summary())
     mongo_manager = MongoManagerCriptoScrapping.getInstance()
-    print("Conexión a MongoDB inicializada.")
+    logger.info("Conexión a MongoDB inicializada.")
     #   inicia el SSE event
     await broadcast_startup()
+    logger.info(f"Broadcaster conectado: {broadcast_backend()} (pid {os.getpid()})")
     # Warm up Mongo singleton if present (do not fail if not available)
     if MongoManagerCriptoScrapping is not None:
         try:
@@ -59,10 +184,48 @@ async def lifespan(app: FastAPI):
         except Exception: # noqa: BLE001
             # Keep silent to avoid altering observable behavior in non-Mongo flows
             pass
+    # Wire the incremental engines to the scraping pipeline and rebuild their recent state
+    if scrapping_service is not None:
+        for engine in _ingest_engines():
+            scrapping_service.register_ingest_listener(engine.on_ingest)
+    await readiness_service.run_check("caches", _warm_up_engines)
+    # Elect the publisher only when the batches reach every process; with memory:// each one publishes its own
+    if not is_process_local():
+        await ingest_leader.start()
+    # Followers take the price-delta ids (and replay buffer) from the leader's deltas
+    delta_mirror = (
+        asyncio.create_task(price_delta_service.consume_deltas())
+        if price_delta_service is not None and not is_process_local()
+        else None
+    )
+    # Job workers (re-queues the jobs a previous process left unfinished)
+    if job_service is not None:
+        await job_service.start()
+    # Scheduler inside the API: state in Mongo, one claim per slot across workers
+    if EMBEDDED_SCHEDULER and scheduler_service is not None:
+        await scheduler_service.start()
+    # Mongo pool, indexes and browser launch in the background: /ready answers 503 until they succeed
+    readiness_service.start()
+    # Several API workers: drop the metric files of the workers uvicorn replaced
+    if PROMETHEUS_MULTIPROC_DIR:
+        prune_dead_processes(PROMETHEUS_MULTIPROC_DIR)
     try:
         yield
     finally:
+        await readiness_service.stop()
+        if scheduler_service is not None:
+            await scheduler_service.stop()
+        if job_service is not None:
+            await job_service.stop()
+        await ingest_leader.stop()
+        if delta_mirror is not None:
+            delta_mirror.cancel()
+            await asyncio.gather(delta_mirror, return_exceptions=True)
+        if fanout_hub is not None:
+            await fanout_hub.close()
         await broadcast_shutdown()
+        # Write out the queued log records before the process exits
+        stop_logging()
 
 
 def _default_cors_origins() -> Iterable[str]:
@@ -87,6 +250,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Only acts on requests sent with `X-Profile: 1` while PROFILING_ENABLED is set
+app.add_middleware(ProfilingMiddleware)
+
+# Tags the log records of each request with its X-Request-Id (generated when missing)
+app.add_middleware(CorrelationIdMiddleware)
+
+# Outermost middleware, so the recorded latency covers CORS handling too
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/health")
 async def health() -> dict:
@@ -94,9 +266,46 @@ async def health() -> dict:
     return {"status": "UP"}
 
 
+@app.get("/ready")
+async def ready() -> JSONResponse:
+    """Readiness probe: 200 once the warm-up succeeded and Mongo answers a ping, 503 otherwise."""
+    is_ready, body = await readiness_service.report()
+    return JSONResponse(body, status_code=200 if is_ready else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint (totals of every worker process when PROMETHEUS_MULTIPROC_DIR is set)."""
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return Response(render_metrics(), media_type=CONTENT_TYPE)
+    body = await asyncio.get_running_loop().run_in_executor(None, render_metrics, PROMETHEUS_MULTIPROC_DIR)
+    return Response(body, media_type=CONTENT_TYPE)
+
+
 # Mount routers only if they were imported successfully
 if scrapping_router is not None:
     app.include_router(scrapping_router)
 
 if sse_router is not None:
     app.include_router(sse_router)
+
+if analytics_router is not None:
+    app.include_router(analytics_router)
+
+if consolidation_router is not None:
+    app.include_router(consolidation_router)
+
+if projection_router is not None:
+    app.include_router(projection_router)
+
+if indicator_router is not None:
+    app.include_router(indicator_router)
+
+if anomaly_router is not None:
+    app.include_router(anomaly_router)
+
+if scheduler_router is not None:
+    app.include_router(scheduler_router)
+
+if admin_router is not None:
+    app.include_router(admin_router)
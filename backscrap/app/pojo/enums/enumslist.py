@@ -15,6 +15,19 @@ class ListaOperadoresCondicionales(Enum):
 
 class ListaCollecciones(Enum):
     ScrappingResults = "scrapping_results"
+    IndicatorState = "indicator_state"
+    SchedulerState = "scheduler_state"
+    ScrapeJobs = "scrape_jobs"
+    ScrapeWorkers = "scrape_workers"
+    SourceHealth = "source_health"
+    Leases = "leases"
+
+class ListaCanales(Enum):
+    ScrapingEvents = "scraping_events"
+    ConsolidationEvents = "consolidation_events"
+    AnomalyEvents = "anomaly_events"
+    PriceDeltas = "price_deltas"
+    IngestBatches = "ingest_batches"
 
 class CamposPrincipales(Enum):
     pass
\ No newline at end of file
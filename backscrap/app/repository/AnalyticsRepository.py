@@ -0,0 +1,187 @@
+from datetime import datetime
+from typing import List, Optional
+
+from backscrap.app.datasource.MongoManagerCriptoScrapping import MongoManagerCriptoScrapping
+from backscrap.app.pojo.enums.enumslist import ListaCollecciones
+
+
+def _numeric(field: str) -> dict:
+    """Convert a scraped string field (e.g. "+1.25" or "1,234.5") to a double inside Mongo.
+
+    Mirrors the cleaning done by the observatory: thousands separators and the
+    explicit plus sign are removed and unparsable values become null.
+    """
+    cleaned = {"$toString": f"$data.{field}"}
+    for token in (",", "+", "$", "%"):
+        cleaned = {"$replaceAll": {"input": cleaned, "find": token, "replacement": ""}}
+    return {"$convert": {"input": cleaned, "to": "double", "onError": None, "onNull": None}}
+
+
+class AnalyticsRepository:
+    """Aggregation pipelines over `scrapping_results` used by the analytics endpoints.
+
+    Every pipeline starts from the same prefix: restrict the snapshots to the
+    requested window/source, unwind the per-coin rows and cast the numeric
+    fields once, so the heavy lifting stays inside Mongo and only the
+    aggregated rows travel over the wire.
+    """
+
+    def __init__(self):
+        self.collection = ListaCollecciones.ScrappingResults.value
+
+    @property
+    def database(self):
+        # Resolved on use so each worker process gets its own Mongo client
+        return MongoManagerCriptoScrapping.getInstance()
+
+    async def get_data_version(self) -> Optional[str]:
+        """Return a token that changes whenever a new snapshot is stored."""
+        return await self.database.lastDocumentId(self.collection)
+
+    @staticmethod
+    def _base_pipeline(
+        since: Optional[datetime],
+        source: Optional[str],
+        until: Optional[datetime] = None,
+        symbols: Optional[List[str]] = None,
+    ) -> List[dict]:
+        match: dict = {}
+        if since is not None or until is not None:
+            match["timestamp"] = {}
+            if since is not None:
+                match["timestamp"]["$gte"] = since
+            if until is not None:
+                match["timestamp"]["$lte"] = until
+        if source:
+            match["source"] = source
+        if symbols:
+            # Skips snapshots without any of the symbols before unwinding
+            match["data.symbol"] = {"$in": symbols}
+
+        pipeline: List[dict] = [{"$match": match}] if match else []
+        pipeline += [
+            {"$unwind": "$data"},
+            {
+                "$project": {
+                    "_id": 0,
+                    "source": 1,
+                    "timestamp": 1,
+                    "symbol": "$data.symbol",
+                    "name": "$data.name",
+                    "price": _numeric("price"),
+                    "change24h": _numeric("change24h"),
+                    "volume24h": _numeric("volume24h"),
+                    "marketCap": _numeric("marketCap"),
+                }
+            },
+        ]
+        if symbols:
+            pipeline.append({"$match": {"symbol": {"$in": symbols}}})
+        return pipeline
+
+    async def market_cap_ranking(self, since: Optional[datetime], source: Optional[str], limit: int) -> List[dict]:
+        """Average market capitalization per coin name, largest first."""
+        pipeline = self._base_pipeline(since, source) + [
+            {"$group": {"_id": "$name", "marketCap": {"$avg": "$marketCap"}}},
+            {"$match": {"marketCap": {"$ne": None}}},
+            {"$sort": {"marketCap": -1}},
+            {"$limit": limit},
+            {"$project": {"_id": 0, "name": "$_id", "marketCap": 1}},
+        ]
+        return await self.database.aggregate(self.collection, pipeline)
+
+    async def change24h_by_source(self, since: Optional[datetime], source: Optional[str]) -> List[dict]:
+        """Average 24h change per (name, source) pair, i.e. the long form of the heatmap pivot."""
+        pipeline = self._base_pipeline(since, source) + [
+            {"$group": {"_id": {"name": "$name", "source": "$source"}, "change24h": {"$avg": "$change24h"}}},
+            {"$project": {"_id": 0, "name": "$_id.name", "source": "$_id.source", "change24h": 1}},
+            {"$sort": {"name": 1, "source": 1}},
+        ]
+        return await self.database.aggregate(self.collection, pipeline)
+
+    async def volatility_ranking(self, since: Optional[datetime], source: Optional[str], limit: int) -> List[dict]:
+        """Sample standard deviation of the 24h change per symbol, most volatile first."""
+        pipeline = self._base_pipeline(since, source) + [
+            {"$group": {"_id": "$symbol", "volatility": {"$stdDevSamp": "$change24h"}, "samples": {"$sum": 1}}},
+            {"$match": {"volatility": {"$ne": None}}},
+            {"$sort": {"volatility": -1}},
+            {"$limit": limit},
+            {"$project": {"_id": 0, "symbol": "$_id", "volatility": 1, "samples": 1}},
+        ]
+        return await self.database.aggregate(self.collection, pipeline)
+
+    async def top_by_source(self, since: Optional[datetime], source: Optional[str], limit: int) -> List[dict]:
+        """Top-N coins by market capitalization in the latest snapshot of each source."""
+        pipeline = self._base_pipeline(since, source) + [
+            {
+                "$setWindowFields": {
+                    "partitionBy": "$source",
+                    "output": {"latest": {"$max": "$timestamp"}},
+                }
+            },
+            {"$match": {"$expr": {"$eq": ["$timestamp", "$latest"]}}},
+            {
+                "$group": {
+                    "_id": "$source",
+                    "timestamp": {"$first": "$timestamp"},
+                    "top": {
+                        "$topN": {
+                            "n": limit,
+                            "sortBy": {"marketCap": -1},
+                            "output": {
+                                "symbol": "$symbol",
+                                "name": "$name",
+                                "price": "$price",
+                                "change24h": "$change24h",
+                                "marketCap": "$marketCap",
+                            },
+                        }
+                    },
+                }
+            },
+            {"$project": {"_id": 0, "source": "$_id", "timestamp": 1, "top": 1}},
+            {"$sort": {"source": 1}},
+        ]
+        return await self.database.aggregate(self.collection, pipeline)
+
+    async def moving_average(
+        self,
+        since: Optional[datetime],
+        source: Optional[str],
+        symbol: str,
+        window: int,
+    ) -> List[dict]:
+        """Price and trailing moving average for one symbol, per source, ordered by time."""
+        pipeline = self._base_pipeline(since, source) + [
+            {"$match": {"symbol": symbol}},
+            {
+                "$setWindowFields": {
+                    "partitionBy": "$source",
+                    "sortBy": {"timestamp": 1},
+                    "output": {
+                        "movingAverage": {
+                            "$avg": "$price",
+                            "window": {"documents": [-(window - 1), 0]},
+                        }
+                    },
+                }
+            },
+            {"$project": {"source": 1, "timestamp": 1, "price": 1, "movingAverage": 1}},
+            {"$sort": {"source": 1, "timestamp": 1}},
+        ]
+        return await self.database.aggregate(self.collection, pipeline)
+
+    async def price_series(
+        self,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        source: Optional[str],
+        symbols: List[str],
+    ) -> List[dict]:
+        """Raw (timestamp, price) points of the given symbols, per source, ordered by time."""
+        pipeline = self._base_pipeline(since, source, until, symbols) + [
+            {"$match": {"price": {"$ne": None}}},
+            {"$project": {"symbol": 1, "source": 1, "timestamp": 1, "price": 1}},
+            {"$sort": {"symbol": 1, "source": 1, "timestamp": 1}},
+        ]
+        return await self.database.aggregate(self.collection, pipeline)
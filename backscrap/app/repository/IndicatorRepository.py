@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from backscrap.app.datasource.MongoManagerCriptoScrapping import MongoManagerCriptoScrapping
+from backscrap.app.pojo.enums.enumslist import ListaCollecciones
+from backscrap.app.utils.Global import ResponseUtil, Console
+
+
+class IndicatorRepository:
+    """Persistence of the streaming indicator state, one document per (source, symbol)."""
+
+    def __init__(self):
+        self.collection = ListaCollecciones.IndicatorState.value
+
+    @property
+    def database(self):
+        # Resolved on use so each worker process gets its own Mongo client
+        return MongoManagerCriptoScrapping.getInstance()
+
+    @staticmethod
+    def _document_id(source: str, symbol: str) -> str:
+        return f"{source}|{symbol}"
+
+    async def load_states(self):
+        """
+        Recupera todos los estados persistidos.
+        """
+        try:
+            documents = await self.database.list(self.collection)
+            return ResponseUtil.success("Estados de indicadores recuperados.", data=documents)
+        except Exception as e:
+            Console.error(f"Error en IndicatorRepository al cargar estados: {e}")
+            return ResponseUtil.error(f"Error al cargar los estados de indicadores: {str(e)}")
+
+    async def save_states(self, states: Dict[Tuple[str, str], dict]):
+        """
+        Guarda (upsert) los estados modificados en una sola operación bulk.
+
+        `asOf` es el último punto incorporado al estado: un proceso que perdió el
+        liderazgo sin saberlo todavía no pisa un estado más reciente de otro.
+        """
+        now = datetime.now()
+        documents: List[dict] = [
+            {
+                "_id": self._document_id(source, symbol),
+                "source": source,
+                "symbol": symbol,
+                "state": state,
+                "asOf": state["last_timestamp"],
+                "updatedAt": now,
+            }
+            for (source, symbol), state in states.items()
+        ]
+        try:
+            written = await self.database.upsertManyIfNewer(self.collection, documents, "asOf")
+            return ResponseUtil.success("Estados de indicadores guardados.", data={"written": written})
+        except Exception as e:
+            Console.error(f"Error en IndicatorRepository al guardar estados: {e}")
+            return ResponseUtil.error(f"Error al guardar los estados de indicadores: {str(e)}")
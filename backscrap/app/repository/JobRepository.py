@@ -0,0 +1,310 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pymongo import IndexModel
+
+from backscrap.app.datasource.MongoManagerCriptoScrapping import MongoManagerCriptoScrapping
+from backscrap.app.pojo.enums.enumslist import ListaCollecciones
+from backscrap.app.utils.Global import ResponseUtil, Console
+
+
+class JobRepository:
+    """Persistence of scrape jobs, one document per job (`_id` = job id)."""
+
+    def __init__(self):
+        self.collection = ListaCollecciones.ScrapeJobs.value
+        self.workers_collection = ListaCollecciones.ScrapeWorkers.value
+
+    @property
+    def database(self):
+        # Resolved on use so each worker process gets its own Mongo client
+        return MongoManagerCriptoScrapping.getInstance()
+
+    @staticmethod
+    def _to_document(job: dict) -> dict:
+        document = {key: value for key, value in job.items() if key != "id"}
+        document["_id"] = job["id"]
+        return document
+
+    @staticmethod
+    def _from_document(document: dict) -> dict:
+        document["id"] = str(document.pop("_id"))
+        return document
+
+    async def ensure_indexes(self):
+        """
+        Crea (si no existen) los índices de `claim_next` (estado, prioridad y
+        antigüedad) y del listado de jobs recientes.
+        """
+        try:
+            names = await self.database.crearIndices(self.collection, [
+                IndexModel([("status", 1), ("rank", 1), ("queuedAt", 1)]),
+                IndexModel([("createdAt", -1)]),
+            ])
+            return ResponseUtil.success("Índices de jobs asegurados.", data={"indexes": names})
+        except Exception as e:
+            Console.error(f"Error en JobRepository al crear índices: {e}")
+            return ResponseUtil.error(f"Error al crear los índices de jobs: {str(e)}")
+
+    async def save_job(self, job: dict):
+        """
+        Guarda (upsert) el estado actual de un job.
+        """
+        try:
+            await self.database.upsertMany(self.collection, [self._to_document(job)])
+            return ResponseUtil.success("Job guardado.", data=job)
+        except Exception as e:
+            Console.error(f"Error en JobRepository al guardar el job {job.get('id')}: {e}")
+            return ResponseUtil.error(f"Error al guardar el job: {str(e)}")
+
+    async def get_job(self, job_id: str):
+        """
+        Recupera un job por su id.
+        """
+        try:
+            documents = await self.database.find(self.collection, {"_id": job_id}, limit=1)
+            if not documents:
+                return ResponseUtil.warning(f"No existe el job {job_id}.")
+            return ResponseUtil.success("Job recuperado.", data=documents[0])
+        except Exception as e:
+            Console.error(f"Error en JobRepository al recuperar el job {job_id}: {e}")
+            return ResponseUtil.error(f"Error al recuperar el job: {str(e)}")
+
+    async def list_jobs(self, statuses: Optional[List[str]] = None, source: Optional[str] = None, limit: int = 50):
+        """
+        Lista los jobs más recientes, opcionalmente filtrados por estado y fuente.
+        """
+        filtro = {}
+        if statuses:
+            filtro["status"] = {"$in": statuses}
+        if source:
+            filtro["source"] = source
+        try:
+            documents = await self.database.find(self.collection, filtro, sort=[("createdAt", -1)], limit=limit)
+            return ResponseUtil.success("Jobs recuperados.", data=documents)
+        except Exception as e:
+            Console.error(f"Error en JobRepository al listar jobs: {e}")
+            return ResponseUtil.error(f"Error al listar los jobs: {str(e)}")
+
+    async def claim_job(self, job_id: str, previous_owner: Optional[str], owner: str, now: datetime, lease_until: datetime):
+        """
+        Toma de forma atómica un job sin terminar que pertenecía a `previous_owner`,
+        solo si su lease expiró (el proceso dueño dejó de renovarlo) o no tiene.
+
+        Evita que dos procesos que arrancan a la vez vuelvan a encolar el mismo job,
+        y que un proceso tome los jobs de otro que sigue vivo.
+        """
+        try:
+            document = await self.database.findOneAndUpdate(
+                self.collection,
+                {
+                    "_id": job_id,
+                    "owner": previous_owner,
+                    "status": {"$in": ["queued", "running"]},
+                    "$or": [{"leaseUntil": None}, {"leaseUntil": {"$lt": now}}],
+                },
+                {"$set": {"owner": owner, "leaseUntil": lease_until}},
+            )
+            if document is None:
+                return ResponseUtil.warning(f"El job {job_id} ya fue tomado por otro proceso o su dueño sigue vivo.")
+            return ResponseUtil.success("Job tomado.", data=self._from_document(document))
+        except Exception as e:
+            Console.error(f"Error en JobRepository al tomar el job {job_id}: {e}")
+            return ResponseUtil.error(f"Error al tomar el job: {str(e)}")
+
+    async def renew_leases(self, owner: str, lease_until: Optional[datetime]):
+        """
+        Extiende (o libera, con `lease_until=None`) el lease de todos los jobs sin
+        terminar de un proceso de la API.
+        """
+        try:
+            total = await self.database.updateMany(
+                self.collection,
+                {"owner": owner, "status": {"$in": ["queued", "running"]}},
+                {"$set": {"leaseUntil": lease_until}},
+            )
+            return ResponseUtil.success("Leases renovados.", data={"total": total})
+        except Exception as e:
+            Console.error(f"Error en JobRepository al renovar los leases de {owner}: {e}")
+            return ResponseUtil.error(f"Error al renovar los leases: {str(e)}")
+
+    async def count_jobs(self, statuses: List[str]):
+        """
+        Cuenta los jobs en los estados indicados.
+        """
+        try:
+            total = await self.database.countDocuments(self.collection, {"status": {"$in": statuses}})
+            return ResponseUtil.success("Jobs contados.", data={"total": total})
+        except Exception as e:
+            Console.error(f"Error en JobRepository al contar jobs: {e}")
+            return ResponseUtil.error(f"Error al contar los jobs: {str(e)}")
+
+    async def raise_priority(self, job_id: str, priority: str, rank: int):
+        """
+        Sube la prioridad de un job que sigue en cola.
+        """
+        try:
+            document = await self.database.findOneAndUpdate(
+                self.collection,
+                {"_id": job_id, "status": "queued", "rank": {"$gt": rank}},
+                {"$set": {"priority": priority, "rank": rank}},
+            )
+            if document is None:
+                return ResponseUtil.warning(f"El job {job_id} ya no está en cola o tiene igual o más prioridad.")
+            return ResponseUtil.success("Prioridad actualizada.", data=self._from_document(document))
+        except Exception as e:
+            Console.error(f"Error en JobRepository al cambiar la prioridad del job {job_id}: {e}")
+            return ResponseUtil.error(f"Error al cambiar la prioridad del job: {str(e)}")
+
+    async def claim_next(self, owner: str, now: datetime, lease_until: datetime, max_attempts: int):
+        """
+        Toma el siguiente job para un worker independiente.
+
+        Elige el job en cola de mayor prioridad (y más antiguo dentro de ella), o un
+        job en ejecución cuyo lease expiró porque su worker dejó de enviar latidos.
+        Solo considera jobs del modo workers (los de la cola de un proceso de la API
+        tienen dueño) que no agotaron `max_attempts`; ver `fail_exhausted`.
+        La operación es atómica: dos workers nunca toman el mismo job.
+        """
+        remote = {"executor": {"$ne": "api"}, "attempts": {"$lt": max_attempts}}
+        try:
+            document = await self.database.findOneAndUpdate(
+                self.collection,
+                {"$or": [
+                    {**remote, "status": "queued", "owner": None},
+                    {**remote, "status": "running", "leaseUntil": {"$lt": now}},
+                ]},
+                {
+                    "$set": {"status": "running", "owner": owner, "startedAt": now, "leaseUntil": lease_until},
+                    "$inc": {"attempts": 1},
+                },
+                sort=[("rank", 1), ("queuedAt", 1)],
+            )
+            if document is None:
+                return ResponseUtil.warning("No hay jobs pendientes.")
+            return ResponseUtil.success("Job tomado.", data=self._from_document(document))
+        except Exception as e:
+            Console.error(f"Error en JobRepository al tomar el siguiente job: {e}")
+            return ResponseUtil.error(f"Error al tomar el siguiente job: {str(e)}")
+
+    async def fail_exhausted(self, now: datetime, max_attempts: int):
+        """
+        Marca como fallidos los jobs del modo workers cuyo lease expiró tras
+        `max_attempts` intentos (p. ej. un scrape que tumba al worker cada vez),
+        que `claim_next` ya no vuelve a tomar.
+        """
+        try:
+            total = await self.database.updateMany(
+                self.collection,
+                {
+                    "executor": {"$ne": "api"},
+                    "status": "running",
+                    "leaseUntil": {"$lt": now},
+                    "attempts": {"$gte": max_attempts},
+                },
+                {"$set": {
+                    "status": "failed",
+                    "finishedAt": now,
+                    "leaseUntil": None,
+                    "result": {"status": 4, "message": f"Job abandonado tras {max_attempts} intentos sin terminar."},
+                }},
+            )
+            return ResponseUtil.success("Jobs agotados marcados como fallidos.", data={"total": total})
+        except Exception as e:
+            Console.error(f"Error en JobRepository al marcar jobs agotados: {e}")
+            return ResponseUtil.error(f"Error al marcar los jobs agotados: {str(e)}")
+
+    async def renew_lease(self, job_id: str, owner: str, lease_until: datetime):
+        """
+        Latido de un job en ejecución: extiende su lease si `owner` todavía lo tiene.
+
+        Devuelve el documento actualizado (incluye `cancelRequested`) o un warning
+        si el lease se perdió y otro worker pudo haber tomado el job.
+        """
+        try:
+            document = await self.database.findOneAndUpdate(
+                self.collection,
+                {"_id": job_id, "owner": owner, "status": "running"},
+                {"$set": {"leaseUntil": lease_until}},
+            )
+            if document is None:
+                return ResponseUtil.warning(f"Se perdió el lease del job {job_id}.")
+            return ResponseUtil.success("Lease renovado.", data=self._from_document(document))
+        except Exception as e:
+            Console.error(f"Error en JobRepository al renovar el lease del job {job_id}: {e}")
+            return ResponseUtil.error(f"Error al renovar el lease: {str(e)}")
+
+    async def finish_job(self, job: dict, owner: str):
+        """
+        Guarda el resultado de un job solo si `owner` todavía lo tiene.
+        """
+        fields = {key: job.get(key) for key in ("status", "finishedAt", "timings", "result", "profileId")}
+        try:
+            updated = await self.database.updateOne(
+                self.collection,
+                {"_id": job["id"], "owner": owner, "status": "running"},
+                {"$set": {**fields, "leaseUntil": None}},
+            )
+            if not updated:
+                return ResponseUtil.warning(f"El job {job['id']} ya no pertenece a {owner}; resultado descartado.")
+            return ResponseUtil.success("Job finalizado.", data=job)
+        except Exception as e:
+            Console.error(f"Error en JobRepository al finalizar el job {job['id']}: {e}")
+            return ResponseUtil.error(f"Error al finalizar el job: {str(e)}")
+
+    async def cancel_job(self, job_id: str, now: datetime):
+        """
+        Cancela un job en cola, o marca `cancelRequested` en uno en ejecución
+        para que su worker lo interrumpa en el siguiente latido.
+        """
+        try:
+            document = await self.database.findOneAndUpdate(
+                self.collection,
+                {"_id": job_id, "status": "queued"},
+                {"$set": {
+                    "status": "cancelled",
+                    "finishedAt": now,
+                    "result": {"status": 3, "message": "Job cancelado antes de ejecutarse."},
+                }},
+            )
+            if document is None:
+                document = await self.database.findOneAndUpdate(
+                    self.collection,
+                    {"_id": job_id, "status": "running"},
+                    {"$set": {"cancelRequested": True}},
+                )
+            if document is None:
+                response = await self.get_job(job_id)
+                if response.status != 2:
+                    return response
+                return ResponseUtil.warning(f"El job {job_id} ya terminó ({response.data['status']}).")
+            return ResponseUtil.success("Job cancelado.", data=self._from_document(document))
+        except Exception as e:
+            Console.error(f"Error en JobRepository al cancelar el job {job_id}: {e}")
+            return ResponseUtil.error(f"Error al cancelar el job: {str(e)}")
+
+    async def register_worker(self, worker: dict):
+        """
+        Guarda (upsert) el latido de un worker independiente.
+        """
+        try:
+            document = {key: value for key, value in worker.items() if key != "id"}
+            document["_id"] = worker["id"]
+            await self.database.upsertMany(self.workers_collection, [document])
+            return ResponseUtil.success("Worker registrado.", data=worker)
+        except Exception as e:
+            Console.error(f"Error en JobRepository al registrar el worker {worker.get('id')}: {e}")
+            return ResponseUtil.error(f"Error al registrar el worker: {str(e)}")
+
+    async def list_workers(self, seen_since: datetime):
+        """
+        Lista los workers independientes con un latido posterior a `seen_since`.
+        """
+        try:
+            documents = await self.database.find(
+                self.workers_collection, {"lastSeen": {"$gte": seen_since}}, sort=[("_id", 1)]
+            )
+            return ResponseUtil.success("Workers recuperados.", data=documents)
+        except Exception as e:
+            Console.error(f"Error en JobRepository al listar workers: {e}")
+            return ResponseUtil.error(f"Error al listar los workers: {str(e)}")
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from backscrap.app.datasource.MongoManagerCriptoScrapping import MongoManagerCriptoScrapping
+from backscrap.app.pojo.enums.enumslist import ListaCollecciones
+from backscrap.app.utils.Global import ResponseUtil, Console
+
+
+class LeaseRepository:
+    """Named leases shared by the API processes, one document per lease (`_id` = name)."""
+
+    def __init__(self):
+        self.collection = ListaCollecciones.Leases.value
+
+    @property
+    def database(self):
+        # Resolved on use so each worker process gets its own Mongo client
+        return MongoManagerCriptoScrapping.getInstance()
+
+    async def ensure_lease(self, name: str):
+        """
+        Crea el lease `name` libre si aún no existe.
+        """
+        try:
+            created = await self.database.insertIfMissing(
+                self.collection, {"_id": name, "owner": None, "leaseUntil": None, "renewedAt": None}
+            )
+            return ResponseUtil.success("Lease asegurado.", data={"created": created})
+        except Exception as e:
+            Console.error(f"Error en LeaseRepository al crear el lease {name}: {e}")
+            return ResponseUtil.error(f"Error al crear el lease: {str(e)}")
+
+    async def acquire(self, name: str, owner: str, now: datetime, lease_until: datetime):
+        """
+        Toma o renueva de forma atómica el lease `name`.
+
+        Solo tiene éxito si el lease ya es de `owner`, está libre o venció, por lo que
+        entre varios procesos exactamente uno lo tiene en cada momento.
+        """
+        try:
+            document = await self.database.findOneAndUpdate(
+                self.collection,
+                {"_id": name, "$or": [{"owner": owner}, {"leaseUntil": None}, {"leaseUntil": {"$lte": now}}]},
+                {"$set": {"owner": owner, "leaseUntil": lease_until, "renewedAt": now}},
+            )
+            if document is None:
+                return ResponseUtil.warning(f"El lease {name} pertenece a otro proceso.")
+            return ResponseUtil.success("Lease tomado.", data=document)
+        except Exception as e:
+            Console.error(f"Error en LeaseRepository al tomar el lease {name}: {e}")
+            return ResponseUtil.error(f"Error al tomar el lease: {str(e)}")
+
+    async def release(self, name: str, owner: str):
+        """
+        Libera el lease `name` si todavía pertenece a `owner`.
+        """
+        try:
+            modified = await self.database.updateOne(
+                self.collection,
+                {"_id": name, "owner": owner},
+                {"$set": {"owner": None, "leaseUntil": None}},
+            )
+            return ResponseUtil.success("Lease liberado.", data={"modified": modified})
+        except Exception as e:
+            Console.error(f"Error en LeaseRepository al liberar el lease {name}: {e}")
+            return ResponseUtil.error(f"Error al liberar el lease: {str(e)}")
@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import Optional
+
+from backscrap.app.datasource.MongoManagerCriptoScrapping import MongoManagerCriptoScrapping
+from backscrap.app.pojo.enums.enumslist import ListaCollecciones
+from backscrap.app.utils.Global import ResponseUtil, Console
+
+
+class SchedulerRepository:
+    """Persistence of the embedded scheduler, one document per source (`_id` = source)."""
+
+    def __init__(self):
+        self.collection = ListaCollecciones.SchedulerState.value
+
+    @property
+    def database(self):
+        # Resolved on use so each worker process gets its own Mongo client
+        return MongoManagerCriptoScrapping.getInstance()
+
+    async def ensure_source(self, source: str, next_run: datetime, interval_seconds: float):
+        """
+        Crea el estado de una fuente si aún no existe (no pisa el de otro worker ni el de una ejecución previa).
+        """
+        document = {"_id": source, "nextRun": next_run, "intervalSeconds": interval_seconds,
+                    "leaseOwner": None, "leaseUntil": None, "lastRun": None}
+        try:
+            created = await self.database.insertIfMissing(self.collection, document)
+            return ResponseUtil.success("Estado del planificador asegurado.", data={"created": created})
+        except Exception as e:
+            Console.error(f"Error en SchedulerRepository al crear el estado de {source}: {e}")
+            return ResponseUtil.error(f"Error al crear el estado del planificador: {str(e)}")
+
+    async def list_states(self):
+        """
+        Recupera el estado de todas las fuentes planificadas.
+        """
+        try:
+            documents = await self.database.list(self.collection)
+            return ResponseUtil.success("Estados del planificador recuperados.", data=documents)
+        except Exception as e:
+            Console.error(f"Error en SchedulerRepository al listar estados: {e}")
+            return ResponseUtil.error(f"Error al listar los estados del planificador: {str(e)}")
+
+    async def claim(self, source: str, expected_next_run: datetime, next_run: datetime, now: datetime,
+                    owner: str, lease_until: Optional[datetime]):
+        """
+        Reclama de forma atómica la ejecución vencida de una fuente.
+
+        Solo tiene éxito si `nextRun` sigue siendo `expected_next_run` y no hay un
+        lease vigente, por lo que entre varios workers exactamente uno la obtiene.
+        Con `lease_until=None` solo se avanza `nextRun` (ejecución omitida).
+        """
+        filtro = {
+            "_id": source,
+            "nextRun": expected_next_run,
+            "$or": [{"leaseUntil": None}, {"leaseUntil": {"$lte": now}}],
+        }
+        update = {"$set": {"nextRun": next_run}}
+        if lease_until is not None:
+            update["$set"].update({"leaseOwner": owner, "leaseUntil": lease_until})
+        try:
+            document = await self.database.findOneAndUpdate(self.collection, filtro, update)
+            if document is None:
+                return ResponseUtil.warning(f"La ejecución de {source} ya fue reclamada por otro worker.")
+            return ResponseUtil.success("Ejecución reclamada.", data=document)
+        except Exception as e:
+            Console.error(f"Error en SchedulerRepository al reclamar {source}: {e}")
+            return ResponseUtil.error(f"Error al reclamar la ejecución: {str(e)}")
+
+    async def record_result(self, source: str, owner: str, result: dict):
+        """
+        Guarda el resultado de la última ejecución y libera el lease del worker.
+        """
+        try:
+            modified = await self.database.updateOne(
+                self.collection,
+                {"_id": source, "leaseOwner": owner},
+                {"$set": {"lastRun": result, "leaseOwner": None, "leaseUntil": None}},
+            )
+            return ResponseUtil.success("Resultado registrado.", data={"modified": modified})
+        except Exception as e:
+            Console.error(f"Error en SchedulerRepository al registrar el resultado de {source}: {e}")
+            return ResponseUtil.error(f"Error al registrar el resultado: {str(e)}")
@@ -1,11 +1,15 @@
 from datetime import datetime
+from typing import List
+from pymongo import IndexModel
 from backscrap.app.datasource.MongoManagerCriptoScrapping import MongoManagerCriptoScrapping
 from backscrap.app.pojo.enums.enumslist import ListaCollecciones, ListaOperadoresCondicionales
 from backscrap.app.utils.Global import ResponseUtil, Console
 
 class ScrappingRepository:
-    def __init__(self):
-        self.database = MongoManagerCriptoScrapping.getInstance()
+    @property
+    def database(self):
+        # Se resuelve en cada uso: cada proceso worker obtiene su propio cliente de Mongo
+        return MongoManagerCriptoScrapping.getInstance()
 
     async def save_scrapping_results(self, source: str, timestamp: datetime, records: list):
         """
@@ -30,24 +34,122 @@ class ScrappingRepository:
             Console.error(f"Error en ScrappingRepository al guardar: {e}")
             return ResponseUtil.error(f"Error al guardar los resultados del scraping: {str(e)}")
 
-    async def get_scrapping_results(self, source: str = None):
+    async def ensure_indexes(self):
         """
-        Recupera los resultados de scraping de la base de datos.
-        Puede filtrar por fuente si se proporciona.
+        Crea (si no existen) los índices de las consultas por fuente y ventana de tiempo
+        ordenadas por `timestamp` (/results, `since`, precarga de los motores).
         """
         try:
-            if source:
-                # Usa listWithCondition para filtrar por fuente
-                results = await self.database.listWithCondition(
-                    ListaCollecciones.ScrappingResults.value,
-                    "source",
-                    ListaOperadoresCondicionales.EQUAL,
-                    source
+            names = await self.database.crearIndices(ListaCollecciones.ScrappingResults.value, [
+                IndexModel([("source", 1), ("timestamp", 1)]),
+                IndexModel([("timestamp", 1)]),
+            ])
+            return ResponseUtil.success("Índices de resultados asegurados.", data={"indexes": names})
+        except Exception as e:
+            Console.error(f"Error en ScrappingRepository al crear índices: {e}")
+            return ResponseUtil.error(f"Error al crear los índices de resultados: {str(e)}")
+
+    async def get_scrapping_results(
+        self,
+        source: str = None,
+        since: datetime = None,
+        start: datetime = None,
+        end: datetime = None,
+        symbols: List[str] = None,
+    ):
+        """
+        Recupera los resultados de scraping de la base de datos, en orden cronológico.
+        Puede filtrar por fuente y quedarse solo con los lotes posteriores a `since`,
+        de modo que un cliente que ya tiene el historial descarga únicamente lo nuevo.
+        `start`/`end` acotan la ventana de tiempo y `symbols` deja en cada lote solo
+        las filas de esas monedas; ambos filtros se resuelven dentro de MongoDB.
+        """
+        filtro = {}
+        if source:
+            filtro["source"] = source
+        if since or start or end:
+            filtro["timestamp"] = {}
+            if since:
+                filtro["timestamp"][ListaOperadoresCondicionales.GREATER_THAN.value] = since
+            if start:
+                filtro["timestamp"][ListaOperadoresCondicionales.GREATER_THAN_OR_EQUAL_TO.value] = start
+            if end:
+                filtro["timestamp"][ListaOperadoresCondicionales.LESS_THAN_OR_EQUAL_TO.value] = end
+        try:
+            if not symbols:
+                results = await self.database.find(
+                    ListaCollecciones.ScrappingResults.value, filtro, sort=[("timestamp", 1)]
                 )
-            else:
-                # Obtiene todos los documentos si no se especifica una fuente
-                results = await self.database.list(ListaCollecciones.ScrappingResults.value)
+                return ResponseUtil.success("Resultados recuperados con éxito.", data=results)
+
+            # Solo los lotes que contienen alguna de las monedas, y de ellos solo esas filas
+            filtro["data.symbol"] = {ListaOperadoresCondicionales.IN.value: symbols}
+            results = await self.database.aggregate(ListaCollecciones.ScrappingResults.value, [
+                {"$match": filtro},
+                {"$sort": {"timestamp": 1}},
+                {"$project": {
+                    "source": 1,
+                    "timestamp": 1,
+                    "data": {"$filter": {"input": "$data", "cond": {"$in": ["$$this.symbol", symbols]}}},
+                }},
+            ])
+            for document in results:
+                document["id"] = str(document.pop("_id"))
             return ResponseUtil.success("Resultados recuperados con éxito.", data=results)
         except Exception as e:
             Console.error(f"Error en ScrappingRepository al obtener resultados: {e}")
-            return ResponseUtil.error(f"Error al obtener los resultados del scraping: {str(e)}")
\ No newline at end of file
+            return ResponseUtil.error(f"Error al obtener los resultados del scraping: {str(e)}")
+
+    async def get_symbols(self, source: str = None):
+        """
+        Recupera los símbolos distintos presentes en los resultados guardados.
+        """
+        try:
+            symbols = await self.database.distinct(
+                ListaCollecciones.ScrappingResults.value, "data.symbol", {"source": source} if source else None
+            )
+            return ResponseUtil.success("Símbolos recuperados con éxito.", data=sorted(str(s) for s in symbols if s))
+        except Exception as e:
+            Console.error(f"Error en ScrappingRepository al obtener símbolos: {e}")
+            return ResponseUtil.error(f"Error al obtener los símbolos: {str(e)}")
+
+    async def save_source_health(self, snapshot: dict):
+        """
+        Guarda (upsert) el estado del circuit breaker de una fuente (`_id` = fuente).
+        """
+        try:
+            document = {**snapshot, "_id": snapshot["source"], "updatedAt": datetime.now()}
+            await self.database.upsertMany(ListaCollecciones.SourceHealth.value, [document])
+            return ResponseUtil.success("Estado de la fuente guardado.", data=snapshot)
+        except Exception as e:
+            Console.error(f"Error en ScrappingRepository al guardar la salud de {snapshot.get('source')}: {e}")
+            return ResponseUtil.error(f"Error al guardar el estado de la fuente: {str(e)}")
+
+    async def get_sources_health(self):
+        """
+        Recupera el último estado guardado del circuit breaker de cada fuente.
+        """
+        try:
+            documents = await self.database.list(ListaCollecciones.SourceHealth.value)
+            return ResponseUtil.success("Estados de las fuentes recuperados.", data=documents)
+        except Exception as e:
+            Console.error(f"Error en ScrappingRepository al obtener la salud de las fuentes: {e}")
+            return ResponseUtil.error(f"Error al obtener el estado de las fuentes: {str(e)}")
+
+    async def get_scrapping_results_since(self, since: datetime):
+        """
+        Recupera los resultados de scraping con timestamp mayor o igual a `since`.
+        Se usa para reconstruir estados en memoria sin leer todo el historial.
+        """
+        try:
+            results = await self.database.listWithCondition(
+                ListaCollecciones.ScrappingResults.value,
+                "timestamp",
+                ListaOperadoresCondicionales.GREATER_THAN_OR_EQUAL_TO,
+                since
+            )
+            results.sort(key=lambda document: document["timestamp"])
+            return ResponseUtil.success("Resultados recuperados con éxito.", data=results)
+        except Exception as e:
+            Console.error(f"Error en ScrappingRepository al obtener resultados recientes: {e}")
+            return ResponseUtil.error(f"Error al obtener los resultados del scraping: {str(e)}")
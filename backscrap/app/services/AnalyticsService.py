@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Any, Awaitable, Callable, Hashable, List, Optional
+
+import numpy as np
+
+from backscrap.app.repository.AnalyticsRepository import AnalyticsRepository
+from backscrap.app.utils.cache import VersionedCache
+from backscrap.app.utils.downsampling import DownsamplingMethod, downsample
+from backscrap.app.utils.Global import ResponseUtil, Console
+
+
+class AnalyticsService:
+    """
+    Server-side aggregates for the dashboards.
+
+    Each aggregate is computed by a Mongo pipeline and memoized per data
+    version (the `_id` of the newest snapshot), so repeated dashboard reruns
+    hit the cache until the next scraping batch is stored.
+    """
+
+    def __init__(self, repository: AnalyticsRepository, cache: Optional[VersionedCache] = None):
+        self.repository = repository
+        self.cache = cache or VersionedCache()
+
+    @staticmethod
+    def _window_start(window_hours: Optional[float]) -> Optional[datetime]:
+        """Start of the requested window, floored to the minute so it can be part of a cache key."""
+        if not window_hours:
+            return None
+        since = datetime.now() - timedelta(hours=window_hours)
+        return since.replace(second=0, microsecond=0)
+
+    async def _cached(self, key: Hashable, compute: Callable[[], Awaitable[Any]]):
+        try:
+            version = await self.repository.get_data_version()
+            found, value = self.cache.get(key, version)
+            if not found:
+                value = await compute()
+                self.cache.set(key, version, value)
+            return ResponseUtil.success("Agregado calculado con éxito.", data=value)
+        except Exception as e:
+            Console.error(f"Error en AnalyticsService al calcular {key[0]}: {e}")
+            return ResponseUtil.error(f"Error al calcular el agregado: {str(e)}")
+
+    async def market_cap(self, window_hours: Optional[float], source: Optional[str], limit: int):
+        since = self._window_start(window_hours)
+        return await self._cached(
+            ("market_cap", since, source, limit),
+            lambda: self.repository.market_cap_ranking(since, source, limit),
+        )
+
+    async def change24h(self, window_hours: Optional[float], source: Optional[str]):
+        since = self._window_start(window_hours)
+
+        async def compute() -> dict:
+            rows = await self.repository.change24h_by_source(since, source)
+            pivot: dict = {}
+            for row in rows:
+                pivot.setdefault(row["name"], {})[row["source"]] = row["change24h"]
+            return {"rows": rows, "pivot": pivot}
+
+        return await self._cached(("change24h", since, source), compute)
+
+    async def volatility(self, window_hours: Optional[float], source: Optional[str], limit: int):
+        since = self._window_start(window_hours)
+        return await self._cached(
+            ("volatility", since, source, limit),
+            lambda: self.repository.volatility_ranking(since, source, limit),
+        )
+
+    async def top(self, window_hours: Optional[float], source: Optional[str], limit: int):
+        since = self._window_start(window_hours)
+        return await self._cached(
+            ("top", since, source, limit),
+            lambda: self.repository.top_by_source(since, source, limit),
+        )
+
+    async def moving_average(self, window_hours: Optional[float], source: Optional[str], symbol: str, window: int):
+        since = self._window_start(window_hours)
+        return await self._cached(
+            ("moving_average", since, source, symbol, window),
+            lambda: self.repository.moving_average(since, source, symbol, window),
+        )
+
+    async def price_series(
+        self,
+        symbols: List[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        source: Optional[str],
+        width: int,
+        method: DownsamplingMethod,
+    ):
+        """
+        Price series per (symbol, source) reduced to at most `width` points each,
+        i.e. about one point per horizontal pixel of the chart.
+        """
+        symbols = sorted(set(symbols))
+
+        async def compute() -> dict:
+            rows = await self.repository.price_series(start, end, source, symbols)
+            series = []
+            for (symbol, series_source), points in groupby(rows, key=lambda row: (row["symbol"], row["source"])):
+                points = list(points)
+                x = np.array([point["timestamp"].timestamp() for point in points])
+                y = np.array([point["price"] for point in points], dtype=float)
+                kept = downsample(x, y, width, method)
+                series.append({
+                    "symbol": symbol,
+                    "source": series_source,
+                    "rawPoints": len(points),
+                    "timestamps": [points[index]["timestamp"] for index in kept],
+                    "prices": y[kept].tolist(),
+                })
+            return {"method": method.value, "width": width, "series": series}
+
+        return await self._cached(("price_series", tuple(symbols), start, end, source, width, method), compute)
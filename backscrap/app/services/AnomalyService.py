@@ -0,0 +1,261 @@
+import json
+import math
+import statistics
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from backscrap.app.pojo.enums.enumslist import ListaCanales
+from backscrap.app.utils.broadcaster import broadcaster
+from backscrap.app.utils.config import (
+    ANOMALY_DIVERGENCE_MAX_AGE_SECONDS,
+    ANOMALY_DIVERGENCE_PCT,
+    ANOMALY_JUMP_MAX_RETURN,
+    ANOMALY_JUMP_ZSCORE,
+    ANOMALY_REBASE_AFTER,
+    ANOMALY_SCALE_RATIO,
+)
+from backscrap.app.utils.Global import ResponseUtil, Console
+from backscrap.app.utils.parsing import canonical_symbol, to_float
+
+NUMERIC_FIELDS = ("price", "change24h", "volume24h", "marketCap")
+
+
+class _ReturnStats:
+    """
+    Exponentially weighted mean/variance of log returns plus the last accepted
+    price, and the consecutive scale outliers seen since (`candidates`).
+    """
+
+    __slots__ = ("last_price", "mean", "var", "n", "candidates")
+
+    def __init__(self):
+        self.last_price: Optional[float] = None
+        self.mean = 0.0
+        self.var = 0.0
+        self.n = 0
+        self.candidates: List[float] = []
+
+    def rebase(self, price: float) -> None:
+        """Adopt `price` as the reference; the return statistics start over."""
+        self.last_price = price
+        self.mean = 0.0
+        self.var = 0.0
+        self.n = 0
+        self.candidates = []
+
+    def add(self, log_return: float, alpha: float) -> None:
+        delta = log_return - self.mean
+        self.mean += alpha * delta
+        self.var = (1 - alpha) * (self.var + alpha * delta ** 2)
+        self.n += 1
+
+
+class AnomalyService:
+    """
+    Ingest-time detection of suspicious data.
+
+    For every stored batch, each row is checked in O(1) against incremental
+    per-series statistics:
+
+    - `parse`: numeric fields that could not be parsed (aggregated per batch),
+    - `scale`: a price orders of magnitude away from the last one (or, for a
+      new series, from the median of the other sources), typically a
+      decimal/thousands separator mix-up (e.g. CoinMarketCap's locale),
+    - `rebase`: `rebase_after` consecutive scale outliers agreeing with each
+      other replaced the reference price, so a bad first row or a real
+      redenomination does not flag the series forever,
+    - `jump`: a log return far outside the series' usual distribution,
+    - `divergence`: a price too far from what other sources reported recently.
+
+    Alerts are kept in a bounded buffer and published on `anomaly_events`.
+    `on_ingest` returns the batch without the rows whose price was flagged
+    `scale` or could not be parsed, which is what the engines registered
+    after this one receive.
+    """
+
+    def __init__(
+        self,
+        jump_zscore: float = ANOMALY_JUMP_ZSCORE,
+        jump_max_return: float = ANOMALY_JUMP_MAX_RETURN,
+        scale_ratio: float = ANOMALY_SCALE_RATIO,
+        divergence_pct: float = ANOMALY_DIVERGENCE_PCT,
+        divergence_max_age_seconds: int = ANOMALY_DIVERGENCE_MAX_AGE_SECONDS,
+        rebase_after: int = ANOMALY_REBASE_AFTER,
+        min_samples: int = 10,
+        alpha: float = 0.1,
+        max_alerts: int = 500,
+    ):
+        self.jump_zscore = jump_zscore
+        self.jump_max_return = jump_max_return
+        self.scale_ratio = scale_ratio
+        self.divergence_pct = divergence_pct
+        self.divergence_max_age_seconds = divergence_max_age_seconds
+        self.rebase_after = max(1, rebase_after)
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self._stats: Dict[Tuple[str, str], _ReturnStats] = {}
+        # canonical symbol -> source -> (price, timestamp)
+        self._latest: Dict[str, Dict[str, Tuple[float, datetime]]] = {}
+        self._alerts: Deque[dict] = deque(maxlen=max_alerts)
+        # False on API processes that are not the ingest leader (see IngestLeaderService)
+        self.publishes = True
+
+    @staticmethod
+    def _alert(kind: str, severity: str, source: str, timestamp: datetime, message: str,
+               symbol: Optional[str] = None, **details) -> dict:
+        return {
+            "type": kind,
+            "severity": severity,
+            "source": source,
+            "symbol": symbol,
+            "timestamp": timestamp.isoformat(),
+            "message": message,
+            "details": details,
+        }
+
+    def _is_scale_outlier(self, ratio: float) -> bool:
+        return ratio >= self.scale_ratio or ratio <= 1 / self.scale_ratio
+
+    def _cross_source_median(self, source: str, symbol: str, timestamp: datetime) -> Optional[float]:
+        """Median of the recent prices of `symbol` from the other sources, if any."""
+        quotes = [
+            quote
+            for other, (quote, seen) in self._latest.get(canonical_symbol(symbol), {}).items()
+            if other != source and abs((timestamp - seen).total_seconds()) <= self.divergence_max_age_seconds
+        ]
+        return statistics.median(quotes) if quotes else None
+
+    def _check_price(self, source: str, symbol: str, price: float, timestamp: datetime) -> List[dict]:
+        stats = self._stats.get((source, symbol))
+        if stats is None:
+            stats = self._stats[(source, symbol)] = _ReturnStats()
+        reference, basis = stats.last_price, "last value"
+        if reference is None:
+            # A new series is seeded from its first price unless the other sources disagree by orders of magnitude
+            reference, basis = self._cross_source_median(source, symbol, timestamp), "cross-source median"
+            if reference is None or not self._is_scale_outlier(price / reference):
+                stats.rebase(price)
+                return []
+
+        ratio = price / reference
+        if self._is_scale_outlier(ratio):
+            # Keep the previous reference price so one bad row does not poison the series...
+            if stats.candidates and abs(price / stats.candidates[-1] - 1) <= self.jump_max_return:
+                stats.candidates.append(price)
+            else:
+                stats.candidates = [price]
+            # ...but a run of consistent prices is the new normal (or the reference was the bad one)
+            if len(stats.candidates) >= self.rebase_after:
+                stats.rebase(price)
+                return [self._alert(
+                    "rebase", "info", source, timestamp,
+                    f"{symbol} reference moved from {reference:g} to {price:g} after "
+                    f"{self.rebase_after} consistent prices.",
+                    symbol, price=price, previousReference=reference, ratio=ratio,
+                )]
+            return [self._alert(
+                "scale", "critical", source, timestamp,
+                f"{symbol} parsed as {price:g}, {ratio:.4g}x the {basis} {reference:g}; "
+                "likely a decimal/thousands separator error.",
+                symbol, price=price, lastPrice=reference, ratio=ratio,
+                orderOfMagnitude=round(math.log10(ratio)),
+            )]
+        stats.candidates = []
+
+        alerts = []
+        log_return = math.log(ratio)
+        std = math.sqrt(stats.var)
+        zscore = (log_return - stats.mean) / std if std > 0 else 0.0
+        if abs(ratio - 1) > self.jump_max_return or (stats.n >= self.min_samples and abs(zscore) > self.jump_zscore):
+            alerts.append(self._alert(
+                "jump", "warning", source, timestamp,
+                f"{symbol} moved {(ratio - 1) * 100:+.2f}% since the last snapshot.",
+                symbol, price=price, lastPrice=stats.last_price, zscore=zscore,
+            ))
+        stats.add(log_return, self.alpha)
+        stats.last_price = price
+        return alerts
+
+    def _check_divergence(self, source: str, symbol: str, price: float, timestamp: datetime) -> List[dict]:
+        key = canonical_symbol(symbol)
+        quotes = self._latest.setdefault(key, {})
+        quotes[source] = (price, timestamp)
+        others = {
+            other: quote
+            for other, (quote, seen) in quotes.items()
+            if other != source and abs((timestamp - seen).total_seconds()) <= self.divergence_max_age_seconds
+        }
+        diverging = {
+            other: (price - quote) / quote * 100
+            for other, quote in others.items()
+            if abs(price - quote) / quote * 100 > self.divergence_pct
+        }
+        if not diverging:
+            return []
+        worst = max(diverging.values(), key=abs)
+        return [self._alert(
+            "divergence", "warning", source, timestamp,
+            f"{key} from {source} differs {worst:+.2f}% from other sources.",
+            key, price=price, deviationPct=diverging,
+        )]
+
+    def inspect_batch(self, source: str, timestamp: datetime, records: list) -> Tuple[List[dict], list]:
+        """
+        Run every check over one batch. Returns the alerts it raised and the
+        records fit for the other engines (price parsed and not flagged `scale`).
+        """
+        alerts: List[dict] = []
+        accepted: list = []
+        parse_failures: Dict[str, List[str]] = {}
+        for index, record in enumerate(records):
+            symbol = str(record.get("symbol") or "").strip()
+            label = symbol or f"row {record.get('row', index + 1)}"
+            values = {field: to_float(record.get(field)) for field in NUMERIC_FIELDS}
+            for field, value in values.items():
+                if value is None:
+                    parse_failures.setdefault(field, []).append(label)
+
+            price = values["price"]
+            if not symbol or price is None or price <= 0:
+                if price is not None:
+                    accepted.append(record)
+                continue
+            price_alerts = self._check_price(source, symbol, price, timestamp)
+            alerts += price_alerts
+            if not any(alert["type"] == "scale" for alert in price_alerts):
+                alerts += self._check_divergence(source, symbol, price, timestamp)
+                accepted.append(record)
+
+        if parse_failures:
+            total = sum(len(labels) for labels in parse_failures.values())
+            alerts.insert(0, self._alert(
+                "parse", "warning", source, timestamp,
+                f"{total} numeric field(s) could not be parsed in the {source} batch.",
+                fields={field: labels[:10] for field, labels in parse_failures.items()},
+                rows=len(records),
+            ))
+        return alerts, accepted
+
+    async def on_ingest(self, source: str, timestamp: datetime, records: list) -> list:
+        """Ingest listener: publish every alert and hand the flagged rows' batch to the next engines without them."""
+        alerts, accepted = self.inspect_batch(source, timestamp, records)
+        for alert in alerts:
+            self._alerts.append(alert)
+            if not self.publishes:
+                continue
+            Console.warn(f"Anomalía {alert['type']} en {source}: {alert['message']}")
+            await broadcaster.publish(channel=ListaCanales.AnomalyEvents.value, message=json.dumps(alert))
+        return accepted
+
+    async def warm_up(self) -> None:
+        """Statistics start empty and converge after a few batches; nothing to preload."""
+        return None
+
+    def get_alerts(self, limit: int, kind: Optional[str] = None, source: Optional[str] = None):
+        """Most recent alerts first, optionally filtered by type and source."""
+        alerts = [
+            alert for alert in reversed(self._alerts)
+            if (not kind or alert["type"] == kind) and (not source or alert["source"] == source)
+        ]
+        return ResponseUtil.success("Alertas recuperadas.", data=alerts[:limit])
@@ -0,0 +1,150 @@
+import json
+import statistics
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from backscrap.app.pojo.enums.enumslist import ListaCanales
+from backscrap.app.repository.ScrappingRepository import ScrappingRepository
+from backscrap.app.utils.broadcaster import broadcaster
+from backscrap.app.utils.config import CONSOLIDATION_BUCKET_SECONDS, CONSOLIDATION_MAX_BUCKETS
+from backscrap.app.utils.Global import ResponseUtil, Console
+from backscrap.app.utils.parsing import DEFAULT_SYMBOL_ALIASES, canonical_symbol, iter_prices
+
+
+class ConsolidationService:
+    """
+    Reconciles the quotes of the same coin across sources.
+
+    Snapshots are aligned by time bucket (`bucket_seconds`): each bucket keeps,
+    per canonical symbol, the last price reported by every source inside it.
+    When a source's batch arrives only the symbols it touched are recomputed,
+    so the consolidated price (median across sources) and the spread are
+    maintained incrementally instead of being rebuilt from the full history.
+    """
+
+    def __init__(
+        self,
+        repository: ScrappingRepository,
+        bucket_seconds: int = CONSOLIDATION_BUCKET_SECONDS,
+        max_buckets: int = CONSOLIDATION_MAX_BUCKETS,
+        aliases: Optional[Dict[str, str]] = None,
+    ):
+        self.repository = repository
+        self.bucket_seconds = bucket_seconds
+        self.max_buckets = max_buckets
+        self.aliases = {k.upper(): v.upper() for k, v in (aliases or DEFAULT_SYMBOL_ALIASES).items()}
+        # False on API processes that are not the ingest leader (see IngestLeaderService)
+        self.publishes = True
+        # bucket_start -> canonical symbol -> source -> price
+        self._quotes: "OrderedDict[datetime, Dict[str, Dict[str, float]]]" = OrderedDict()
+        # bucket_start -> canonical symbol -> consolidated view
+        self._consolidated: Dict[datetime, Dict[str, dict]] = {}
+        # canonical symbol -> source -> raw symbol as published by that source
+        self._symbol_map: Dict[str, Dict[str, str]] = {}
+
+    # --- Alignment helpers ---
+
+    def canonical_symbol(self, symbol: str) -> str:
+        """Return the cross-source key for a raw ticker."""
+        return canonical_symbol(symbol, self.aliases)
+
+    def bucket_of(self, timestamp: datetime) -> datetime:
+        """Start of the time bucket that contains `timestamp`."""
+        epoch = timestamp.timestamp()
+        return datetime.fromtimestamp(epoch - epoch % self.bucket_seconds, tz=timestamp.tzinfo)
+
+    @staticmethod
+    def _consolidate(symbol: str, bucket: datetime, quotes: Dict[str, float]) -> dict:
+        prices = list(quotes.values())
+        price = statistics.median(prices)
+        spread = max(prices) - min(prices)
+        return {
+            "symbol": symbol,
+            "bucket": bucket.isoformat(),
+            "price": price,
+            "spread": spread,
+            "spreadPct": spread / price * 100 if price else None,
+            "sources": {
+                source: {"price": quote, "deviationPct": (quote - price) / price * 100 if price else None}
+                for source, quote in sorted(quotes.items())
+            },
+        }
+
+    # --- Incremental ingestion ---
+
+    def apply_batch(self, source: str, timestamp: datetime, records: list) -> List[dict]:
+        """Merge one source batch into its bucket and return the consolidated rows it changed."""
+        bucket = self.bucket_of(timestamp)
+        if bucket not in self._quotes:
+            if self._quotes and bucket < next(iter(self._quotes)):
+                return []  # Older than the retained horizon
+            out_of_order = bool(self._quotes) and bucket < next(reversed(self._quotes))
+            self._quotes[bucket] = {}
+            self._consolidated[bucket] = {}
+            if out_of_order:
+                self._quotes = OrderedDict(sorted(self._quotes.items()))
+            while len(self._quotes) > self.max_buckets:
+                evicted, _ = self._quotes.popitem(last=False)
+                self._consolidated.pop(evicted, None)
+
+        bucket_quotes = self._quotes[bucket]
+        changed: List[dict] = []
+        for raw_symbol, price in iter_prices(records):
+            symbol = self.canonical_symbol(raw_symbol)
+            self._symbol_map.setdefault(symbol, {})[source] = raw_symbol
+            quotes = bucket_quotes.setdefault(symbol, {})
+            quotes[source] = price
+            row = self._consolidate(symbol, bucket, quotes)
+            self._consolidated[bucket][symbol] = row
+            changed.append(row)
+        return changed
+
+    async def on_ingest(self, source: str, timestamp: datetime, records: list) -> None:
+        """Ingest listener: update the engine and publish the changed rows over SSE."""
+        changed = self.apply_batch(source, timestamp, records)
+        if changed and self.publishes:
+            await broadcaster.publish(
+                channel=ListaCanales.ConsolidationEvents.value,
+                message=json.dumps({"source": source, "bucket": changed[0]["bucket"], "symbols": changed}),
+            )
+
+    async def warm_up(self) -> None:
+        """Rebuild the retained buckets from the recent snapshots only."""
+        since = datetime.now() - timedelta(seconds=self.bucket_seconds * self.max_buckets)
+        response = await self.repository.get_scrapping_results_since(since)
+        if response.status != 2:
+            Console.warn(f"No se pudo precargar la consolidación: {response.message}")
+            return
+        for document in response.data:
+            self.apply_batch(document["source"], document["timestamp"], document.get("data", []))
+        Console.log(f"Consolidación precargada con {len(response.data)} snapshots.")
+
+    # --- Read side ---
+
+    def get_latest(self):
+        """Consolidated prices of the most recent bucket."""
+        if not self._consolidated:
+            return ResponseUtil.warning("Aún no hay datos consolidados.")
+        bucket = next(reversed(self._quotes))
+        rows = sorted(self._consolidated[bucket].values(), key=lambda row: row["symbol"])
+        return ResponseUtil.success("Datos consolidados recuperados.", data={"bucket": bucket.isoformat(), "symbols": rows})
+
+    def get_symbol_history(self, symbol: str, limit: int):
+        """Consolidated price and spread of one symbol over the retained buckets (newest last)."""
+        symbol = self.canonical_symbol(symbol)
+        history = [
+            self._consolidated[bucket][symbol]
+            for bucket in self._quotes
+            if symbol in self._consolidated[bucket]
+        ]
+        if not history:
+            return ResponseUtil.warning(f"No hay datos consolidados para {symbol}.")
+        return ResponseUtil.success("Historial consolidado recuperado.", data=history[-limit:])
+
+    def get_symbol_map(self):
+        """Canonical symbol → {source: raw symbol} mapping observed so far, plus the alias table."""
+        return ResponseUtil.success(
+            "Mapeo de símbolos recuperado.",
+            data={"aliases": self.aliases, "symbols": self._symbol_map},
+        )
@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from backscrap.app.repository.IndicatorRepository import IndicatorRepository
+from backscrap.app.utils.config import (
+    INDICATOR_EMA_PERIODS,
+    INDICATOR_RSI_PERIOD,
+    INDICATOR_SMA_PERIOD,
+    INDICATOR_VOLATILITY_WINDOW,
+)
+from backscrap.app.utils.Global import ResponseUtil, Console
+from backscrap.app.utils.indicators import IndicatorState
+from backscrap.app.utils.parsing import to_float
+
+SeriesKey = Tuple[str, str]
+
+
+class IndicatorService:
+    """
+    Streaming technical indicators per (source, symbol).
+
+    Each stored batch advances the touched series in O(1) per row and the
+    updated states are persisted with a single bulk upsert, so a restart
+    resumes from the last state instead of replaying the whole history.
+    With several API processes every one of them advances its states, but
+    only the ingest leader persists them, and never over a newer state.
+    """
+
+    def __init__(self, repository: IndicatorRepository):
+        self.repository = repository
+        self._states: Dict[SeriesKey, IndicatorState] = {}
+        # False on API processes that are not the ingest leader (see IngestLeaderService)
+        self.publishes = True
+
+    def _new_state(self) -> IndicatorState:
+        return IndicatorState(
+            sma_period=INDICATOR_SMA_PERIOD,
+            ema_periods=INDICATOR_EMA_PERIODS,
+            rsi_period=INDICATOR_RSI_PERIOD,
+            volatility_window=INDICATOR_VOLATILITY_WINDOW,
+        )
+
+    async def warm_up(self) -> None:
+        """Restore the persisted states (one document per series)."""
+        response = await self.repository.load_states()
+        if response.status != 2:
+            Console.warn(f"No se pudieron restaurar los indicadores: {response.message}")
+            return
+        for document in response.data:
+            try:
+                self._states[(document["source"], document["symbol"])] = IndicatorState.from_dict(document["state"])
+            except (KeyError, TypeError) as e:
+                Console.warn(f"Estado de indicador descartado para {document.get('id')}: {e}")
+        Console.log(f"Indicadores restaurados para {len(self._states)} series.")
+
+    async def on_ingest(self, source: str, timestamp: datetime, records: list) -> None:
+        """Ingest listener: advance each series by one point and persist the touched states."""
+        touched: Dict[SeriesKey, dict] = {}
+        for record in records:
+            symbol = str(record.get("symbol") or "").strip()
+            price = to_float(record.get("price"))
+            if not symbol or price is None or price <= 0:
+                continue
+            key = (source, symbol)
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = self._new_state()
+            if state.last_timestamp is not None and timestamp <= state.last_timestamp:
+                continue  # Already folded in (e.g. replay after a restart)
+            state.update(price, timestamp, to_float(record.get("change24h")))
+            touched[key] = state.to_dict()
+
+        if touched and self.publishes:
+            await self.repository.save_states(touched)
+
+    def get_indicators(self, source: Optional[str], symbol: Optional[str]):
+        """Current indicator values for every series matching the filters."""
+        rows = [
+            {"source": key[0], "symbol": key[1], **state.values()}
+            for key, state in sorted(self._states.items())
+            if (not source or key[0] == source) and (not symbol or key[1].upper() == symbol.upper())
+        ]
+        if not rows:
+            return ResponseUtil.warning("No hay indicadores para los filtros solicitados.")
+        return ResponseUtil.success("Indicadores recuperados.", data=rows)
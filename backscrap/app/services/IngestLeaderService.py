@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from backscrap.app.repository.LeaseRepository import LeaseRepository
+from backscrap.app.utils.config import INGEST_LEADER_LEASE_SECONDS
+from backscrap.app.utils.logger import log_event
+
+# Name of the lease document in `leases`
+LEASE_NAME = "ingest-engines"
+
+
+class IngestLeaderService:
+    """
+    Elects the API process that publishes the output of the ingest engines.
+
+    Every API process feeds the stored batches to its own engines, so the read
+    endpoints answer the same on every worker. With several processes
+    (`run.py --workers N`) only the holder of the `ingest-engines` lease in
+    `leases` publishes derived events (price deltas, consolidation, anomaly
+    alerts) and persists engine state; the engines of the other processes get
+    `publishes = False`. The election only runs with a cross-process
+    broadcaster: with `memory://` no batch reaches another process, so every
+    process publishes its own. The lease is renewed every third of
+    `lease_seconds` and a process that finds it held by another one stops
+    publishing at once; when the leader dies another process takes over once
+    the lease expires. A process that cannot read the lease keeps publishing,
+    so an unreachable `leases` collection never silences a sole process.
+    """
+
+    def __init__(self, repository: LeaseRepository, engines: list, lease_seconds: float = INGEST_LEADER_LEASE_SECONDS):
+        self.repository = repository
+        self.engines: List[object] = engines
+        self.lease = timedelta(seconds=lease_seconds)
+        self.owner: Optional[str] = None
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    def _set_leader(self, is_leader: bool) -> None:
+        if is_leader == self.is_leader:
+            return
+        self.is_leader = is_leader
+        for engine in self.engines:
+            engine.publishes = is_leader
+        log_event(
+            logging.INFO,
+            "Este proceso publica los eventos de los motores de ingesta." if is_leader
+            else "Este proceso deja de publicar los eventos de los motores de ingesta.",
+            owner=self.owner,
+        )
+
+    async def renew(self) -> bool:
+        """Take or renew the lease; returns whether this process is the leader."""
+        now = datetime.now()
+        response = await self.repository.acquire(LEASE_NAME, self.owner, now, now + self.lease)
+        # Only a lease held by another process (warning) makes this one a follower
+        self._set_leader(response.status != 3)
+        return self.is_leader
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease.total_seconds() / 3)
+            await self.renew()
+
+    async def start(self) -> None:
+        """Try to become the leader before the first batch arrives, then keep competing for the lease."""
+        if self._task is not None:
+            return
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        # Followers until the lease says otherwise
+        for engine in self.engines:
+            engine.publishes = False
+        await self.repository.ensure_lease(LEASE_NAME)
+        await self.renew()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop renewing and hand the lease over right away."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self.is_leader:
+            await self.repository.release(LEASE_NAME, self.owner)
+        self._set_leader(False)
@@ -0,0 +1,404 @@
+import asyncio
+import itertools
+import logging
+import os
+import socket
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Dict, List, Optional
+
+from backscrap.app.repository.JobRepository import JobRepository
+from backscrap.app.services.ScrappingService import ScrappingService
+from backscrap.app.utils.broadcaster import is_process_local
+from backscrap.app.utils.config import (
+    JOB_EXECUTOR,
+    JOB_HEARTBEAT_SECONDS,
+    JOB_HISTORY_SIZE,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_SECONDS,
+    JOB_QUEUE_SIZE,
+    JOB_WORKERS,
+)
+from backscrap.app.utils.Global import Console, ResponseUtil
+from backscrap.app.utils.logger import correlation, log_event
+from backscrap.app.utils.metrics import observe_stages
+from backscrap.app.utils.profiling import profile
+
+
+class JobPriority(str, Enum):
+    MANUAL = "manual"
+    SCHEDULED = "scheduled"
+
+
+class JobExecutor(str, Enum):
+    API = "api"  # In-process workers
+    WORKERS = "workers"  # Standalone worker processes (`python -m backscrap.worker`)
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+# Lower rank runs first: a manual request never waits behind scheduled ones
+PRIORITY_RANK = {JobPriority.MANUAL.value: 0, JobPriority.SCHEDULED.value: 1}
+FINISHED = {JobStatus.SUCCEEDED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value}
+
+
+class JobService:
+    """
+    Queue of scrape jobs served by a bounded pool of workers.
+
+    `submit` returns a job immediately; `JOB_WORKERS` asyncio workers take
+    jobs by priority (manual before scheduled, FIFO within a priority), so at
+    most that many browsers run per API process; a cancelled job keeps its
+    worker busy until its browser thread ends. A second request for a
+    source that is already queued returns the queued job (upgrading its
+    priority if needed). Every state change is persisted in `scrape_jobs`.
+    The process renews a lease on its unfinished jobs every
+    `JOB_HEARTBEAT_SECONDS`, and `start()` re-queues the jobs whose owner let
+    the lease expire (a process that died), never those of a live sibling
+    worker; jobs that already ran `JOB_MAX_ATTEMPTS` times are failed instead.
+    Each job records the time spent per stage (queue wait, scrape, save,
+    ingest, broadcast).
+
+    With `JOB_EXECUTOR=workers` the API runs no scrapes: jobs are only
+    persisted, standalone workers (`WorkerService`) claim them from Mongo with
+    leases, and the batches they store reach this process's ingest listeners
+    through the `ingest_batches` channel. With a cross-process broadcaster the
+    batches scraped by this process take the same channel, so every API
+    process feeds the same batches to its engines.
+    """
+
+    def __init__(
+        self,
+        repository: JobRepository,
+        scrapping_service: ScrappingService,
+        workers: int = JOB_WORKERS,
+        max_queued: int = JOB_QUEUE_SIZE,
+        history_size: int = JOB_HISTORY_SIZE,
+        executor: JobExecutor = JobExecutor(JOB_EXECUTOR),
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ):
+        self.repository = repository
+        self.scrapping_service = scrapping_service
+        self.workers = workers
+        self.max_queued = max_queued
+        self.history_size = history_size
+        self.executor = executor
+        self.lease = timedelta(seconds=lease_seconds)
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.owner: Optional[str] = None
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._sequence = itertools.count()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._finished: Dict[str, asyncio.Event] = {}
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+        self._ingest_task: Optional[asyncio.Task] = None
+        self._lease_task: Optional[asyncio.Task] = None
+
+    @property
+    def remote(self) -> bool:
+        return self.executor is JobExecutor.WORKERS
+
+    # --- Ciclo de vida ---
+
+    async def start(self) -> None:
+        """Re-queue the jobs a dead process left unfinished and start the worker pool."""
+        if self._workers or self._ingest_task:
+            return
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._queue = asyncio.PriorityQueue()
+        self._stopping = False
+        if not is_process_local():
+            # Every API process feeds every stored batch to its engines, whichever process scraped it
+            self.scrapping_service.relay_ingest()
+        if self.remote or not is_process_local():
+            self._ingest_task = asyncio.create_task(self.scrapping_service.consume_remote_ingest())
+        if self.remote:
+            # Standalone workers scrape and recover expired leases; only relay their batches
+            if is_process_local():
+                Console.warn("JOB_EXECUTOR=workers con BROADCAST_URL memory://: los lotes de los workers no llegarán a la API.")
+            Console.log("Cola de jobs en modo workers: los scrapes los ejecutan los workers independientes.")
+            return
+        # Circuits opened before a restart stay open
+        await self.scrapping_service.load_health()
+        response = await self.repository.list_jobs([JobStatus.QUEUED.value, JobStatus.RUNNING.value], limit=0)
+        for stale in (response.data if response.status == 2 else []):
+            # Jobs of standalone workers are recovered by the workers themselves
+            if stale.get("owner") in (self.owner, None) or stale.get("executor") == JobExecutor.WORKERS.value:
+                continue
+            now = datetime.now()
+            claim = await self.repository.claim_job(stale["id"], stale.get("owner"), self.owner, now, now + self.lease)
+            if claim.status != 2:
+                continue
+            job = claim.data
+            job.setdefault("rank", PRIORITY_RANK[job["priority"]])
+            if job.get("attempts", 0) >= self.max_attempts:
+                job.update(status=JobStatus.FAILED.value, finishedAt=now, leaseUntil=None, result={
+                    "status": 4, "message": f"Job abandonado tras {job['attempts']} intentos sin terminar.",
+                })
+                await self.repository.save_job(job)
+                continue
+            job.update(status=JobStatus.QUEUED.value, startedAt=None, note="Re-encolado tras reinicio.")
+            self._remember(job)
+            self._enqueue(job)
+            await self.repository.save_job(job)
+        self._lease_task = asyncio.create_task(self._renew_leases())
+        self._workers = [asyncio.create_task(self._work(index)) for index in range(self.workers)]
+        Console.log(f"Cola de jobs iniciada con {self.workers} workers ({self._queue.qsize()} re-encolados).")
+
+    async def stop(self) -> None:
+        """
+        Stop the pool; interrupted jobs stay queued/running in Mongo with their lease
+        released, so the next process that starts re-queues them right away.
+        """
+        self._stopping = True
+        tasks = [
+            *self._workers,
+            *self._running.values(),
+            *(task for task in (self._ingest_task, self._lease_task) if task is not None),
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._lease_task is not None:
+            await self.repository.renew_leases(self.owner, None)
+        self._workers = []
+        self._running.clear()
+        self._ingest_task = None
+        self._lease_task = None
+
+    def _lease_until(self) -> datetime:
+        return datetime.now() + self.lease
+
+    async def _renew_leases(self) -> None:
+        """Keep the lease of this process's unfinished jobs alive (in memory too, as `save_job` rewrites it)."""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            lease_until = self._lease_until()
+            for job in self._jobs.values():
+                if job["status"] not in FINISHED:
+                    job["leaseUntil"] = lease_until
+            await self.repository.renew_leases(self.owner, lease_until)
+
+    # --- Cola ---
+
+    def _remember(self, job: dict) -> None:
+        self._jobs[job["id"]] = job
+        self._jobs.move_to_end(job["id"])
+        self._finished.setdefault(job["id"], asyncio.Event())
+        # Forget the oldest finished jobs; Mongo keeps the full history
+        while len(self._jobs) > self.history_size:
+            oldest_id = next((job_id for job_id, item in self._jobs.items() if item["status"] in FINISHED), None)
+            if oldest_id is None:
+                break
+            del self._jobs[oldest_id]
+            self._finished.pop(oldest_id, None)
+
+    def _enqueue(self, job: dict) -> None:
+        self._queue.put_nowait((job["rank"], next(self._sequence), job["id"]))
+
+    def _queued(self) -> List[dict]:
+        return [job for job in self._jobs.values() if job["status"] == JobStatus.QUEUED.value]
+
+    async def _find_queued(self, source: str) -> Optional[dict]:
+        if not self.remote:
+            return next((job for job in self._queued() if job["source"] == source), None)
+        response = await self.repository.list_jobs([JobStatus.QUEUED.value], source, limit=1)
+        return response.data[0] if response.status == 2 and response.data else None
+
+    async def _count_queued(self) -> int:
+        if not self.remote:
+            return len(self._queued())
+        response = await self.repository.count_jobs([JobStatus.QUEUED.value])
+        return response.data["total"] if response.status == 2 else 0
+
+    async def submit(self, source: str, priority: JobPriority = JobPriority.MANUAL, profiled: bool = False):
+        """
+        Queue a scrape of `source`; returns the new job, or the job already queued for it
+        (which keeps its own `profile` flag). `profiled` records a profile of the run.
+        """
+        if self._queue is None:
+            return ResponseUtil.error("La cola de jobs no está iniciada.")
+        rank = PRIORITY_RANK[priority.value]
+        existing = await self._find_queued(source)
+        if existing is not None:
+            if rank < existing["rank"]:
+                if self.remote:
+                    upgraded = await self.repository.raise_priority(existing["id"], priority.value, rank)
+                    existing = upgraded.data if upgraded.status == 2 else existing
+                else:
+                    existing.update(priority=priority.value, rank=rank)
+                    self._enqueue(existing)  # The stale entry is skipped when popped
+                    await self.repository.save_job(existing)
+            return ResponseUtil.success(f"Ya hay un job en cola para {source}.", data=existing)
+        if await self._count_queued() >= self.max_queued:
+            return ResponseUtil.warning(f"La cola de jobs está llena ({self.max_queued}).")
+
+        now = datetime.now()
+        job = {
+            "id": uuid.uuid4().hex,
+            "source": source,
+            "priority": priority.value,
+            "rank": rank,
+            "status": JobStatus.QUEUED.value,
+            "attempts": 0,
+            # Only jobs of the workers mode can be claimed by standalone workers
+            "executor": self.executor.value,
+            # Remote jobs belong to nobody until a worker claims them
+            "owner": None if self.remote else self.owner,
+            "leaseUntil": None if self.remote else self._lease_until(),
+            "createdAt": now,
+            "queuedAt": now,
+            "startedAt": None,
+            "finishedAt": None,
+            "timings": {},
+            "profile": profiled,
+            "profileId": None,
+            "result": None,
+            "note": None,
+        }
+        if not self.remote:
+            self._remember(job)
+            self._enqueue(job)
+        await self.repository.save_job(job)
+        return ResponseUtil.success(f"Job encolado para {source}.", data=job)
+
+    async def _work(self, index: int) -> None:
+        while True:
+            rank, _, job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            # Cancelled while queued, or a stale entry left by a priority upgrade
+            if job is None or job["status"] != JobStatus.QUEUED.value or job["rank"] != rank:
+                continue
+            threads: List[asyncio.Future] = []
+            task = asyncio.create_task(self._execute(job, threads))
+            self._running[job_id] = task
+            try:
+                await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if self._stopping or not task.done():
+                    raise  # The worker itself is being stopped
+            finally:
+                self._running.pop(job_id, None)
+            # A cancelled scrape's browser thread runs on: take no other job until it ends
+            await asyncio.gather(*threads, return_exceptions=True)
+
+    async def _execute(self, job: dict, threads: List[asyncio.Future]) -> None:
+        with correlation(job["id"]):
+            started = datetime.now()
+            job.update(status=JobStatus.RUNNING.value, startedAt=started, attempts=job.get("attempts", 0) + 1)
+            job["timings"] = {"queueWait": round((started - job["queuedAt"]).total_seconds(), 4)}
+            await self.repository.save_job(job)
+            try:
+                with profile("job", f"{job['source']} job {job['id']}", enabled=job.get("profile", False)) as recorded:
+                    if recorded is not None:
+                        job["profileId"] = recorded["id"]
+                    response = await self.scrapping_service.run_scraping_and_save(
+                        job["source"], timings=job["timings"], threads=threads
+                    )
+                status = JobStatus.SUCCEEDED if response.status == 2 else JobStatus.FAILED
+                job["result"] = {"status": response.status, "message": response.message}
+            except asyncio.CancelledError:
+                if self._stopping:
+                    raise  # Left as running in Mongo: re-queued by the next start()
+                status = JobStatus.CANCELLED
+                job["result"] = {"status": 3, "message": "Job cancelado durante la ejecución."}
+            except Exception as e:  # noqa: BLE001
+                status = JobStatus.FAILED
+                job["result"] = {"status": 4, "message": str(e)}
+            finished = datetime.now()
+            job["timings"]["total"] = round((finished - started).total_seconds(), 4)
+            observe_stages(job["source"], {name: job["timings"][name] for name in ("queueWait", "total")})
+            job.update(status=status.value, finishedAt=finished, leaseUntil=None)
+            await self.repository.save_job(job)
+            self._finished[job["id"]].set()
+            log_event(logging.INFO, "Job terminado.", source=job["source"], status=status.value, timings=job["timings"])
+
+    # --- Consultas y control ---
+
+    async def cancel(self, job_id: str):
+        """Cancel a queued job, or interrupt a running one (its browser thread finishes on its own, holding the worker)."""
+        if self.remote:
+            # A running job is interrupted by its worker on the next heartbeat
+            return await self.repository.cancel_job(job_id, datetime.now())
+        job = self._jobs.get(job_id)
+        if job is None:
+            response = await self.repository.get_job(job_id)
+            if response.status != 2:
+                return response
+            return ResponseUtil.warning(f"El job {job_id} no pertenece a este proceso o ya terminó.")
+        if job["status"] in FINISHED:
+            return ResponseUtil.warning(f"El job {job_id} ya terminó ({job['status']}).")
+        if job["status"] == JobStatus.QUEUED.value:
+            job.update(status=JobStatus.CANCELLED.value, finishedAt=datetime.now(), leaseUntil=None,
+                       result={"status": 3, "message": "Job cancelado antes de ejecutarse."})
+            await self.repository.save_job(job)
+            self._finished[job_id].set()
+        else:
+            task = self._running.get(job_id)
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        return ResponseUtil.success("Job cancelado.", data=job)
+
+    async def wait(self, job_id: str) -> Optional[dict]:
+        """Wait until a job finishes and return it (polls Mongo for jobs run by standalone workers)."""
+        if self.remote:
+            while True:
+                response = await self.repository.get_job(job_id)
+                if response.status == 4 or (response.status == 2 and response.data["status"] in FINISHED):
+                    return response.data
+                if response.status == 3:
+                    return None
+                await asyncio.sleep(JOB_POLL_SECONDS)
+        event = self._finished.get(job_id)
+        if event is None:
+            return None
+        await event.wait()
+        return self._jobs.get(job_id)
+
+    async def get_job(self, job_id: str):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return ResponseUtil.success("Job recuperado.", data=job)
+        return await self.repository.get_job(job_id)
+
+    async def list_jobs(self, status: Optional[JobStatus] = None, source: Optional[str] = None, limit: int = 50):
+        return await self.repository.list_jobs([status.value] if status else None, source, limit)
+
+    async def stats(self) -> Dict[str, object]:
+        if self.remote:
+            # Workers that sent a heartbeat within one lease are considered alive
+            seen_since = datetime.now() - timedelta(seconds=JOB_LEASE_SECONDS)
+            workers = await self.repository.list_workers(seen_since)
+            return {
+                "executor": self.executor.value,
+                "workers": workers.data if workers.status == 2 else [],
+                "queued": await self._count_queued(),
+                "maxQueued": self.max_queued,
+            }
+        queued = self._queued()
+        by_priority: Dict[str, int] = {}
+        for job in queued:
+            by_priority[job["priority"]] = by_priority.get(job["priority"], 0) + 1
+        return {
+            "executor": self.executor.value,
+            "workers": self.workers,
+            "running": sorted(self._running),
+            "queued": len(queued),
+            "queuedByPriority": by_priority,
+            "maxQueued": self.max_queued,
+        }
@@ -0,0 +1,180 @@
+import json
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+
+from backscrap.app.pojo.enums.enumslist import ListaCanales
+from backscrap.app.repository.ScrappingRepository import ScrappingRepository
+from backscrap.app.utils.broadcaster import broadcaster
+from backscrap.app.utils.config import PRICE_DELTA_REPLAY_SIZE
+from backscrap.app.utils.Global import Console
+from backscrap.app.utils.parsing import to_float
+
+# Column order of every quote row in delta and snapshot events
+QUOTE_COLUMNS = ["symbol", "price", "change24h", "volume24h", "marketCap"]
+
+Quote = Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]
+
+
+class PriceDeltaService:
+    """
+    Turns each stored batch into a compact delta of the quotes that changed.
+
+    Deltas carry monotonically increasing ids (seeded from the wall clock in
+    milliseconds so they keep increasing across restarts) and are kept in a
+    bounded replay buffer. A reconnecting client sends `Last-Event-ID` and
+    receives only what it missed; if that is older than the buffer it gets a
+    full snapshot of the current quotes instead of having to refetch history.
+
+    With several API processes only the ingest leader diffs batches and
+    assigns ids; the others (`publishes = False`) build their quotes and
+    replay buffer from the leader's deltas (`consume_deltas`), so a client
+    may reconnect to any worker with the same `Last-Event-ID`.
+    """
+
+    def __init__(self, repository: ScrappingRepository, replay_size: int = PRICE_DELTA_REPLAY_SIZE):
+        self.repository = repository
+        self._replay: Deque[Tuple[int, str]] = deque(maxlen=replay_size)
+        self._quotes: Dict[str, Dict[str, Quote]] = {}
+        self._timestamps: Dict[str, str] = {}
+        self._last_id = int(time.time() * 1000)
+        # Clients whose last id is below this horizon missed events we no longer have
+        self._replay_horizon = self._last_id
+        # False on API processes that are not the ingest leader (see IngestLeaderService)
+        self.publishes = True
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    @staticmethod
+    def event_id(message: str) -> int:
+        """
+        Id of a serialized delta. Messages that start with the `id` key (as
+        `apply_batch` writes them) skip the JSON decode; any other is decoded.
+        """
+        if message.startswith('{"id":'):
+            try:
+                return int(message[6:message.index(",", 6)])
+            except ValueError:
+                pass
+        return int(json.loads(message)["id"])
+
+    @staticmethod
+    def _quote(record: dict) -> Quote:
+        return tuple(to_float(record.get(field)) for field in QUOTE_COLUMNS[1:])
+
+    def _next_id(self) -> int:
+        self._last_id = max(self._last_id + 1, int(time.time() * 1000))
+        return self._last_id
+
+    def apply_batch(self, source: str, timestamp: datetime, records: list) -> Optional[Tuple[int, str]]:
+        """Diff the batch against the last known quotes of `source`; return `(id, message)` if anything changed."""
+        previous = self._quotes.get(source, {})
+        current: Dict[str, Quote] = {}
+        changed: List[list] = []
+        for record in records:
+            symbol = str(record.get("symbol") or "").strip()
+            if not symbol:
+                continue
+            quote = self._quote(record)
+            current[symbol] = quote
+            if previous.get(symbol) != quote:
+                changed.append([symbol, *quote])
+        removed = sorted(set(previous) - set(current))
+        self._quotes[source] = current
+        self._timestamps[source] = timestamp.isoformat()
+        if not changed and not removed:
+            return None
+
+        event_id = self._next_id()
+        message = json.dumps(
+            {"id": event_id, "source": source, "timestamp": timestamp.isoformat(), "quotes": changed, "removed": removed},
+            separators=(",", ":"),
+        )
+        self._remember(event_id, message)
+        return event_id, message
+
+    def _remember(self, event_id: int, message: str) -> None:
+        if len(self._replay) == self._replay.maxlen:
+            self._replay_horizon = self._replay[0][0]
+        self._replay.append((event_id, message))
+
+    def apply_delta(self, message: str) -> None:
+        """Fold a delta published by the ingest leader into the quotes and the replay buffer."""
+        delta = json.loads(message)
+        event_id = int(delta["id"])
+        if self.publishes and event_id <= self._last_id:
+            return  # Published by this process: already applied by apply_batch
+        quotes = self._quotes.setdefault(delta["source"], {})
+        for symbol, *quote in delta["quotes"]:
+            quotes[symbol] = tuple(quote)
+        for symbol in delta["removed"]:
+            quotes.pop(symbol, None)
+        self._timestamps[delta["source"]] = delta["timestamp"]
+        if not self._replay:
+            # Clients behind the first delta seen here need a snapshot
+            self._replay_horizon = event_id
+        # The leader's ids, even if its clock is behind this one's seed
+        self._last_id = event_id
+        self._remember(event_id, message)
+
+    async def on_ingest(self, source: str, timestamp: datetime, records: list) -> None:
+        """Ingest listener: publish the delta of the stored batch on `price_deltas` (leader only)."""
+        if not self.publishes:
+            return  # The leader's delta arrives through consume_deltas
+        delta = self.apply_batch(source, timestamp, records)
+        if delta is not None:
+            await broadcaster.publish(channel=ListaCanales.PriceDeltas.value, message=delta[1])
+
+    async def consume_deltas(self) -> None:
+        """Apply the deltas published by the ingest leader. Runs until cancelled."""
+        async with broadcaster.subscribe(channel=ListaCanales.PriceDeltas.value) as subscriber:
+            async for event in subscriber:
+                try:
+                    self.apply_delta(event.message)
+                except (ValueError, KeyError, TypeError) as e:
+                    Console.error(f"Delta de precios inválido: {e}")
+
+    async def warm_up(self) -> None:
+        """Prime the last known quotes so the first delta after a restart is not the whole table."""
+        response = await self.repository.get_scrapping_results_since(datetime.now() - timedelta(hours=1))
+        if response.status != 2:
+            Console.warn(f"No se pudieron precargar las cotizaciones: {response.message}")
+            return
+        for document in response.data:
+            self._quotes[document["source"]] = {
+                str(record.get("symbol") or "").strip(): self._quote(record)
+                for record in document.get("data", [])
+                if record.get("symbol")
+            }
+            self._timestamps[document["source"]] = document["timestamp"].isoformat()
+
+    def snapshot(self) -> Tuple[int, str]:
+        """Current quotes of every source as a single event, tagged with the latest id."""
+        message = json.dumps(
+            {
+                "id": self._last_id,
+                "columns": QUOTE_COLUMNS,
+                "sources": {
+                    source: {
+                        "timestamp": self._timestamps.get(source),
+                        "quotes": [[symbol, *quote] for symbol, quote in sorted(quotes.items())],
+                    }
+                    for source, quotes in sorted(self._quotes.items())
+                },
+            },
+            separators=(",", ":"),
+        )
+        return self._last_id, message
+
+    def replay_since(self, last_event_id: Optional[int]) -> Optional[List[Tuple[int, str]]]:
+        """Buffered deltas after `last_event_id`, or None if the client is too far behind (snapshot needed)."""
+        if last_event_id is None:
+            return None
+        if last_event_id >= self._last_id:
+            return []
+        if last_event_id < self._replay_horizon:
+            return None
+        return [(event_id, message) for event_id, message in self._replay if event_id > last_event_id]
@@ -0,0 +1,170 @@
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backscrap.app.repository.ScrappingRepository import ScrappingRepository
+from backscrap.app.utils.cache import VersionedCache
+from backscrap.app.utils.config import PROJECTION_HISTORY_HOURS, PROJECTION_SEASON_LENGTH, PROJECTION_WINDOW
+from backscrap.app.utils.forecasting import EWMAModel, HoltWintersModel, RollingRegressionModel
+from backscrap.app.utils.Global import ResponseUtil, Console
+from backscrap.app.utils.parsing import iter_prices
+
+# Two-sided normal quantiles for the supported interval levels
+Z_SCORES: Dict[float, float] = {0.8: 1.2816, 0.9: 1.6449, 0.95: 1.96, 0.99: 2.5758}
+
+SeriesKey = Tuple[str, str]
+
+
+class SeriesState:
+    """Fitted models for one (source, symbol) series plus the timing info needed to place forecasts."""
+
+    def __init__(self, window: int, season_length: int):
+        self.models = {
+            EWMAModel.name: EWMAModel(),
+            RollingRegressionModel.name: RollingRegressionModel(window),
+            HoltWintersModel.name: HoltWintersModel(season_length),
+        }
+        self.times: Deque[datetime] = deque(maxlen=window)
+        self.last_price: Optional[float] = None
+        self.version = 0
+
+    def fit(self, times: List[datetime], values: np.ndarray) -> None:
+        for model in self.models.values():
+            model.fit(values)
+        self.times.clear()
+        self.times.extend(times)
+        self.last_price = float(values[-1])
+        self.version += 1
+
+    def update(self, timestamp: datetime, value: float) -> None:
+        if self.times and timestamp <= self.times[-1]:
+            return  # Duplicate or out-of-order point
+        for model in self.models.values():
+            model.update(value)
+        self.times.append(timestamp)
+        self.last_price = value
+        self.version += 1
+
+    @property
+    def step(self) -> Optional[timedelta]:
+        """Typical spacing between snapshots (median of the recent gaps)."""
+        if len(self.times) < 2:
+            return None
+        epochs = np.fromiter((t.timestamp() for t in self.times), dtype=float)
+        return timedelta(seconds=float(np.median(np.diff(epochs))))
+
+
+class ProjectionService:
+    """
+    Price projections over the stored time series.
+
+    Models are fitted once per (source, symbol) from recent history at
+    startup and then updated incrementally by the ingest listener each time
+    `run_scraping_and_save` stores a batch. Forecasts are memoized per series
+    version, so repeated requests never refit.
+    """
+
+    def __init__(
+        self,
+        repository: ScrappingRepository,
+        history_hours: float = PROJECTION_HISTORY_HOURS,
+        window: int = PROJECTION_WINDOW,
+        season_length: int = PROJECTION_SEASON_LENGTH,
+    ):
+        self.repository = repository
+        self.history_hours = history_hours
+        self.window = window
+        self.season_length = season_length
+        self._series: Dict[SeriesKey, SeriesState] = {}
+        self._forecasts = VersionedCache(max_entries=1024)
+
+    def _new_state(self) -> SeriesState:
+        return SeriesState(self.window, self.season_length)
+
+    async def warm_up(self) -> None:
+        """Fit every series from the last `history_hours` of snapshots (one vectorized fit per series)."""
+        since = datetime.now() - timedelta(hours=self.history_hours)
+        response = await self.repository.get_scrapping_results_since(since)
+        if response.status != 2:
+            Console.warn(f"No se pudieron precargar las proyecciones: {response.message}")
+            return
+
+        history: Dict[SeriesKey, Tuple[List[datetime], List[float]]] = {}
+        for document in response.data:
+            for symbol, price in iter_prices(document.get("data", [])):
+                times, values = history.setdefault((document["source"], symbol), ([], []))
+                times.append(document["timestamp"])
+                values.append(price)
+
+        for key, (times, values) in history.items():
+            state = self._new_state()
+            state.fit(times, np.asarray(values, dtype=float))
+            self._series[key] = state
+        Console.log(f"Proyecciones ajustadas para {len(history)} series.")
+
+    async def on_ingest(self, source: str, timestamp: datetime, records: list) -> None:
+        """Ingest listener: fold the new prices into each series in O(1)."""
+        for symbol, price in iter_prices(records):
+            state = self._series.get((source, symbol))
+            if state is None:
+                state = self._series[(source, symbol)] = self._new_state()
+            state.update(timestamp, price)
+
+    def _forecast(self, key: SeriesKey, state: SeriesState, model_name: str, horizon: int, level: float) -> dict:
+        cache_key = (key, model_name, horizon, level)
+        found, value = self._forecasts.get(cache_key, state.version)
+        if found:
+            return value
+
+        mean, lower, upper = state.models[model_name].forecast(horizon, Z_SCORES[level])
+        step = state.step or timedelta(0)
+        last_time = state.times[-1]
+        value = {
+            "source": key[0],
+            "symbol": key[1],
+            "model": model_name,
+            "level": level,
+            "stepSeconds": step.total_seconds(),
+            "lastTimestamp": last_time.isoformat(),
+            "lastPrice": state.last_price,
+            "observations": state.models[model_name].n,
+            "points": [
+                {
+                    "timestamp": (last_time + step * (i + 1)).isoformat(),
+                    "mean": float(mean[i]),
+                    "lower": float(lower[i]),
+                    "upper": float(upper[i]),
+                }
+                for i in range(horizon)
+            ],
+        }
+        self._forecasts.set(cache_key, state.version, value)
+        return value
+
+    def get_projections(
+        self,
+        symbol: Optional[str],
+        source: Optional[str],
+        model: str,
+        horizon: int,
+        level: float,
+    ):
+        """Forecasts with prediction intervals for every series matching the filters."""
+        if model not in (EWMAModel.name, RollingRegressionModel.name, HoltWintersModel.name):
+            return ResponseUtil.error(f"Modelo '{model}' no soportado.")
+        if level not in Z_SCORES:
+            return ResponseUtil.error(f"Nivel de confianza '{level}' no soportado.")
+
+        results = []
+        for key, state in sorted(self._series.items()):
+            if (source and key[0] != source) or (symbol and key[1].upper() != symbol.upper()):
+                continue
+            if not state.times:
+                continue
+            results.append(self._forecast(key, state, model, horizon, level))
+
+        if not results:
+            return ResponseUtil.warning("No hay series que coincidan con los filtros solicitados.")
+        return ResponseUtil.success("Proyecciones calculadas.", data=results)
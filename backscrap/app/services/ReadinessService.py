@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from backscrap.app.datasource.MongoManagerCriptoScrapping import MongoManagerCriptoScrapping
+from backscrap.app.repository.JobRepository import JobRepository
+from backscrap.app.repository.ScrappingRepository import ScrappingRepository
+from backscrap.app.services.ScrappingService import ScrappingService
+from backscrap.app.utils.config import (
+    READY_MONGO_TIMEOUT_SECONDS,
+    WARMUP_MONGO_CONNECTIONS,
+    WARMUP_RETRY_SECONDS,
+)
+from backscrap.app.utils.Global import Console
+from backscrap.app.utils.logger import log_event
+
+# Steps that must succeed before /ready answers 200; "caches" is reported only
+REQUIRED_CHECKS = ("mongo", "indexes", "browser")
+
+
+class ReadinessService:
+    """
+    Warm-up phase and readiness state of an API process.
+
+    `start()` runs the warm-up in the background once the lifespan startup is
+    done, so `/health` answers meanwhile: a Mongo ping from
+    `mongo_connections` concurrent commands (which opens that many pool
+    connections), the indexes of the results and jobs collections, and a
+    browser launch when this process runs scrapes. Failed steps are retried
+    every `retry_seconds`. The lifespan records the warm-up of the ingest
+    engines (last quotes, consolidation buckets, ...) as the "caches" step.
+
+    `report()` is ready when every required step succeeded and Mongo still
+    answers a ping within `ping_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        scrapping_repository: ScrappingRepository,
+        job_repository: JobRepository,
+        scrapping_service: Optional[ScrappingService],
+        check_browser: bool,
+        mongo_connections: int = WARMUP_MONGO_CONNECTIONS,
+        retry_seconds: float = WARMUP_RETRY_SECONDS,
+        ping_timeout: float = READY_MONGO_TIMEOUT_SECONDS,
+    ):
+        self.scrapping_repository = scrapping_repository
+        self.job_repository = job_repository
+        self.scrapping_service = scrapping_service
+        self.mongo_connections = max(1, mongo_connections)
+        self.retry_seconds = retry_seconds
+        self.ping_timeout = ping_timeout
+        self.checks: Dict[str, dict] = {name: {"status": "pending"} for name in (*REQUIRED_CHECKS, "caches")}
+        if not check_browser or scrapping_service is None:
+            self.checks["browser"] = {"status": "skipped"}
+        self.warmed_up_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def database(self):
+        return MongoManagerCriptoScrapping.getInstance()
+
+    async def run_check(self, name: str, step: Callable[[], Awaitable[Optional[dict]]]) -> bool:
+        """Run one warm-up step and record its outcome (plus the details it returns) in `checks`."""
+        started = time.perf_counter()
+        try:
+            details = await step()
+        except Exception as e:  # noqa: BLE001
+            self.checks[name] = {"status": "failed", "seconds": round(time.perf_counter() - started, 4), "error": str(e)}
+            Console.warn(f"Warm-up: el paso {name} falló: {e}")
+            return False
+        self.checks[name] = {"status": "ok", "seconds": round(time.perf_counter() - started, 4), **(details or {})}
+        return True
+
+    # --- Pasos ---
+
+    async def _warm_mongo(self) -> dict:
+        await asyncio.wait_for(
+            asyncio.gather(*(self.database.ping() for _ in range(self.mongo_connections))),
+            timeout=self.ping_timeout * 5,
+        )
+        return {"connections": self.mongo_connections}
+
+    async def _ensure_indexes(self) -> dict:
+        responses = [
+            await self.scrapping_repository.ensure_indexes(),
+            await self.job_repository.ensure_indexes(),
+        ]
+        failed = [response.message for response in responses if response.status != 2]
+        if failed:
+            raise RuntimeError("; ".join(failed))
+        return {"indexes": [name for response in responses for name in response.data["indexes"]]}
+
+    async def _warm_browser(self) -> None:
+        await self.scrapping_service.warm_up_browser()
+
+    def _pending(self) -> list:
+        return [name for name in REQUIRED_CHECKS if self.checks[name]["status"] not in ("ok", "skipped")]
+
+    async def warm_up(self) -> None:
+        """Run the required steps until all of them succeed."""
+        started = time.perf_counter()
+        steps = {"mongo": self._warm_mongo, "indexes": self._ensure_indexes, "browser": self._warm_browser}
+        while True:
+            for name in self._pending():
+                if name == "indexes" and self.checks["mongo"]["status"] != "ok":
+                    continue
+                await self.run_check(name, steps[name])
+            if not self._pending():
+                break
+            await asyncio.sleep(self.retry_seconds)
+        self.warmed_up_at = datetime.now()
+        log_event(logging.INFO, "Warm-up terminado.", seconds=round(time.perf_counter() - started, 4), checks=self.checks)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self.warm_up())
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def report(self) -> Tuple[bool, dict]:
+        """`(ready, body)` of /ready: the warm-up steps plus a live Mongo ping."""
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.database.ping(), timeout=self.ping_timeout)
+            ping = {"status": "ok", "seconds": round(time.perf_counter() - started, 4)}
+        except Exception as e:  # noqa: BLE001
+            ping = {"status": "failed", "error": str(e) or type(e).__name__}
+        ready = ping["status"] == "ok" and not self._pending()
+        return ready, {
+            "status": "READY" if ready else "NOT_READY",
+            "warmedUpAt": self.warmed_up_at.isoformat() if self.warmed_up_at else None,
+            "checks": {**self.checks, "mongoPing": ping},
+        }
@@ -0,0 +1,162 @@
+import asyncio
+import math
+import os
+import socket
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Dict, Optional, Tuple
+
+from backscrap.app.repository.SchedulerRepository import SchedulerRepository
+from backscrap.app.services.JobService import JobPriority, JobService
+from backscrap.app.services.ScrappingService import ScrappingService
+from backscrap.app.utils.config import (
+    EMBEDDED_SCHEDULER_CATCH_UP,
+    EMBEDDED_SCHEDULER_INTERVAL_SECONDS,
+    EMBEDDED_SCHEDULER_LEASE_SECONDS,
+    EMBEDDED_SCHEDULER_TICK_SECONDS,
+)
+from backscrap.app.utils.Global import Console, ResponseUtil
+
+RESULT_STATUS = {2: "SUCCESS", 3: "WARNING", 4: "ERROR"}
+
+
+class CatchUpPolicy(str, Enum):
+    ONCE = "once"  # Missed slots collapse into a single immediate run
+    SKIP = "skip"  # Missed slots are dropped; the next run is the next slot in the future
+
+
+class SchedulerService:
+    """
+    Scheduler embedded in the API process that submits scheduled jobs to `JobService`.
+
+    Every source has a document in `scheduler_state` with its `nextRun`, the
+    result of its last run and a lease. Each tick, every worker looks for due
+    sources and tries to claim them with a compare-and-swap on `nextRun`
+    (`find_one_and_update`), so with several API workers exactly one of them
+    runs each slot. Slots stay aligned to the original schedule; when the API
+    was down for longer than an interval the catch-up policy decides whether
+    the missed slots trigger one immediate run (`once`) or are skipped.
+    Scheduled jobs share the worker pool with manual runs at lower priority.
+    """
+
+    def __init__(
+        self,
+        repository: SchedulerRepository,
+        scrapping_service: ScrappingService,
+        job_service: JobService,
+        interval_seconds: float = EMBEDDED_SCHEDULER_INTERVAL_SECONDS,
+        catch_up: CatchUpPolicy = CatchUpPolicy(EMBEDDED_SCHEDULER_CATCH_UP),
+        tick_seconds: float = EMBEDDED_SCHEDULER_TICK_SECONDS,
+        lease_seconds: float = EMBEDDED_SCHEDULER_LEASE_SECONDS,
+    ):
+        self.repository = repository
+        self.scrapping_service = scrapping_service
+        self.job_service = job_service
+        self.interval = timedelta(seconds=interval_seconds)
+        self.catch_up = catch_up
+        self.tick_seconds = tick_seconds
+        self.lease = timedelta(seconds=lease_seconds)
+        self.worker_id: Optional[str] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._running: Dict[str, asyncio.Task] = {}
+
+    @property
+    def started(self) -> bool:
+        return self._loop_task is not None and not self._loop_task.done()
+
+    async def start(self) -> None:
+        """Create the missing state documents (staggered first runs) and start ticking."""
+        if self.started:
+            return
+        # Resolved here, in the worker process, not at import time
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        sources = self.scrapping_service.get_available_sources()
+        now = datetime.now()
+        for index, source in enumerate(sources):
+            first_run = now + self.interval * index / max(len(sources), 1)
+            await self.repository.ensure_source(source, first_run, self.interval.total_seconds())
+        self._loop_task = asyncio.create_task(self._loop())
+        Console.log(f"Planificador embebido iniciado en {self.worker_id} para {', '.join(sources)}.")
+
+    async def stop(self) -> None:
+        """Stop ticking and stop waiting for running jobs (their leases expire on their own)."""
+        tasks = [task for task in (self._loop_task, *self._running.values()) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._running.clear()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:  # noqa: BLE001
+                Console.error(f"Error en el planificador embebido: {e}")
+            await asyncio.sleep(self.tick_seconds)
+
+    def _next_slot(self, due: datetime, now: datetime) -> Tuple[datetime, int]:
+        """First slot after `now` on the grid of `due`, and how many slots were missed."""
+        missed = math.floor((now - due) / self.interval)
+        return due + self.interval * (missed + 1), missed
+
+    async def tick(self, now: Optional[datetime] = None) -> None:
+        """Claim and start every due source this worker wins."""
+        now = now or datetime.now()
+        response = await self.repository.list_states()
+        if response.status != 2:
+            return
+        sources = set(self.scrapping_service.get_available_sources())
+        for state in response.data:
+            source, due = state["id"], state.get("nextRun")
+            if source not in sources or due is None or due > now or source in self._running:
+                continue
+            next_run, missed = self._next_slot(due, now)
+            run = missed == 0 or self.catch_up is CatchUpPolicy.ONCE
+            claim = await self.repository.claim(
+                source, due, next_run, now, self.worker_id, now + self.lease if run else None
+            )
+            if claim.status != 2:
+                continue
+            if missed:
+                Console.warn(f"{source}: {missed} ejecución(es) perdida(s), política '{self.catch_up.value}'.")
+            if run:
+                self._running[source] = asyncio.create_task(self._run(source))
+
+    async def _run(self, source: str) -> None:
+        started_at = datetime.now()
+        try:
+            response = await self.job_service.submit(source, JobPriority.SCHEDULED)
+            if response.status == 2:
+                job = await self.job_service.wait(response.data["id"])
+                result = (job or {}).get("result") or {"status": 4, "message": "Job perdido."}
+                status, message = RESULT_STATUS.get(result["status"], str(result["status"])), result["message"]
+            else:
+                status, message = RESULT_STATUS.get(response.status, str(response.status)), response.message
+        except Exception as e:  # noqa: BLE001
+            status, message = "ERROR", str(e)
+        finally:
+            self._running.pop(source, None)
+        finished_at = datetime.now()
+        await self.repository.record_result(source, self.worker_id, {
+            "startedAt": started_at,
+            "finishedAt": finished_at,
+            "durationSeconds": (finished_at - started_at).total_seconds(),
+            "status": status,
+            "message": message,
+            "worker": self.worker_id,
+        })
+
+    async def get_state(self):
+        """Persisted state of every source plus this worker's view."""
+        response = await self.repository.list_states()
+        if response.status != 2:
+            return response
+        return ResponseUtil.success("Estado del planificador recuperado.", data={
+            "enabled": self.started,
+            "worker": self.worker_id,
+            "intervalSeconds": self.interval.total_seconds(),
+            "catchUp": self.catch_up.value,
+            "running": sorted(self._running),
+            "sources": response.data,
+        })
@@ -1,14 +1,29 @@
 import re
-import pandas as pd
 import asyncio
+import contextvars
+import logging
 from datetime import datetime
-from playwright.sync_api import sync_playwright, Error as PlaywrightError
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional
 
+from backscrap.app.pojo.enums.enumslist import ListaCanales
 from backscrap.app.repository.ScrappingRepository import ScrappingRepository
 from backscrap.app.utils.Global import ResponseUtil, Console
 from backscrap.app.utils.broadcaster import broadcaster
+from backscrap.app.utils.circuit_breaker import BreakerState, SourceHealthTracker
+from backscrap.app.utils.logger import log_sampled
+from backscrap.app.utils.metrics import observe_stages
+from backscrap.app.utils.profiling import joining_profile
+from backscrap.app.utils.timing import stage
 import json
 
+if TYPE_CHECKING:
+    # pandas y Playwright se importan al primer scrape: la API con JOB_EXECUTOR=workers no los carga nunca
+    import pandas as pd
+
+# Callback asíncrono invocado con (source, timestamp, records) tras guardar un lote; si devuelve
+# una lista, los listeners siguientes reciben esa lista en lugar del lote (p. ej. sin filas anómalas)
+IngestListener = Callable[[str, datetime, list], Awaitable[Optional[list]]]
+
 class ScrappingService:
     """
     Servicio encargado de orquestar las tareas de web scraping,
@@ -25,221 +40,396 @@ class ScrappingService:
             "Coinmarketcap": self._scrape_coinmarketcap,
             #"WorldCoinIndex": self._scrape_worldcoinindex,
         }
+        # Motores incrementales (consolidación, indicadores, ...) que consumen cada lote guardado
+        self._ingest_listeners: List[IngestListener] = []
+        # Con varios procesos de la API los lotes pasan por `ingest_batches` (ver relay_ingest)
+        self._relay_ingest = False
+        # Circuit breaker por fuente: evita lanzar Chromium contra fuentes rotas
+        self.health = SourceHealthTracker()
+
+    def register_ingest_listener(self, listener: IngestListener) -> None:
+        """Registra un callback que recibe cada lote recién guardado (una sola vez por callback)."""
+        if listener not in self._ingest_listeners:
+            self._ingest_listeners.append(listener)
+
+    async def _notify_ingest(self, source: str, timestamp: datetime, records: list) -> None:
+        """
+        Entrega el lote a los listeners en orden de registro; un fallo en uno no afecta
+        al scraping ni a los demás. Un listener puede filtrar el lote para los siguientes.
+        """
+        for listener in self._ingest_listeners:
+            try:
+                filtered = await listener(source, timestamp, records)
+                if filtered is not None:
+                    records = filtered
+            except Exception as e:
+                Console.error(f"Error en listener de ingesta para {source}: {e}")
+
+    def relay_ingest(self) -> None:
+        """
+        Publica cada lote guardado en `ingest_batches` en lugar de entregarlo a los
+        listeners: `consume_remote_ingest` lo entrega a los de todos los procesos de
+        la API, este incluido, para que sus motores vean los mismos lotes.
+        """
+        self._relay_ingest = True
 
-    def _run_playwright_sync(self, url: str, scraper_func, **kwargs) -> pd.DataFrame:
+    async def publish_ingest(self, source: str, timestamp: datetime, records: list) -> None:
+        """
+        Listener de los workers independientes: reenvía cada lote guardado al canal
+        de ingesta para que los motores incrementales de la API lo reciban.
+        """
+        await broadcaster.publish(
+            channel=ListaCanales.IngestBatches.value,
+            message=json.dumps(
+                {"source": source, "timestamp": timestamp.isoformat(), "records": records},
+                # Tipos de numpy (int64, float64) a su equivalente de Python
+                default=lambda value: value.item() if hasattr(value, "item") else str(value),
+            ),
+        )
+
+    async def consume_remote_ingest(self) -> None:
+        """
+        Entrega a los listeners locales los lotes publicados por los workers
+        independientes o por los procesos de la API (`relay_ingest`). Se ejecuta
+        hasta que se cancela.
+        """
+        async with broadcaster.subscribe(channel=ListaCanales.IngestBatches.value) as subscriber:
+            async for event in subscriber:
+                try:
+                    batch = json.loads(event.message)
+                    timestamp = datetime.fromisoformat(batch["timestamp"])
+                except (ValueError, KeyError, TypeError) as e:
+                    Console.error(f"Lote de ingesta remoto inválido: {e}")
+                    continue
+                await self._notify_ingest(batch["source"], timestamp, batch["records"])
+
+    def _run_playwright_sync(self, url: str, scraper_func, timings: Optional[Dict[str, float]] = None, **kwargs) -> "pd.DataFrame":
         """
         Ejecuta una sesión síncrona de Playwright. Esta función está diseñada
         para ser llamada en un hilo separado para no bloquear el event loop de asyncio.
+
+        `scraper_func(page, timings)` acumula en `timings` sus etapas (ready,
+        extract, parse); aquí se miden el lanzamiento del navegador y `page.goto`.
         """
+        from playwright.sync_api import sync_playwright, Error as PlaywrightError
+
         try:
             with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context()
-                page = context.new_page()
-                page.set_default_timeout(60000)
-                page.goto(url, wait_until="load")
+                with stage(timings, "browser"):
+                    browser = p.chromium.launch(headless=True)
+                    context = browser.new_context()
+                    page = context.new_page()
+                    page.set_default_timeout(60000)
+                with stage(timings, "goto"):
+                    page.goto(url, wait_until="load")
                 
-                result_df = scraper_func(page, **kwargs)
+                result_df = scraper_func(page, timings, **kwargs)
                 return result_df
         except PlaywrightError as e:
             # Captura errores específicos
             Console.error(f"Error de Playwright en {url}: {e}")
-            return pd.DataFrame(columns=self.COL_NAMES)
+            return self._empty_result(f"Error de Playwright: {e}")
         except Exception as e:
             Console.error(f"Error inesperado en la función de scraping para {url}: {e}")
-            return pd.DataFrame(columns=self.COL_NAMES)
+            return self._empty_result(f"Error inesperado: {e}")
 
+    def _launch_browser(self) -> None:
+        """Lanza y cierra Chromium una vez, cargando también pandas y Playwright."""
+        import pandas  # noqa: F401
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            try:
+                browser.new_context().new_page()
+            finally:
+                browser.close()
+
+    async def warm_up_browser(self) -> None:
+        """
+        Comprueba en un hilo que el navegador de scraping se puede lanzar (propaga el
+        error si no). El primer scrape ya no paga la carga de módulos ni la lectura
+        en frío del binario; cada scrape sigue lanzando su propio navegador, porque
+        los objetos de Playwright síncrono solo se usan desde el hilo que los creó.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._launch_browser)
 
-    def _scrape_coingecko(self) -> pd.DataFrame:
+    def _empty_result(self, error: str) -> "pd.DataFrame":
+        """DataFrame vacío que conserva el motivo del fallo para el circuit breaker."""
+        import pandas as pd
+
+        df = pd.DataFrame(columns=self.COL_NAMES)
+        df.attrs["error"] = error
+        return df
+
+    async def _publish_event(self, status: str, source: str, message: str, **extra) -> None:
+        await broadcaster.publish(
+            channel=ListaCanales.ScrapingEvents.value,
+            message=json.dumps({"status": status, "source": source, "message": message, **extra})
+        )
+
+    async def load_health(self) -> None:
+        """
+        Carga el estado de los breakers guardado en `source_health`: al arrancar, o en
+        la API con JOB_EXECUTOR=workers antes de consultarlos, ya que allí solo los
+        actualizan los workers.
+        """
+        response = await self.repository.get_sources_health()
+        if response.status == 2:
+            self.health.restore(response.data)
+
+    async def _save_health(self, source: str) -> None:
+        await self.repository.save_source_health(self.health.breaker(source).snapshot())
+
+    async def _record_failure(self, source: str, error: str) -> None:
+        """Cuenta el fallo en el breaker, lo guarda y avisa por SSE si el circuito se abre."""
+        breaker = self.health.breaker(source)
+        breaker.record_failure(error)
+        await self._save_health(source)
+        if breaker.state is BreakerState.OPEN:
+            message = f"Circuito abierto para {source} tras {breaker.consecutive_failures} fallos; reintento en {breaker.backoff_seconds:.0f}s."
+            Console.warn(message)
+            await self._publish_event("CIRCUIT_OPEN", source, message, breaker=breaker.snapshot())
+
+    async def _record_success(self, source: str) -> None:
+        breaker = self.health.breaker(source)
+        recovered = breaker.state is not BreakerState.CLOSED
+        breaker.record_success()
+        await self._save_health(source)
+        if recovered:
+            message = f"Circuito cerrado para {source}: la ejecución de prueba tuvo éxito."
+            Console.log(message)
+            await self._publish_event("CIRCUIT_CLOSED", source, message, breaker=breaker.snapshot())
+
+
+    def _scrape_coingecko(self, timings: Optional[Dict[str, float]] = None) -> "pd.DataFrame":
         """Lógica de scraping para CoinGecko."""
+        import pandas as pd
+
         url = "https://www.coingecko.com/"
         Console.log(f"Iniciando scraping para {url}...")
 
-        def scraper_logic(page):
+        def scraper_logic(page, timings):
             # Coingecko requiere esperar un poco más
-            page.wait_for_timeout(5000)
+            with stage(timings, "ready"):
+                page.wait_for_timeout(5000)
 
             # Selector de las filas (tbody tr)
-            rows = page.locator(".gecko-homepage-coin-table tbody tr").all()
+            with stage(timings, "extract"):
+                rows = page.locator(".gecko-homepage-coin-table tbody tr").all()
 
             #print(f"registros {len(rows)}, {rows}")
 
             data = []
             for i, row_locator in enumerate(rows[:15]):  # Limitar a top 15
                 try:
-                    cells = row_locator.locator("td").all()
-                    if len(cells) < 10:  # Mínimo de celdas requerido
-                        continue
-
-                    # El código R indica que el símbolo se extrae de ".tw-block"
-                    symbol = row_locator.locator("div.tw-block").inner_text().strip()
-                    name_container = row_locator.locator("div.tw-text-gray-700.tw-font-semibold.tw-text-sm.tw-leading-5")
-
-                    name = name_container.evaluate("node => node.childNodes[0].textContent.trim()")
-                    #print(f"moneda: {symbol} - {name}")
-
-                    # Columna 5 (Price)
-                    price_raw = cells[4].inner_text()
-                    # Columna 7 (Change 24h)
-                    change24h_raw = cells[6].inner_text()
-                    # Columna 10 (Volume 24h)
-                    volume24h_raw = cells[9].inner_text()
-                    # Columna 11 (Market Cap)
-                    market_cap_raw = cells[10].inner_text()
-                    # El código R limpia price
-                    price = re.sub(r'[^\d\.,$]+', '', price_raw).replace("$", "").replace(",", "")
-
-                    # En Playwright, buscamos el signo en el texto o asumimos el formato de CoinGecko.
-                    # Asumiremos que el signo ya está incluido en change24h_raw, o lo agregamos si es necesario.
-                    if not re.match(r'[+-]', change24h_raw):
-                        # Buscamos la clase para el signo (más robusto)
+                    with stage(timings, "extract"):
+                        cells = row_locator.locator("td").all()
+                        if len(cells) < 10:  # Mínimo de celdas requerido
+                            continue
+
+                        # El código R indica que el símbolo se extrae de ".tw-block"
+                        symbol = row_locator.locator("div.tw-block").inner_text().strip()
+                        name_container = row_locator.locator("div.tw-text-gray-700.tw-font-semibold.tw-text-sm.tw-leading-5")
+
+                        name = name_container.evaluate("node => node.childNodes[0].textContent.trim()")
+                        #print(f"moneda: {symbol} - {name}")
+
+                        # Columna 5 (Price)
+                        price_raw = cells[4].inner_text()
+                        # Columna 7 (Change 24h)
+                        change24h_raw = cells[6].inner_text()
+                        # Columna 10 (Volume 24h)
+                        volume24h_raw = cells[9].inner_text()
+                        # Columna 11 (Market Cap)
+                        market_cap_raw = cells[10].inner_text()
+
+                        # En Playwright, buscamos el signo en el texto o asumimos el formato de CoinGecko.
+                        # Si el signo no está incluido en change24h_raw, buscamos la clase del ícono (más robusto)
                         # Up/Down span is in cells[6]
-                        icon_class = cells[6].locator("span").get_attribute("class")
-                        signo = "+" if "up" in icon_class else "-" if "down" in icon_class else ""
-                        change24h = signo + re.sub(r'[^\d\.,%]', '', change24h_raw)
-                    else:
-                        change24h = re.sub(r'[^\d\.,%+-]', '', change24h_raw)
-
-                    # Limpieza de Market Cap y Volumen
-                    market_cap = re.sub(r'[^\d\.,]', '', market_cap_raw).replace(",", "")
-                    volume24h = re.sub(r'[^\d\.,]', '', volume24h_raw).replace(",", "")
-                    change24h = change24h.replace("%", "")
-
-                    data.append({
-                        "row": i + 1,
-                        "symbol": symbol.strip(),
-                        "name": name.strip(),
-                        "price": price.strip(),
-                        "change24h": change24h.strip(),
-                        "volume24h": volume24h.strip(),
-                        "marketCap": market_cap.strip()
-                    })
+                        icon_class = None
+                        if not re.match(r'[+-]', change24h_raw):
+                            icon_class = cells[6].locator("span").get_attribute("class")
+
+                    with stage(timings, "parse"):
+                        # El código R limpia price
+                        price = re.sub(r'[^\d\.,$]+', '', price_raw).replace("$", "").replace(",", "")
+
+                        if icon_class is not None:
+                            signo = "+" if "up" in icon_class else "-" if "down" in icon_class else ""
+                            change24h = signo + re.sub(r'[^\d\.,%]', '', change24h_raw)
+                        else:
+                            change24h = re.sub(r'[^\d\.,%+-]', '', change24h_raw)
+
+                        # Limpieza de Market Cap y Volumen
+                        market_cap = re.sub(r'[^\d\.,]', '', market_cap_raw).replace(",", "")
+                        volume24h = re.sub(r'[^\d\.,]', '', volume24h_raw).replace(",", "")
+                        change24h = change24h.replace("%", "")
+
+                        data.append({
+                            "row": i + 1,
+                            "symbol": symbol.strip(),
+                            "name": name.strip(),
+                            "price": price.strip(),
+                            "change24h": change24h.strip(),
+                            "volume24h": volume24h.strip(),
+                            "marketCap": market_cap.strip()
+                        })
                 except Exception as e:
-                    print(f"Error procesando fila {i + 1} en CoinGecko: {e}")
+                    # Una fila rota suele repetirse en cada ejecución: se muestrea por fuente
+                    log_sampled(
+                        logging.WARNING, "scrape.row.CoinGecko", f"Error procesando fila {i + 1} en CoinGecko: {e}",
+                        source="CoinGecko", row=i + 1,
+                    )
                     continue
-            return pd.DataFrame(data, columns=self.COL_NAMES)
+            with stage(timings, "parse"):
+                return pd.DataFrame(data, columns=self.COL_NAMES)
 
 
 
 
-        return self._run_playwright_sync(url, scraper_logic)
+        return self._run_playwright_sync(url, scraper_logic, timings)
 
-    def _scrape_coinmarketcap(self) -> pd.DataFrame:
+    def _scrape_coinmarketcap(self, timings: Optional[Dict[str, float]] = None) -> "pd.DataFrame":
         """Lógica de scraping para Coinmarketcap."""
+        import pandas as pd
+
         url = "https://coinmarketcap.com/es/"
         Console.log(f"Iniciando scraping para {url}...")
-        def scraper_logic(page):
+        def scraper_logic(page, timings):
             # Scroll para cargar datos. El código R usa 2 scrolls al final de la página.
-            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            page.wait_for_timeout(3000)
+            with stage(timings, "ready"):
+                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                page.wait_for_timeout(3000)
 
             # Selector de la tabla principal
             # sc-7e3c705d-3 keBvNC cmc-table
-            table_locator = page.locator("table.cmc-table")  # Selector actualizado de la tabla
-            rows = table_locator.locator("tbody tr").all()
+            with stage(timings, "extract"):
+                table_locator = page.locator("table.cmc-table")  # Selector actualizado de la tabla
+                rows = table_locator.locator("tbody tr").all()
 
             # print(f"items {len(rows)}, {rows}")
 
             data = []
             for i, row_locator in enumerate(rows[:15]):  # Limitar a top 15
                 try:
-                    # El símbolo y el nombre están en la misma celda, separamos el símbolo
-                    symbol = row_locator.locator(".coin-item-symbol").inner_text()
-
-                    name = row_locator.locator(".coin-item-name").inner_text()
-
-                    # Price (celda 4)
-                    price_raw = row_locator.locator("td:nth-child(4)").inner_text()
-
-                    # Cambio 24h (celda 6)
-                    change24h_locator = row_locator.locator("td:nth-child(6)")
-                    change24h_percent = change24h_locator.inner_text()
-
-                    # Signo: buscamos la clase del ícono
-                    icon_class = change24h_locator.locator("span[class*='icon-Caret']").get_attribute("class")
-                    signo = "+" if "icon-Caret-up" in icon_class else "-" if "icon-Caret-down" in icon_class else ""
-                    change24h = signo + change24h_percent
-
-                    # Market Cap (celda 7)
-                    market_cap_raw = row_locator.locator("td:nth-child(8)").inner_text()
-
-                    # Volumen 24h (celda 8) - Esto puede variar, Coinmarketcap suele tener una columna de volumen 24h y otra de volumen/marketCap
-                    # El código R toma el valor de ".font_weight_500" para volumen.
-                    volume24h_raw = row_locator.locator(".font_weight_500").first.inner_text()
-
-                    # Limpieza (remplazando , por . si es necesario y quitando chars no numéricos)
-                    price = re.sub(r'[^\d\.,]', '', price_raw).replace(".", "").replace(",", ".")
-                    market_cap = re.sub(r'[^\d\.,]', '', market_cap_raw).replace(",", "")
-                    volume24h = re.sub(r'[^\d\.,]', '', volume24h_raw).replace(",", "")
-                    change24h = change24h.replace("%", "")
-
-                    data.append({
-                        "row": i + 1,
-                        "symbol": symbol.strip(),
-                        "name": name.strip(),
-                        "price": price.strip(),
-                        "change24h": change24h.strip(),
-                        "volume24h": volume24h.strip(),
-                        "marketCap": market_cap.strip()
-                    })
+                    with stage(timings, "extract"):
+                        # El símbolo y el nombre están en la misma celda, separamos el símbolo
+                        symbol = row_locator.locator(".coin-item-symbol").inner_text()
+
+                        name = row_locator.locator(".coin-item-name").inner_text()
+
+                        # Price (celda 4)
+                        price_raw = row_locator.locator("td:nth-child(4)").inner_text()
+
+                        # Cambio 24h (celda 6)
+                        change24h_locator = row_locator.locator("td:nth-child(6)")
+                        change24h_percent = change24h_locator.inner_text()
+
+                        # Signo: buscamos la clase del ícono
+                        icon_class = change24h_locator.locator("span[class*='icon-Caret']").get_attribute("class")
+
+                        # Market Cap (celda 7)
+                        market_cap_raw = row_locator.locator("td:nth-child(8)").inner_text()
+
+                        # Volumen 24h (celda 8) - Esto puede variar, Coinmarketcap suele tener una columna de volumen 24h y otra de volumen/marketCap
+                        # El código R toma el valor de ".font_weight_500" para volumen.
+                        volume24h_raw = row_locator.locator(".font_weight_500").first.inner_text()
+
+                    with stage(timings, "parse"):
+                        signo = "+" if "icon-Caret-up" in icon_class else "-" if "icon-Caret-down" in icon_class else ""
+                        change24h = signo + change24h_percent
+
+                        # Limpieza (remplazando , por . si es necesario y quitando chars no numéricos)
+                        price = re.sub(r'[^\d\.,]', '', price_raw).replace(".", "").replace(",", ".")
+                        market_cap = re.sub(r'[^\d\.,]', '', market_cap_raw).replace(",", "")
+                        volume24h = re.sub(r'[^\d\.,]', '', volume24h_raw).replace(",", "")
+                        change24h = change24h.replace("%", "")
+
+                        data.append({
+                            "row": i + 1,
+                            "symbol": symbol.strip(),
+                            "name": name.strip(),
+                            "price": price.strip(),
+                            "change24h": change24h.strip(),
+                            "volume24h": volume24h.strip(),
+                            "marketCap": market_cap.strip()
+                        })
                 except Exception as e:
-                    print(f"Error procesando fila {i + 1} en Coinmarketcap: {e}")
+                    # Una fila rota suele repetirse en cada ejecución: se muestrea por fuente
+                    log_sampled(
+                        logging.WARNING, "scrape.row.Coinmarketcap", f"Error procesando fila {i + 1} en Coinmarketcap: {e}",
+                        source="Coinmarketcap", row=i + 1,
+                    )
                     continue
-            return pd.DataFrame(data, columns=self.COL_NAMES)
+            with stage(timings, "parse"):
+                return pd.DataFrame(data, columns=self.COL_NAMES)
 
-        return self._run_playwright_sync(url, scraper_logic)
+        return self._run_playwright_sync(url, scraper_logic, timings)
 
-    def _scrape_worldcoinindex(self) -> pd.DataFrame:
+    def _scrape_worldcoinindex(self, timings: Optional[Dict[str, float]] = None) -> "pd.DataFrame":
         """Lógica de scraping para WorldCoinIndex."""
+        import pandas as pd
+
         url = "https://www.worldcoinindex.com"
         Console.log(f"Iniciando scraping para {url}...")
-        def scraper_logic(page):
-            page.wait_for_timeout(5000)
+        def scraper_logic(page, timings):
+            with stage(timings, "ready"):
+                page.wait_for_timeout(5000)
 
             # El código R usa #myTable
-            table_locator = page.locator("#myTable").first
-            rows = table_locator.locator("tbody tr").all()
+            with stage(timings, "extract"):
+                table_locator = page.locator("#myTable").first
+                rows = table_locator.locator("tbody tr").all()
 
             data = []
             for i, row_locator in enumerate(rows[:15]):  # Limitar a top 15
                 try:
-                    cells = row_locator.locator("td").all()
-                    if len(cells) < 12:
-                        continue
-
-                    # Columna 4 (Symbol)
-                    symbol = cells[3].inner_text().strip()
-                    name = cells[2].inner_text().strip()
-                    # Columna 5 (Price)
-                    price_raw = cells[4].inner_text()
-                    # Columna 6 (Change 24h)
-                    change24h_raw = cells[5].inner_text()
-                    # Columna 10 (Volume 24h)
-                    volume24h_raw = cells[9].inner_text()
-                    # Columna 12 (Market Cap)
-                    market_cap_raw = cells[11].inner_text()
-
-                    # Limpieza (el código hace limpieza de espacios en volume24h)
-                    price = re.sub(r'[^\d\.,]', '', price_raw)
-                    change24h = re.sub(r'[\s]+', '', change24h_raw)
-                    volume24h = re.sub(r'[^\d\.,]', '', volume24h_raw)
-                    market_cap = re.sub(r'[^\d\.,]', '', market_cap_raw)
-
-                    data.append({
-                        "row": i + 1,
-                        "symbol": symbol.strip(),
-                        "name": name,
-                        "price": price.strip(),
-                        "change24h": change24h.strip(),
-                        "volume24h": volume24h.strip(),
-                        "marketCap": market_cap.strip()
-                    })
+                    with stage(timings, "extract"):
+                        cells = row_locator.locator("td").all()
+                        if len(cells) < 12:
+                            continue
+
+                        # Columna 4 (Symbol)
+                        symbol = cells[3].inner_text().strip()
+                        name = cells[2].inner_text().strip()
+                        # Columna 5 (Price)
+                        price_raw = cells[4].inner_text()
+                        # Columna 6 (Change 24h)
+                        change24h_raw = cells[5].inner_text()
+                        # Columna 10 (Volume 24h)
+                        volume24h_raw = cells[9].inner_text()
+                        # Columna 12 (Market Cap)
+                        market_cap_raw = cells[11].inner_text()
+
+                    with stage(timings, "parse"):
+                        # Limpieza (el código hace limpieza de espacios en volume24h)
+                        price = re.sub(r'[^\d\.,]', '', price_raw)
+                        change24h = re.sub(r'[\s]+', '', change24h_raw)
+                        volume24h = re.sub(r'[^\d\.,]', '', volume24h_raw)
+                        market_cap = re.sub(r'[^\d\.,]', '', market_cap_raw)
+
+                        data.append({
+                            "row": i + 1,
+                            "symbol": symbol.strip(),
+                            "name": name,
+                            "price": price.strip(),
+                            "change24h": change24h.strip(),
+                            "volume24h": volume24h.strip(),
+                            "marketCap": market_cap.strip()
+                        })
                 except Exception as e:
-                    print(f"Error procesando fila {i + 1} en WorldCoinIndex: {e}")
+                    # Una fila rota suele repetirse en cada ejecución: se muestrea por fuente
+                    log_sampled(
+                        logging.WARNING, "scrape.row.WorldCoinIndex", f"Error procesando fila {i + 1} en WorldCoinIndex: {e}",
+                        source="WorldCoinIndex", row=i + 1,
+                    )
                     continue
-            return pd.DataFrame(data, columns=self.COL_NAMES)
+            with stage(timings, "parse"):
+                return pd.DataFrame(data, columns=self.COL_NAMES)
 
-        return self._run_playwright_sync(url, scraper_logic)
+        return self._run_playwright_sync(url, scraper_logic, timings)
 
     # --- Métodos Públicos del Servicio ---
 
@@ -248,23 +438,65 @@ class ScrappingService:
         Console.log("Servicio solicitado para obtener las fuentes de scraping disponibles.")
         return list(self._scraping_functions.keys())
 
-    async def run_scraping_and_save(self, source: str):
+    async def run_scraping_and_save(
+        self,
+        source: str,
+        timings: Optional[Dict[str, float]] = None,
+        threads: Optional[List[asyncio.Future]] = None,
+    ):
         """
         Ejecuta una tarea de scraping para una fuente dada, la procesa y la guarda en la BD.
         Este método es asíncrono y delega el trabajo síncrono a un hilo.
+
+        Los segundos de cada etapa (browser, goto, ready, extract, parse,
+        scrape, save, ingest, broadcast) se registran en `scrape_stage_seconds`
+        y, si se pasa `timings`, también se copian en él.
+
+        Si se pasa `threads`, se le agrega el future del hilo del navegador. Cancelar
+        la tarea no detiene ese hilo: quien la cancela puede esperarlo con el future
+        antes de lanzar otro navegador.
         """
         if source not in self._scraping_functions:
             return ResponseUtil.error(f"La fuente '{source}' no es válida.")
 
+        breaker = self.health.breaker(source)
+        previous_state = breaker.state
+        if not breaker.allow():
+            return ResponseUtil.warning(
+                f"Circuito abierto para {source}; reintento en {breaker.retry_after():.0f}s."
+            )
+        if previous_state is BreakerState.OPEN:
+            await self._save_health(source)
+            await self._publish_event(
+                "CIRCUIT_HALF_OPEN", source, f"Ejecución de prueba para {source}.", breaker=breaker.snapshot()
+            )
+
+        scraped = False
+        stages: Dict[str, float] = {}
         try:
-            scraper_method = self._scraping_functions[source]
+            # Con un perfil activo (job con profile=true), el hilo del navegador también se muestrea
+            scraper_method = joining_profile(self._scraping_functions[source])
             
-            # Ejecuta la función de scraping síncrona en un hilo separado
+            # Ejecuta la función de scraping síncrona en un hilo separado, con el contexto
+            # actual para que sus logs lleven el id de correlación del job
             loop = asyncio.get_running_loop()
-            df = await loop.run_in_executor(None, scraper_method)
+            context = contextvars.copy_context()
+            with stage(stages, "scrape"):
+                thread = loop.run_in_executor(None, context.run, scraper_method, stages)
+                if threads is not None:
+                    threads.append(thread)
+                    # Protegido: al cancelar la tarea el future sigue avisando cuándo termina el hilo
+                    thread = asyncio.shield(thread)
+                df = await thread
+            scraped = True
 
             if df.empty:
+                # Un DataFrame vacío (markup cambiado, bloqueo, timeout) cuenta como fallo de la fuente
+                message = df.attrs.get("error") or f"No se obtuvieron datos de {source}."
+                await self._publish_event("FAILURE", source, message)
+                await self._record_failure(source, message)
                 return ResponseUtil.warning(f"No se obtuvieron datos de {source}.")
+            await self._record_success(source)
 
             # Prepara los datos para guardarlos
             records = df.to_dict(orient='records')
@@ -272,36 +504,71 @@ class ScrappingService:
             
             # Llama al repositorio para guardar los datos
             # (Asumiendo que el repositorio tiene un método `save_scrapping_results`)
-            response = await self.repository.save_scrapping_results(source, timestamp, records)
+            with stage(stages, "save"):
+                response = await self.repository.save_scrapping_results(source, timestamp, records)
             
             # Verifica el estado de la respuesta del repositorio antes de imprimir el log
             if response.status == 2: # 2 es el código para 'success' en tu ResponseUtil
                 message = f"Éxito: Se guardaron {len(records)} registros de {source}."
                 Console.log(message)
-                await broadcaster.publish(
-                    channel="scraping_events", 
-                    message=json.dumps({"status": "SUCCESS", "source": source, "message": message})
-                )
+                with stage(stages, "ingest"):
+                    if self._relay_ingest:
+                        await self.publish_ingest(source, timestamp, records)
+                    else:
+                        await self._notify_ingest(source, timestamp, records)
+                with stage(stages, "broadcast"):
+                    await broadcaster.publish(
+                        channel=ListaCanales.ScrapingEvents.value, 
+                        message=json.dumps({"status": "SUCCESS", "source": source, "message": message})
+                    )
             else:
                 await broadcaster.publish(
-                    channel="scraping_events", 
+                    channel=ListaCanales.ScrapingEvents.value, 
                     message=json.dumps({"status": "FAILURE", "source": source, "message": response.message})
                 )
             return response # La tarea en segundo plano termina aquí
 
         except Exception as e:
             Console.error(f"Error inesperado durante el scraping de {source}: {e}")
-            await broadcaster.publish(channel="scraping_events", message=json.dumps({"status": "ERROR", "source": source, "message": str(e)}))
+            if not scraped:
+                await self._record_failure(source, str(e))
+            await broadcaster.publish(channel=ListaCanales.ScrapingEvents.value, message=json.dumps({"status": "ERROR", "source": source, "message": str(e)}))
             return ResponseUtil.error(f"Ocurrió un error inesperado: {str(e)}")
-
-    async def get_results(self, source: str = None):
+        finally:
+            # Una ejecución cancelada no debe dejar la prueba half-open tomada para siempre
+            breaker.probe_in_flight = False
+            # Copia: si la tarea fue cancelada, el hilo del navegador puede seguir escribiendo
+            stages = dict(stages)
+            observe_stages(source, stages)
+            if timings is not None:
+                timings.update(stages)
+
+    def get_health(self):
+        """Estado del circuit breaker de cada fuente disponible."""
+        return ResponseUtil.success("Estado de salud de las fuentes.", data=self.health.snapshot(self.get_available_sources()))
+
+    async def get_results(
+        self,
+        source: str = None,
+        since: datetime = None,
+        start: datetime = None,
+        end: datetime = None,
+        symbols: List[str] = None,
+    ):
         """
-        Obtiene los resultados de scraping guardados, opcionalmente filtrados por fuente.
+        Obtiene los resultados de scraping guardados, opcionalmente filtrados por fuente,
+        ventana de tiempo (`start`/`end`) y símbolos, y limitados a los lotes posteriores a `since`.
         """
         Console.log(f"Servicio solicitado para obtener resultados de la fuente: {source or 'todas'}")
         try:
-            response = await self.repository.get_scrapping_results(source)
+            response = await self.repository.get_scrapping_results(source, since, start, end, symbols)
             return response
         except Exception as e:
             Console.error(f"Error en el servicio al obtener resultados: {e}")
-            return ResponseUtil.error(f"Ocurrió un error inesperado en el servicio: {str(e)}")
\ No newline at end of file
+            return ResponseUtil.error(f"Ocurrió un error inesperado en el servicio: {str(e)}")
+
+    async def get_symbols(self, source: str = None):
+        """
+        Obtiene los símbolos con datos guardados, opcionalmente de una sola fuente.
+        """
+        return await self.repository.get_symbols(source)
\ No newline at end of file
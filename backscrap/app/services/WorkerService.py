@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from backscrap.app.repository.JobRepository import JobRepository
+from backscrap.app.services.JobService import JobStatus
+from backscrap.app.services.ScrappingService import ScrappingService
+from backscrap.app.utils.config import (
+    JOB_HEARTBEAT_SECONDS,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_SECONDS,
+    JOB_WORKERS,
+)
+from backscrap.app.utils.Global import Console
+from backscrap.app.utils.logger import correlation, log_event
+from backscrap.app.utils.metrics import observe_stages
+from backscrap.app.utils.profiling import profile
+
+
+class WorkerService:
+    """
+    Standalone scrape worker that claims jobs from the shared `scrape_jobs` queue.
+
+    Each of the `concurrency` slots claims the best queued job (manual before
+    scheduled, oldest first) with an atomic `find_one_and_update` that also
+    sets a lease. While the scrape runs the slot renews the lease every
+    `heartbeat_seconds`; a worker that dies stops renewing, and once its lease
+    expires any other worker claims the job again. A heartbeat that finds the
+    lease lost (or `cancelRequested`) interrupts the scrape; the slot claims no
+    other job until the browser thread of the interrupted one ends. Every stored batch
+    is published on the `ingest_batches` channel for the API's engines.
+    """
+
+    def __init__(
+        self,
+        repository: JobRepository,
+        scrapping_service: ScrappingService,
+        concurrency: int = JOB_WORKERS,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS,
+        poll_seconds: float = JOB_POLL_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ):
+        self.repository = repository
+        self.scrapping_service = scrapping_service
+        self.concurrency = concurrency
+        self.lease = timedelta(seconds=lease_seconds)
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.worker_id: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        self._running: Dict[str, dict] = {}
+        self._completed = 0
+
+    async def run(self) -> None:
+        """Serve jobs until cancelled."""
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.started_at = datetime.now()
+        self.scrapping_service.register_ingest_listener(self.scrapping_service.publish_ingest)
+        await self.scrapping_service.load_health()
+        Console.log(f"Worker {self.worker_id} listo con {self.concurrency} slots.")
+        tasks = [asyncio.create_task(self._beat())]
+        tasks += [asyncio.create_task(self._slot()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _beat(self) -> None:
+        """
+        Publish this worker's liveness and running jobs in `scrape_workers`, and
+        fail the jobs whose lease expired after `max_attempts` runs.
+        """
+        while True:
+            exhausted = await self.repository.fail_exhausted(datetime.now(), self.max_attempts)
+            if exhausted.status == 2 and exhausted.data["total"]:
+                Console.warn(f"{exhausted.data['total']} job(s) marcados como fallidos tras {self.max_attempts} intentos.")
+            await self.repository.register_worker({
+                "id": self.worker_id,
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+                "concurrency": self.concurrency,
+                "running": sorted(self._running),
+                "completed": self._completed,
+                "startedAt": self.started_at,
+                "lastSeen": datetime.now(),
+            })
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    async def _slot(self) -> None:
+        while True:
+            now = datetime.now()
+            try:
+                response = await self.repository.claim_next(self.worker_id, now, now + self.lease, self.max_attempts)
+            except Exception as e:  # noqa: BLE001
+                Console.error(f"Error al tomar un job: {e}")
+                response = None
+            if response is None or response.status != 2:
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            threads: List[asyncio.Future] = []
+            await self._execute(response.data, threads)
+            # An interrupted scrape's browser thread runs on: take no other job until it ends
+            await asyncio.gather(*threads, return_exceptions=True)
+
+    async def _execute(self, job: dict, threads: List[asyncio.Future]) -> None:
+        with correlation(job["id"]):
+            started = job["startedAt"]
+            job["timings"] = {"queueWait": round((started - job["queuedAt"]).total_seconds(), 4)}
+            self._running[job["id"]] = job
+            Console.log(f"Worker {self.worker_id}: job {job['id']} ({job['source']}, intento {job['attempts']}).")
+            task = None
+            try:
+                if job.get("cancelRequested"):
+                    # Cancelled while its previous worker was dying
+                    status, result = JobStatus.CANCELLED, {"status": 3, "message": "Job cancelado antes de reanudarse."}
+                else:
+                    # Profiles stay in this worker's memory (see /api/admin/profiles on the API for its own runs)
+                    with profile("job", f"{job['source']} job {job['id']}", enabled=job.get("profile", False)) as recorded:
+                        if recorded is not None:
+                            job["profileId"] = recorded["id"]
+                        task = asyncio.create_task(
+                            self.scrapping_service.run_scraping_and_save(
+                                job["source"], timings=job["timings"], threads=threads
+                            )
+                        )
+                        status, result = await self._supervise(job, task)
+                if status is None:
+                    return  # Lease lost: the worker that holds it now reports the outcome
+                finished = datetime.now()
+                job["timings"]["total"] = round((finished - started).total_seconds(), 4)
+                observe_stages(job["source"], {name: job["timings"][name] for name in ("queueWait", "total")})
+                job.update(status=status.value, finishedAt=finished, result=result)
+                await self.repository.finish_job(job, self.worker_id)
+                self._completed += 1
+                log_event(
+                    logging.INFO, "Job terminado.",
+                    source=job["source"], status=status.value, worker=self.worker_id, timings=job["timings"],
+                )
+            finally:
+                if task is not None and not task.done():
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                self._running.pop(job["id"], None)
+
+    async def _supervise(self, job: dict, task: asyncio.Task):
+        """Renew the lease until the scrape finishes; returns (status, result), or (None, None) if the lease was lost."""
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=self.heartbeat_seconds)
+            if done:
+                try:
+                    response = task.result()
+                except Exception as e:  # noqa: BLE001
+                    return JobStatus.FAILED, {"status": 4, "message": str(e)}
+                status = JobStatus.SUCCEEDED if response.status == 2 else JobStatus.FAILED
+                return status, {"status": response.status, "message": response.message}
+            renewed = await self.repository.renew_lease(job["id"], self.worker_id, datetime.now() + self.lease)
+            if renewed.status == 3:
+                Console.warn(f"Worker {self.worker_id}: lease perdido para el job {job['id']}, se interrumpe.")
+                return None, None
+            if renewed.status == 2 and renewed.data.get("cancelRequested"):
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                return JobStatus.CANCELLED, {"status": 3, "message": "Job cancelado durante la ejecución."}
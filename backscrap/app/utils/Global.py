@@ -5,8 +5,10 @@ This module keeps the original behavior intact:
   * success  -> status=2
   * warning  -> status=3
   * error    -> status=4
-- Console respects the DEV_MODE flag for printing logs and saving images.
-- Paths and side effects (prints, image write) remain unchanged.
+- Console logs through the structured, queue-backed `backscrap` logger
+  (`utils.logger`); images are only saved in DEV_MODE (OpenCV is imported on
+  the first save).
+- Paths and side effects of the image dumps remain unchanged.
 
 """
 
@@ -15,11 +17,12 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Optional
 
-import cv2  # OpenCV is required for image saving in dev mode
+import logging
 import os
 
 from backscrap.app.pojo.models.modelos import CustomResponse
-from backscrap.app.utils.config import DEV_MODE
+from backscrap.app.utils.config import DEV_MODE, LOG_LEVEL
+from backscrap.app.utils.logger import level_number, logger
 
 
 class ResponseUtil:
@@ -66,7 +69,11 @@ class ResponseUtil:
 
 
 class Console:
-    """Lightweight console helper that respects DEV_MODE (logic preserved)."""
+    """Logging facade kept for the existing call sites (see `utils.logger`).
+
+    `log` and `table` are DEBUG records, `warn` and `error` WARNING and ERROR
+    records of the `backscrap` logger, written by its background thread.
+    """
 
     # Keep a module-level dev flag that can be toggled at runtime.
     dev_mode: bool = DEV_MODE
@@ -85,42 +92,44 @@ class Console:
     def set_dev_mode(value: bool) -> None:
         """Set the developer mode flag at runtime.
 
+        Enabling it also lowers the log level to DEBUG; disabling it restores
+        `LOG_LEVEL` (at least INFO).
+
         Args:
             value: Boolean flag to enable/disable dev mode.
         """
         Console.dev_mode = value
+        logger.setLevel(logging.DEBUG if value else max(logging.INFO, level_number(LOG_LEVEL)))
 
     @staticmethod
     def log(*msg: object) -> None:
-        """Print arbitrary messages when in dev mode."""
-        if Console.isDevMode():
-            print(*msg)
+        """Log arbitrary messages at DEBUG level."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(" ".join(map(str, msg)), stacklevel=2)
 
     @staticmethod
     def table(data: Any) -> None:
-        """Pretty-print lists/dicts in dev mode; fallback to str() for others.
+        """Log lists/dicts pretty-printed at DEBUG level; fallback to str() for others.
 
         Args:
             data: Any object; lists/dicts are pretty-printed.
         """
-        if Console.isDevMode():
+        if logger.isEnabledFor(logging.DEBUG):
             if isinstance(data, (list, dict)):
-                from pprint import pprint  # local import to keep overhead minimal
-                pprint(data)
+                from pprint import pformat  # local import to keep overhead minimal
+                logger.debug(pformat(data), stacklevel=2)
             else:
-                print(data)
+                logger.debug(str(data), stacklevel=2)
 
     @staticmethod
     def warn(*msg: object) -> None:
-        """Print a WARNING line in dev mode."""
-        if Console.isDevMode():
-            print(f"WARNING: {' '.join(map(str, msg))}")
+        """Log a WARNING record."""
+        logger.warning(" ".join(map(str, msg)), stacklevel=2)
 
     @staticmethod
     def error(*msg: object) -> None:
-        """Print an ERROR line in dev mode."""
-        if Console.isDevMode():
-            print(f"ERROR: {' '.join(map(str, msg))}")
+        """Log an ERROR record."""
+        logger.error(" ".join(map(str, msg)), stacklevel=2)
 
     @staticmethod
     def saveImg(folder: str, face: Any) -> None:
@@ -130,13 +139,15 @@ class Console:
         - Uses the current working directory.
         - Creates the target folder if missing.
         - Writes the image using OpenCV's `imwrite`.
-        - Prints the resulting file path.
+        - Logs the resulting file path.
 
         Args:
             folder: Subfolder name under ./assets/ where the image will be saved.
             face:   Image matrix (e.g., NumPy ndarray in OpenCV format).
         """
         if Console.isDevMode():
+            import cv2  # OpenCV is only needed here; importing it costs ~60 ms at startup
+
             output_dir = os.path.join(os.getcwd(), "assets", folder)
             os.makedirs(output_dir, exist_ok=True)
 
@@ -145,4 +156,4 @@ class Console:
 
             cv2.imwrite(file_path, face)
 
-            print(f"Image saved at: {file_path}")
+            logger.debug(f"Image saved at: {file_path}")
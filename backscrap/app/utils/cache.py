@@ -0,0 +1,51 @@
+"""Small in-process caches shared by the read-side services.
+
+`VersionedCache` keeps computed results next to the data version they were
+computed from. A lookup with a different version is a miss, so entries become
+stale the moment a new scraping batch is stored and no explicit invalidation
+is needed.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional, Tuple
+
+
+class VersionedCache:
+    """Bounded LRU cache whose entries are tied to a data version."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Any]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: Any) -> Tuple[bool, Optional[Any]]:
+        """Return `(found, value)` for `key` if it was stored for `version`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def set(self, key: Hashable, version: Any, value: Any) -> None:
+        """Store `value` for `key`, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
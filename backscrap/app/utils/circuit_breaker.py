@@ -0,0 +1,178 @@
+"""Per-source circuit breaker with exponential backoff and half-open probes.
+
+States:
+
+- `closed`     normal operation; consecutive failures are counted,
+- `open`       after `failure_threshold` consecutive failures no scrape is
+               launched until `retry_at` (exponential backoff with jitter),
+- `half_open`  once the backoff expired a single probe run is allowed: success
+               closes the circuit, failure re-opens it with a longer backoff.
+
+The backoff doubles with every failed probe, from `base_backoff` up to
+`max_backoff`, and uses "equal jitter" (half fixed, half random) so sources
+that broke together don't probe together.
+
+Processes that scrape persist every `snapshot()` in `source_health`; `restore`
+rebuilds a breaker from it, so the state survives restarts and an API that
+only queues jobs for standalone workers gates `/run` on their breakers.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Dict, Optional
+
+from backscrap.app.utils.config import (
+    CIRCUIT_BASE_BACKOFF_SECONDS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_BACKOFF_SECONDS,
+)
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class CircuitBreaker:
+    """Health of one source."""
+
+    def __init__(
+        self,
+        source: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        base_backoff: float = CIRCUIT_BASE_BACKOFF_SECONDS,
+        max_backoff: float = CIRCUIT_MAX_BACKOFF_SECONDS,
+    ):
+        self.source = source
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.total_successes = 0
+        self.probe_in_flight = False
+        self.backoff_seconds = 0.0
+        self.last_error: Optional[str] = None
+        self.last_failure_at: Optional[datetime] = None
+        self.last_success_at: Optional[datetime] = None
+        self.opened_at: Optional[datetime] = None
+        self.retry_at: Optional[datetime] = None
+
+    def retry_after(self, now: Optional[datetime] = None) -> float:
+        """Seconds until a run would be allowed (0 when it would be allowed now)."""
+        now = now or datetime.now()
+        if self.state is BreakerState.OPEN and self.retry_at is not None:
+            return max(0.0, (self.retry_at - now).total_seconds())
+        if self.state is BreakerState.HALF_OPEN and self.probe_in_flight:
+            return self.base_backoff
+        return 0.0
+
+    def allow(self, now: Optional[datetime] = None) -> bool:
+        """Whether a run may start now; moves `open` to `half_open` and takes the probe slot."""
+        now = now or datetime.now()
+        if self.state is BreakerState.CLOSED:
+            return True
+        if self.state is BreakerState.OPEN:
+            if self.retry_at is not None and now < self.retry_at:
+                return False
+            self.state = BreakerState.HALF_OPEN
+        if self.probe_in_flight:
+            return False
+        self.probe_in_flight = True
+        return True
+
+    def _open(self, now: datetime) -> None:
+        exponent = max(0, self.consecutive_failures - self.failure_threshold)
+        delay = min(self.max_backoff, self.base_backoff * 2 ** exponent)
+        self.backoff_seconds = delay / 2 + random.uniform(0, delay / 2)
+        self.state = BreakerState.OPEN
+        self.opened_at = now
+        self.retry_at = now + timedelta(seconds=self.backoff_seconds)
+
+    def record_success(self, now: Optional[datetime] = None) -> None:
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self.total_successes += 1
+        self.probe_in_flight = False
+        self.backoff_seconds = 0.0
+        self.last_success_at = now or datetime.now()
+        self.opened_at = self.retry_at = None
+
+    def record_failure(self, error: str, now: Optional[datetime] = None) -> None:
+        now = now or datetime.now()
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        self.last_error = error
+        self.last_failure_at = now
+        self.probe_in_flight = False
+        if self.state is BreakerState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._open(now)
+
+    def snapshot(self, now: Optional[datetime] = None) -> dict:
+        return {
+            "source": self.source,
+            "state": self.state.value,
+            "consecutiveFailures": self.consecutive_failures,
+            "totalFailures": self.total_failures,
+            "totalSuccesses": self.total_successes,
+            "lastError": self.last_error,
+            "lastFailureAt": _iso(self.last_failure_at),
+            "lastSuccessAt": _iso(self.last_success_at),
+            "openedAt": _iso(self.opened_at),
+            "retryAt": _iso(self.retry_at),
+            "backoffSeconds": round(self.backoff_seconds, 1),
+            "retryAfterSeconds": round(self.retry_after(now), 1),
+            "probeInFlight": self.probe_in_flight,
+        }
+
+    def restore(self, snapshot: dict) -> None:
+        """
+        Load the state of a `snapshot()` taken by another process. `probeInFlight`
+        is informative only: the probe of a process that died would never end.
+        """
+        self.state = BreakerState(snapshot["state"])
+        self.consecutive_failures = snapshot["consecutiveFailures"]
+        self.total_failures = snapshot["totalFailures"]
+        self.total_successes = snapshot["totalSuccesses"]
+        self.probe_in_flight = False
+        self.backoff_seconds = snapshot["backoffSeconds"]
+        self.last_error = snapshot["lastError"]
+        self.last_failure_at = _parse_iso(snapshot["lastFailureAt"])
+        self.last_success_at = _parse_iso(snapshot["lastSuccessAt"])
+        self.opened_at = _parse_iso(snapshot["openedAt"])
+        self.retry_at = _parse_iso(snapshot["retryAt"])
+
+
+class SourceHealthTracker:
+    """One circuit breaker per source, created on first use."""
+
+    def __init__(self, **breaker_options):
+        self._breaker_options = breaker_options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, source: str) -> CircuitBreaker:
+        breaker = self._breakers.get(source)
+        if breaker is None:
+            breaker = self._breakers[source] = CircuitBreaker(source, **self._breaker_options)
+        return breaker
+
+    def restore(self, snapshots: list) -> None:
+        for snapshot in snapshots:
+            self.breaker(snapshot["source"]).restore(snapshot)
+
+    def snapshot(self, sources=None) -> list:
+        now = datetime.now()
+        return [self.breaker(source).snapshot(now) for source in (sources or sorted(self._breakers))]
@@ -1,13 +1,15 @@
 """Environment configuration loader (logic preserved).
 
 Reads required environment variables for MongoDB and a DEV flag.
-Keeps simple stdout prints for observability without changing behavior.
+Importing it has no side effects: the Mongo settings are logged by the API
+lifespan and the worker on startup (`mongo_settings_summary`).
 """
 
 from __future__ import annotations
 
 import os
 from typing import Final
+from urllib.parse import urlsplit, urlunsplit
 
 
 def _get_required(name: str) -> str:
@@ -25,6 +27,112 @@ MONGO_DATABASE_NAME: Final[str] = _get_required("MONGO_DATABASE_NAME")
 # Optional (defaults to False if missing)
 DEV_MODE: Final[bool] = os.environ.get("DEV_MODE", "false").strip().lower() in ("true", "1", "yes")
 
-# Keep the simple prints (same observable side-effects as typical original code)
-print(f"MONGO_DATABASE_URL: {MONGO_DATABASE_URL}")
-print(f"MONGO_DATABASE_NAME: {MONGO_DATABASE_NAME}")
+# Cross-source consolidation: snapshots whose timestamps fall in the same bucket are compared
+CONSOLIDATION_BUCKET_SECONDS: Final[int] = int(os.environ.get("CONSOLIDATION_BUCKET_SECONDS", "300"))
+CONSOLIDATION_MAX_BUCKETS: Final[int] = int(os.environ.get("CONSOLIDATION_MAX_BUCKETS", "288"))
+
+# Price projections: history loaded at startup, regression window and Holt-Winters season (in snapshots)
+PROJECTION_HISTORY_HOURS: Final[float] = float(os.environ.get("PROJECTION_HISTORY_HOURS", "72"))
+PROJECTION_WINDOW: Final[int] = int(os.environ.get("PROJECTION_WINDOW", "60"))
+PROJECTION_SEASON_LENGTH: Final[int] = int(os.environ.get("PROJECTION_SEASON_LENGTH", "720"))
+
+# Streaming technical indicators (periods are counted in snapshots)
+INDICATOR_SMA_PERIOD: Final[int] = int(os.environ.get("INDICATOR_SMA_PERIOD", "20"))
+INDICATOR_EMA_PERIODS: Final[tuple] = tuple(int(p) for p in os.environ.get("INDICATOR_EMA_PERIODS", "12,26").split(","))
+INDICATOR_RSI_PERIOD: Final[int] = int(os.environ.get("INDICATOR_RSI_PERIOD", "14"))
+INDICATOR_VOLATILITY_WINDOW: Final[int] = int(os.environ.get("INDICATOR_VOLATILITY_WINDOW", "30"))
+
+# Ingest-time anomaly detection thresholds
+ANOMALY_JUMP_ZSCORE: Final[float] = float(os.environ.get("ANOMALY_JUMP_ZSCORE", "6"))
+ANOMALY_JUMP_MAX_RETURN: Final[float] = float(os.environ.get("ANOMALY_JUMP_MAX_RETURN", "0.25"))
+ANOMALY_SCALE_RATIO: Final[float] = float(os.environ.get("ANOMALY_SCALE_RATIO", "50"))
+ANOMALY_DIVERGENCE_PCT: Final[float] = float(os.environ.get("ANOMALY_DIVERGENCE_PCT", "5"))
+ANOMALY_DIVERGENCE_MAX_AGE_SECONDS: Final[int] = int(os.environ.get("ANOMALY_DIVERGENCE_MAX_AGE_SECONDS", "600"))
+# Consecutive scale outliers that agree with each other after which they become the new reference price
+ANOMALY_REBASE_AFTER: Final[int] = int(os.environ.get("ANOMALY_REBASE_AFTER", "3"))
+
+# SSE fan-out: per-subscriber queue bound, overflow policy (drop_oldest | coalesce | disconnect) and keepalives
+SSE_QUEUE_SIZE: Final[int] = int(os.environ.get("SSE_QUEUE_SIZE", "100"))
+SSE_OVERFLOW_POLICY: Final[str] = os.environ.get("SSE_OVERFLOW_POLICY", "drop_oldest").strip().lower()
+SSE_HEARTBEAT_SECONDS: Final[int] = int(os.environ.get("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_SEND_TIMEOUT_SECONDS: Final[float] = float(os.environ.get("SSE_SEND_TIMEOUT_SECONDS", "30"))
+
+# Price-delta stream: number of deltas kept in memory for Last-Event-ID replay
+PRICE_DELTA_REPLAY_SIZE: Final[int] = int(os.environ.get("PRICE_DELTA_REPLAY_SIZE", "1000"))
+
+# WebSocket event stream: default batch flush interval and pending events kept per client between flushes
+WS_FLUSH_MS: Final[int] = int(os.environ.get("WS_FLUSH_MS", "250"))
+WS_MAX_PENDING_EVENTS: Final[int] = int(os.environ.get("WS_MAX_PENDING_EVENTS", "500"))
+
+# Broadcaster backend shared by all API workers: memory:// (single process only), redis://, rediss://,
+# redis-stream://, postgres:// or kafka:// (the matching client library must be installed)
+BROADCAST_URL: Final[str] = os.environ.get("BROADCAST_URL", "memory://").strip()
+
+# Embedded scheduler (runs inside the API lifespan, state in `scheduler_state`); catch-up policy: once | skip
+EMBEDDED_SCHEDULER: Final[bool] = os.environ.get("EMBEDDED_SCHEDULER", "false").strip().lower() in ("true", "1", "yes")
+EMBEDDED_SCHEDULER_INTERVAL_SECONDS: Final[float] = float(os.environ.get("EMBEDDED_SCHEDULER_INTERVAL_SECONDS", "120"))
+EMBEDDED_SCHEDULER_CATCH_UP: Final[str] = os.environ.get("EMBEDDED_SCHEDULER_CATCH_UP", "once").strip().lower()
+EMBEDDED_SCHEDULER_TICK_SECONDS: Final[float] = float(os.environ.get("EMBEDDED_SCHEDULER_TICK_SECONDS", "5"))
+EMBEDDED_SCHEDULER_LEASE_SECONDS: Final[float] = float(os.environ.get("EMBEDDED_SCHEDULER_LEASE_SECONDS", "600"))
+
+# Lease of the API process that publishes the ingest engines' events (renewed every third of it)
+INGEST_LEADER_LEASE_SECONDS: Final[float] = float(os.environ.get("INGEST_LEADER_LEASE_SECONDS", "15"))
+
+# Per-source circuit breaker: consecutive failures before opening and backoff bounds (doubles per failed probe)
+CIRCUIT_FAILURE_THRESHOLD: Final[int] = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_BASE_BACKOFF_SECONDS: Final[float] = float(os.environ.get("CIRCUIT_BASE_BACKOFF_SECONDS", "120"))
+CIRCUIT_MAX_BACKOFF_SECONDS: Final[float] = float(os.environ.get("CIRCUIT_MAX_BACKOFF_SECONDS", "3600"))
+
+# Scrape job queue: concurrent scrapes (browsers) per API process, queued jobs accepted, finished jobs kept in memory
+JOB_WORKERS: Final[int] = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE: Final[int] = int(os.environ.get("JOB_QUEUE_SIZE", "100"))
+JOB_HISTORY_SIZE: Final[int] = int(os.environ.get("JOB_HISTORY_SIZE", "500"))
+
+# Where queued jobs run: "api" (workers inside each API process) or "workers" (standalone `python -m backscrap.worker`)
+JOB_EXECUTOR: Final[str] = os.environ.get("JOB_EXECUTOR", "api").strip().lower()
+
+# Standalone workers: job lease, heartbeat period (well below the lease) and idle poll period, in seconds
+JOB_LEASE_SECONDS: Final[float] = float(os.environ.get("JOB_LEASE_SECONDS", "60"))
+JOB_HEARTBEAT_SECONDS: Final[float] = float(os.environ.get("JOB_HEARTBEAT_SECONDS", "15"))
+JOB_POLL_SECONDS: Final[float] = float(os.environ.get("JOB_POLL_SECONDS", "2"))
+# Runs of a job (the first plus recoveries after a lost lease) before it is marked failed
+JOB_MAX_ATTEMPTS: Final[int] = int(os.environ.get("JOB_MAX_ATTEMPTS", "3"))
+
+# Opt-in profiling (X-Profile header, profile=true jobs): off unless enabled, defaults to DEV_MODE;
+# profiles kept in memory per process, sampling period in milliseconds, and limits after which sampling stops
+PROFILING_ENABLED: Final[bool] = os.environ.get("PROFILING_ENABLED", str(DEV_MODE)).strip().lower() in ("true", "1", "yes")
+PROFILE_HISTORY_SIZE: Final[int] = int(os.environ.get("PROFILE_HISTORY_SIZE", "20"))
+PROFILE_SAMPLE_INTERVAL_MS: Final[float] = float(os.environ.get("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILE_MAX_SECONDS: Final[float] = float(os.environ.get("PROFILE_MAX_SECONDS", "120"))
+PROFILE_MAX_SAMPLES: Final[int] = int(os.environ.get("PROFILE_MAX_SAMPLES", "20000"))
+
+# Standalone workers: port of their Prometheus /metrics endpoint (0 disables it; the API serves /metrics itself)
+WORKER_METRICS_PORT: Final[int] = int(os.environ.get("WORKER_METRICS_PORT", "0"))
+
+# API with several worker processes: prometheus_client multiprocess directory, so any of them serves the totals
+# on /metrics (set by run.py --workers N; empty = metrics of the answering process only)
+PROMETHEUS_MULTIPROC_DIR: Final[str] = os.environ.get("PROMETHEUS_MULTIPROC_DIR", "").strip()
+
+# Structured logging: level (DEBUG with DEV_MODE, INFO otherwise), output (json | text), records buffered for
+# the writer thread (dropped when full) and sampling of repetitive per-row errors (first, then 1 in N)
+LOG_LEVEL: Final[str] = os.environ.get("LOG_LEVEL", "DEBUG" if DEV_MODE else "INFO").strip().upper()
+LOG_FORMAT: Final[str] = os.environ.get("LOG_FORMAT", "text" if DEV_MODE else "json").strip().lower()
+LOG_QUEUE_SIZE: Final[int] = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_EVERY: Final[int] = int(os.environ.get("LOG_SAMPLE_EVERY", "50"))
+
+# Readiness (/ready): Mongo connections opened by the warm-up, browser launch check (only in processes that
+# scrape), retry period of failed warm-up steps and timeout of the Mongo ping done on every /ready
+WARMUP_MONGO_CONNECTIONS: Final[int] = int(os.environ.get("WARMUP_MONGO_CONNECTIONS", "4"))
+WARMUP_BROWSER: Final[bool] = os.environ.get("WARMUP_BROWSER", "true").strip().lower() in ("true", "1", "yes")
+WARMUP_RETRY_SECONDS: Final[float] = float(os.environ.get("WARMUP_RETRY_SECONDS", "30"))
+READY_MONGO_TIMEOUT_SECONDS: Final[float] = float(os.environ.get("READY_MONGO_TIMEOUT_SECONDS", "2"))
+
+
+def mongo_settings_summary() -> str:
+    """`MONGO_DATABASE_URL` (password masked) and `MONGO_DATABASE_NAME`, for the startup log."""
+    parts = urlsplit(MONGO_DATABASE_URL)
+    url = MONGO_DATABASE_URL
+    if parts.password:
+        netloc = parts.netloc.replace(f":{parts.password}@", ":***@", 1)
+        url = urlunsplit(parts._replace(netloc=netloc))
+    return f"MONGO_DATABASE_URL: {url}, MONGO_DATABASE_NAME: {MONGO_DATABASE_NAME}"
@@ -0,0 +1,78 @@
+"""Downsampling of time series for charts.
+
+Both functions take the x (seconds) and y values of one series sorted by x
+and return the indices of the points to keep, always including the first
+and the last point:
+
+- `lttb`    Largest-Triangle-Three-Buckets: splits the inner points into
+            `threshold - 2` buckets and keeps, per bucket, the point that
+            forms the largest triangle with the previously kept point and
+            the average of the next bucket. Keeps the visual shape of the
+            line with exactly `threshold` points.
+- `min_max` keeps the minimum and the maximum of each bucket, so every
+            spike survives; returns at most `2 * buckets + 2` points.
+
+Series that already fit are returned untouched.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+
+import numpy as np
+
+
+class DownsamplingMethod(str, Enum):
+    LTTB = "lttb"
+    MIN_MAX = "minmax"
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the `threshold` points chosen by LTTB."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        # The last bucket looks ahead to the final point only
+        average_x = x[end:next_end].mean()
+        average_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[previous] - average_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        kept[bucket + 1] = previous
+    return kept
+
+
+def min_max(y: np.ndarray, buckets: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of `buckets` equal-count buckets."""
+    n = len(y)
+    if 2 * buckets + 2 >= n or buckets < 1:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    kept = [0]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        window = y[start:end]
+        low, high = start + int(window.argmin()), start + int(window.argmax())
+        kept.extend(sorted({low, high}))
+    kept.append(n - 1)
+    return np.asarray(kept, dtype=np.int64)
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int, method: DownsamplingMethod) -> np.ndarray:
+    """Indices of at most `max_points` points of the series, chosen by `method`."""
+    if method is DownsamplingMethod.MIN_MAX:
+        return min_max(y, (max_points - 2) // 2)
+    return lttb(x, y, max_points)
@@ -0,0 +1,228 @@
+"""Backpressure-aware fan-out of broadcaster channels to SSE/WebSocket clients.
+
+The hub holds a single broadcaster subscription per channel and copies each
+message into a bounded queue per client. Publishing never waits on a client:
+when a queue is full the subscription's overflow policy decides what happens.
+
+- `drop_oldest`  discard the oldest queued message,
+- `coalesce`     replace the queued message with the same key (by default the
+                 `source` field of the JSON payload), else drop the oldest,
+- `disconnect`   close the subscription; the client is expected to reconnect.
+
+`stats()` reports subscriber counts, queue depth and lag per channel.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncIterator, Callable, Deque, Dict, Optional, Set, Tuple
+
+from broadcaster import Broadcast
+
+from backscrap.app.utils.broadcaster import broadcaster
+from backscrap.app.utils.config import SSE_OVERFLOW_POLICY, SSE_QUEUE_SIZE
+from backscrap.app.utils.Global import Console
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+def source_key(message: str) -> Optional[str]:
+    """Default coalescing key: the `source` field of a JSON payload."""
+    try:
+        payload = json.loads(message)
+    except (TypeError, ValueError):
+        return None
+    return payload.get("source") if isinstance(payload, dict) else None
+
+
+class Subscription:
+    """Bounded queue of pending messages for one client."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, channel: str, max_size: int, policy: OverflowPolicy):
+        self.id = next(self._ids)
+        self.channel = channel
+        self.max_size = max_size
+        self.policy = policy
+        self.created_at = time.monotonic()
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        # (key, message, enqueued_at)
+        self._queue: Deque[Tuple[Optional[str], str, float]] = deque()
+        self._ready = asyncio.Event()
+
+    def offer(self, message: str, key: Optional[str]) -> None:
+        """Enqueue without ever blocking the publisher; apply the overflow policy when full."""
+        if self.closed:
+            return
+        now = time.monotonic()
+        if len(self._queue) >= self.max_size:
+            if self.policy is OverflowPolicy.DISCONNECT:
+                self.dropped += len(self._queue)
+                self._queue.clear()
+                self.close("slow consumer")
+                return
+            if self.policy is OverflowPolicy.COALESCE and key is not None:
+                for index, (queued_key, _, _) in enumerate(self._queue):
+                    if queued_key == key:
+                        del self._queue[index]
+                        self.coalesced += 1
+                        break
+                else:
+                    self._queue.popleft()
+                    self.dropped += 1
+            else:
+                self._queue.popleft()
+                self.dropped += 1
+        self._queue.append((key, message, now))
+        self._ready.set()
+
+    def close(self, reason: str = "closed") -> None:
+        self.closed = True
+        self.close_reason = reason
+        self._ready.set()
+
+    async def get(self) -> Optional[str]:
+        """Next pending message, or None once the subscription is closed."""
+        while not self._queue:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        _, message, _ = self._queue.popleft()
+        self.delivered += 1
+        return message
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        while True:
+            message = await self.get()
+            if message is None:
+                return
+            yield message
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def lag_seconds(self) -> float:
+        """Age of the oldest undelivered message."""
+        return time.monotonic() - self._queue[0][2] if self._queue else 0.0
+
+
+class FanoutHub:
+    """One broadcaster subscription per channel, bounded queues per client."""
+
+    def __init__(
+        self,
+        source: Broadcast,
+        queue_size: int = SSE_QUEUE_SIZE,
+        policy: OverflowPolicy = OverflowPolicy(SSE_OVERFLOW_POLICY),
+        key_func: Callable[[str], Optional[str]] = source_key,
+    ):
+        self.source = source
+        self.queue_size = queue_size
+        self.policy = policy
+        self.key_func = key_func
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._pumps: Dict[str, asyncio.Task] = {}
+        self._published: Dict[str, int] = {}
+        self._slow_disconnects: Dict[str, int] = {}
+
+    async def _pump(self, channel: str, ready: asyncio.Event) -> None:
+        try:
+            async with self.source.subscribe(channel=channel) as upstream:
+                ready.set()
+                async for event in upstream:
+                    self._published[channel] = self._published.get(channel, 0) + 1
+                    subscribers = self._subscribers.get(channel)
+                    if not subscribers:
+                        continue
+                    key, keyed = None, False
+                    for subscription in tuple(subscribers):
+                        if subscription.policy is OverflowPolicy.COALESCE and not keyed:
+                            key, keyed = self.key_func(event.message), True
+                        subscription.offer(event.message, key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:  # noqa: BLE001
+            Console.error(f"Fan-out pump for '{channel}' stopped: {e}")
+        finally:
+            ready.set()
+            for subscription in tuple(self._subscribers.get(channel, ())):
+                subscription.close("upstream closed")
+
+    async def _ensure_pump(self, channel: str) -> None:
+        task = self._pumps.get(channel)
+        if task is not None and not task.done():
+            return
+        ready = asyncio.Event()
+        self._pumps[channel] = asyncio.create_task(self._pump(channel, ready))
+        await ready.wait()
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        channel: str,
+        policy: Optional[OverflowPolicy] = None,
+        queue_size: Optional[int] = None,
+    ) -> AsyncIterator[Subscription]:
+        """Register a client queue on `channel` for the duration of the context."""
+        subscription = Subscription(channel, queue_size or self.queue_size, policy or self.policy)
+        self._subscribers.setdefault(channel, set()).add(subscription)
+        try:
+            await self._ensure_pump(channel)
+            yield subscription
+        finally:
+            if subscription.close_reason == "slow consumer":
+                self._slow_disconnects[channel] = self._slow_disconnects.get(channel, 0) + 1
+            subscription.close()
+            self._subscribers.get(channel, set()).discard(subscription)
+
+    async def close(self) -> None:
+        """Stop every pump and close all subscriptions (application shutdown)."""
+        for task in self._pumps.values():
+            task.cancel()
+        await asyncio.gather(*self._pumps.values(), return_exceptions=True)
+        self._pumps.clear()
+
+    def stats(self) -> dict:
+        """Subscriber counts, queue depth, lag and drop counters per channel."""
+        channels = {}
+        for channel in sorted(set(self._subscribers) | set(self._pumps)):
+            subscribers = self._subscribers.get(channel, set())
+            channels[channel] = {
+                "subscribers": len(subscribers),
+                "published": self._published.get(channel, 0),
+                "queued": sum(sub.depth for sub in subscribers),
+                "maxDepth": max((sub.depth for sub in subscribers), default=0),
+                "maxLagSeconds": max((sub.lag_seconds for sub in subscribers), default=0.0),
+                "delivered": sum(sub.delivered for sub in subscribers),
+                "dropped": sum(sub.dropped for sub in subscribers),
+                "coalesced": sum(sub.coalesced for sub in subscribers),
+                "slowDisconnects": self._slow_disconnects.get(channel, 0),
+            }
+        return {
+            "queueSize": self.queue_size,
+            "policy": self.policy.value,
+            "subscribers": sum(info["subscribers"] for info in channels.values()),
+            "channels": channels,
+        }
+
+
+# Shared hub used by the SSE/WebSocket controllers
+hub = FanoutHub(broadcaster)
@@ -0,0 +1,203 @@
+"""Vectorized NumPy forecasting models with incremental state.
+
+Every model exposes the same small interface:
+
+- `fit(values)`      → initialise the state from a history array (vectorized where possible)
+- `update(value)`    → fold one new observation into the state in O(1)
+- `forecast(h, z)`   → `(mean, lower, upper)` arrays for the next `h` steps
+
+Timestamps are handled by the caller: the models work in "steps", i.e. the
+typical spacing between snapshots of a series.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import numpy as np
+
+Forecast = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+# Blocks keep decay**-block finite in float64 for any alpha below ~0.99.
+_EWMA_BLOCK = 64
+
+
+def ewma_path(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponentially weighted moving average of `values` (l_0 = y_0, l_t = a*y_t + (1-a)*l_{t-1}).
+
+    Evaluated block by block with cumulative sums instead of a Python loop
+    over every element.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.empty_like(values)
+    if values.size == 0:
+        return out
+    decay = 1.0 - alpha
+    previous = values[0]
+    for start in range(0, values.size, _EWMA_BLOCK):
+        chunk = values[start:start + _EWMA_BLOCK]
+        powers = decay ** np.arange(1, chunk.size + 1)
+        out[start:start + chunk.size] = powers * (previous + alpha * np.cumsum(chunk / powers))
+        previous = out[start + chunk.size - 1]
+    return out
+
+
+class EWMAModel:
+    """Simple exponential smoothing: flat forecast around the smoothed level."""
+
+    name = "ewma"
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self.level: Optional[float] = None
+        self.error_var = 0.0
+        self.n = 0
+
+    def fit(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return
+        levels = ewma_path(values, self.alpha)
+        errors = values[1:] - levels[:-1]
+        self.level = float(levels[-1])
+        self.error_var = float(ewma_path(errors ** 2, self.alpha)[-1]) if errors.size else 0.0
+        self.n = int(values.size)
+
+    def update(self, value: float) -> None:
+        if self.level is None:
+            self.level, self.n = value, 1
+            return
+        error = value - self.level
+        self.error_var = self.alpha * error ** 2 + (1 - self.alpha) * self.error_var
+        self.level += self.alpha * error
+        self.n += 1
+
+    def forecast(self, horizon: int, z: float) -> Forecast:
+        steps = np.arange(1, horizon + 1)
+        mean = np.full(horizon, self.level, dtype=float)
+        spread = z * np.sqrt(self.error_var * (1 + (steps - 1) * self.alpha ** 2))
+        return mean, mean - spread, mean + spread
+
+
+class RollingRegressionModel:
+    """Ordinary least squares trend over the last `window` observations."""
+
+    name = "linear"
+
+    def __init__(self, window: int = 60):
+        self.window = window
+        self.values: Deque[float] = deque(maxlen=window)
+
+    def fit(self, values: np.ndarray) -> None:
+        self.values.clear()
+        self.values.extend(np.asarray(values, dtype=float)[-self.window:].tolist())
+
+    def update(self, value: float) -> None:
+        self.values.append(value)
+
+    @property
+    def n(self) -> int:
+        return len(self.values)
+
+    def forecast(self, horizon: int, z: float) -> Forecast:
+        y = np.fromiter(self.values, dtype=float)
+        n = y.size
+        x = np.arange(n, dtype=float)
+        future = np.arange(n, n + horizon, dtype=float)
+        if n < 3:
+            mean = np.full(horizon, y[-1] if n else np.nan)
+            return mean, mean, mean
+
+        x_mean, y_mean = x.mean(), y.mean()
+        sxx = float(np.sum((x - x_mean) ** 2))
+        slope = float(np.sum((x - x_mean) * (y - y_mean)) / sxx)
+        intercept = y_mean - slope * x_mean
+        residuals = y - (intercept + slope * x)
+        sigma = math.sqrt(float(np.sum(residuals ** 2)) / (n - 2))
+
+        mean = intercept + slope * future
+        spread = z * sigma * np.sqrt(1 + 1 / n + (future - x_mean) ** 2 / sxx)
+        return mean, mean - spread, mean + spread
+
+
+class HoltWintersModel:
+    """Additive Holt-Winters; behaves as Holt's linear trend until two full seasons are seen."""
+
+    name = "holt_winters"
+
+    def __init__(self, season_length: int = 0, alpha: float = 0.3, beta: float = 0.05, gamma: float = 0.1):
+        self.season_length = season_length
+        self.alpha, self.beta, self.gamma = alpha, beta, gamma
+        self.level: Optional[float] = None
+        self.trend = 0.0
+        self.seasonal: Optional[np.ndarray] = None
+        self.error_var = 0.0
+        self.n = 0
+        # Observations kept only until the seasonal profile can be initialised
+        self._pending: list = []
+
+    @property
+    def seasonal_ready(self) -> bool:
+        return self.seasonal is not None
+
+    def _init_seasonal(self, values: np.ndarray) -> None:
+        """Initial seasonal indices from the first two seasons (vectorized reshape/mean)."""
+        m = self.season_length
+        seasons = values[: 2 * m].reshape(2, m)
+        season_means = seasons.mean(axis=1, keepdims=True)
+        self.seasonal = (seasons - season_means).mean(axis=0)
+        self.level = float(season_means[-1, 0])
+        self.trend = float((season_means[1, 0] - season_means[0, 0]) / m)
+
+    def fit(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float)
+        self.level, self.trend, self.seasonal, self.error_var, self.n = None, 0.0, None, 0.0, 0
+        self._pending = []
+        m = self.season_length
+        if m > 1 and values.size >= 2 * m:
+            self._init_seasonal(values)
+            self.n = 2 * m
+            rest = values[2 * m:]
+        else:
+            rest = values
+        for value in rest.tolist():
+            self.update(value)
+
+    def update(self, value: float) -> None:
+        m = self.season_length
+        if self.level is None:
+            self.level, self.n = value, 1
+            self._pending = [value] if m > 1 else []
+            return
+
+        season = float(self.seasonal[self.n % m]) if self.seasonal_ready else 0.0
+        error = value - (self.level + self.trend + season)
+        self.error_var = self.alpha * error ** 2 + (1 - self.alpha) * self.error_var
+
+        previous_level = self.level
+        self.level = self.alpha * (value - season) + (1 - self.alpha) * (self.level + self.trend)
+        self.trend = self.beta * (self.level - previous_level) + (1 - self.beta) * self.trend
+        if self.seasonal_ready:
+            self.seasonal[self.n % m] = self.gamma * (value - self.level) + (1 - self.gamma) * season
+        self.n += 1
+
+        if m > 1 and not self.seasonal_ready:
+            self._pending.append(value)
+            if len(self._pending) >= 2 * m:
+                # Enough history: switch from Holt to Holt-Winters without refitting from storage
+                self.fit(np.asarray(self._pending))
+
+    def forecast(self, horizon: int, z: float) -> Forecast:
+        steps = np.arange(1, horizon + 1)
+        mean = self.level + steps * self.trend
+        if self.seasonal_ready:
+            mean = mean + self.seasonal[(self.n + steps - 1) % self.season_length]
+        # h-step variance of the additive error-correction form
+        c = self.alpha * (1 + np.arange(1, horizon) * self.beta)
+        if self.seasonal_ready:
+            c = c + self.gamma * (np.arange(1, horizon) % self.season_length == 0)
+        variance = self.error_var * np.concatenate(([1.0], 1 + np.cumsum(c ** 2)))
+        spread = z * np.sqrt(variance)
+        return mean, mean - spread, mean + spread
@@ -0,0 +1,202 @@
+"""Streaming technical indicators with O(1) updates.
+
+`IndicatorState` keeps everything needed to advance the indicators of one
+series by a single observation:
+
+- SMA over a ring buffer with a running sum,
+- EMA accumulators for any number of periods,
+- RSI with Wilder's smoothing of gains and losses,
+- rolling volatility of log returns (windowed Welford over a ring buffer),
+- all-time Welford mean/variance of log returns and of the scraped 24h change.
+
+The state round-trips through `to_dict`/`from_dict` so it can be persisted
+and resumed after a restart without replaying history.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+
+class Welford:
+    """Running mean and variance (Welford's online algorithm)."""
+
+    def __init__(self, n: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.n, self.mean, self.m2 = n, mean, m2
+
+    def add(self, value: float) -> None:
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> Optional[float]:
+        return self.m2 / (self.n - 1) if self.n > 1 else None
+
+    @property
+    def std(self) -> Optional[float]:
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def to_dict(self) -> dict:
+        return {"n": self.n, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "Welford":
+        return cls(**data) if data else cls()
+
+
+class RollingWelford:
+    """Mean and variance over the last `window` values, kept in a ring buffer."""
+
+    def __init__(self, window: int, values: Iterable[float] = ()):
+        self.window = window
+        self.values: Deque[float] = deque(maxlen=window)
+        self.mean = 0.0
+        self.m2 = 0.0
+        for value in values:
+            self.add(value)
+
+    def add(self, value: float) -> None:
+        if len(self.values) < self.window:
+            self.values.append(value)
+            delta = value - self.mean
+            self.mean += delta / len(self.values)
+            self.m2 += delta * (value - self.mean)
+            return
+        # Replace the oldest value: windowed Welford update
+        old = self.values[0]
+        self.values.append(value)
+        old_mean = self.mean
+        self.mean += (value - old) / self.window
+        self.m2 += (value - old) * (value - self.mean + old - old_mean)
+        self.m2 = max(self.m2, 0.0)
+
+    @property
+    def std(self) -> Optional[float]:
+        n = len(self.values)
+        return math.sqrt(self.m2 / (n - 1)) if n > 1 else None
+
+
+class IndicatorState:
+    """Streaming SMA/EMA/RSI/volatility for one (source, symbol) series."""
+
+    def __init__(
+        self,
+        sma_period: int = 20,
+        ema_periods: Iterable[int] = (12, 26),
+        rsi_period: int = 14,
+        volatility_window: int = 30,
+    ):
+        self.sma_period = sma_period
+        self.rsi_period = rsi_period
+        self.window: Deque[float] = deque(maxlen=sma_period)
+        self.window_sum = 0.0
+        self.ema: Dict[int, Optional[float]] = {int(period): None for period in ema_periods}
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.rsi_samples = 0
+        self.returns = RollingWelford(volatility_window)
+        self.returns_all = Welford()
+        self.change24h = Welford()
+        self.last_price: Optional[float] = None
+        self.last_timestamp = None
+        self.count = 0
+
+    def update(self, price: float, timestamp=None, change24h: Optional[float] = None) -> None:
+        """Advance every indicator by one observation in constant time."""
+        # SMA: ring buffer + running sum
+        if len(self.window) == self.sma_period:
+            self.window_sum -= self.window[0]
+        self.window.append(price)
+        self.window_sum += price
+
+        # EMA accumulators
+        for period, value in self.ema.items():
+            alpha = 2.0 / (period + 1)
+            self.ema[period] = price if value is None else value + alpha * (price - value)
+
+        if self.last_price is not None and self.last_price > 0:
+            change = price - self.last_price
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            # RSI: simple average for the first period, Wilder's smoothing afterwards
+            self.rsi_samples += 1
+            weight = 1.0 / min(self.rsi_samples, self.rsi_period)
+            self.avg_gain += (gain - self.avg_gain) * weight
+            self.avg_loss += (loss - self.avg_loss) * weight
+
+            log_return = math.log(price / self.last_price)
+            self.returns.add(log_return)
+            self.returns_all.add(log_return)
+
+        if change24h is not None:
+            self.change24h.add(change24h)
+
+        self.last_price = price
+        self.last_timestamp = timestamp
+        self.count += 1
+
+    @property
+    def rsi(self) -> Optional[float]:
+        if self.rsi_samples < self.rsi_period:
+            return None
+        if self.avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+    def values(self) -> dict:
+        """Current indicator values."""
+        return {
+            "price": self.last_price,
+            "timestamp": self.last_timestamp.isoformat() if hasattr(self.last_timestamp, "isoformat") else self.last_timestamp,
+            "observations": self.count,
+            f"sma{self.sma_period}": self.window_sum / len(self.window) if len(self.window) == self.sma_period else None,
+            **{f"ema{period}": value for period, value in self.ema.items()},
+            f"rsi{self.rsi_period}": self.rsi,
+            "volatility": self.returns.std,
+            "volatilityAllTime": self.returns_all.std,
+            "change24hMean": self.change24h.mean if self.change24h.n else None,
+            "change24hStd": self.change24h.std,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "sma_period": self.sma_period,
+            "rsi_period": self.rsi_period,
+            "window": list(self.window),
+            "ema": {str(period): value for period, value in self.ema.items()},
+            "avg_gain": self.avg_gain,
+            "avg_loss": self.avg_loss,
+            "rsi_samples": self.rsi_samples,
+            "volatility_window": self.returns.window,
+            "returns": list(self.returns.values),
+            "returns_all": self.returns_all.to_dict(),
+            "change24h": self.change24h.to_dict(),
+            "last_price": self.last_price,
+            "last_timestamp": self.last_timestamp,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndicatorState":
+        state = cls(
+            sma_period=data["sma_period"],
+            ema_periods=[int(period) for period in data["ema"]],
+            rsi_period=data["rsi_period"],
+            volatility_window=data["volatility_window"],
+        )
+        state.window.extend(data["window"])
+        state.window_sum = sum(state.window)
+        state.ema = {int(period): value for period, value in data["ema"].items()}
+        state.avg_gain, state.avg_loss = data["avg_gain"], data["avg_loss"]
+        state.rsi_samples = data["rsi_samples"]
+        state.returns = RollingWelford(data["volatility_window"], data["returns"])
+        state.returns_all = Welford.from_dict(data["returns_all"])
+        state.change24h = Welford.from_dict(data["change24h"])
+        state.last_price = data["last_price"]
+        state.last_timestamp = data["last_timestamp"]
+        state.count = data["count"]
+        return state
@@ -0,0 +1,226 @@
+"""Structured, queue-backed logging.
+
+`Console` and the entrypoints log through the `backscrap` logger. The calling
+thread (event loop, Playwright thread) only formats the message and puts the
+record on a bounded in-memory queue; a single listener thread writes it to
+stdout. A slow terminal or log collector therefore never stalls a request or
+a scrape. When the queue is full the record is dropped and counted in
+`log_records_dropped_total` instead of blocking the caller. Importing this
+module starts no thread: the entrypoints (the API lifespan, run.py,
+worker.py) call `start_logging()`, and records logged before wait in the queue.
+
+Output is one JSON object per line (`LOG_FORMAT=json`) or a plain text line
+(`LOG_FORMAT=text`, the default with DEV_MODE), filtered by `LOG_LEVEL`.
+Every record carries the correlation id of the context it was logged from:
+the job id inside a scrape job, or the `X-Request-Id` of an API request
+(generated when missing and echoed in the response). Extra structured fields
+are passed with `log_event(level, message, **fields)`.
+
+Repetitive per-item errors (a malformed table row on every scrape) go through
+`log_sampled`, which logs the first occurrence of a key and then one in
+`LOG_SAMPLE_EVERY`, with the running count in `occurrences`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+from typing import Iterator, Optional
+
+from backscrap.app.utils.config import LOG_FORMAT, LOG_LEVEL, LOG_QUEUE_SIZE, LOG_SAMPLE_EVERY
+from backscrap.app.utils.metrics import LOGS_DROPPED
+
+logger = logging.getLogger("backscrap")
+
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+
+def get_correlation_id() -> Optional[str]:
+    return _correlation_id.get()
+
+
+@contextmanager
+def correlation(value: Optional[str]) -> Iterator[None]:
+    """Tag every record logged inside the block (and the tasks it creates) with `value`."""
+    token = _correlation_id.set(value)
+    try:
+        yield
+    finally:
+        _correlation_id.reset(token)
+
+
+def level_number(name: str) -> int:
+    """`"INFO"` -> `logging.INFO`; unknown names fall back to INFO."""
+    value = logging.getLevelName(name.upper())
+    return value if isinstance(value, int) else logging.INFO
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Puts records on the queue from the calling thread; drops them when the queue is full."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message and traceback here: the arguments may change before the listener runs
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.correlationId = _correlation_id.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOGS_DROPPED.inc()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, caller, message, correlationId and extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "caller": f"{record.module}:{record.lineno}",
+            "message": record.getMessage(),
+        }
+        correlation_id = getattr(record, "correlationId", None)
+        if correlation_id:
+            entry["correlationId"] = correlation_id
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """`time LEVEL [correlation id] message key=value ...`, for reading logs in a terminal."""
+
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)s %(message)s")
+
+    def formatMessage(self, record: logging.LogRecord) -> str:  # noqa: N802
+        line = super().formatMessage(record)
+        correlation_id = getattr(record, "correlationId", None)
+        if correlation_id:
+            line = line.replace(f" {record.levelname} ", f" {record.levelname} [{correlation_id}] ", 1)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=max(1, LOG_QUEUE_SIZE))
+_writer = logging.StreamHandler(sys.stdout)
+_writer.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+_listener = QueueListener(_queue, _writer)
+_listener_lock = Lock()
+_listening = False
+
+logger.addHandler(_NonBlockingQueueHandler(_queue))
+logger.setLevel(level_number(LOG_LEVEL))
+# Records are not handed to the root logger (run.py writes its ERROR records synchronously to run.log)
+logger.propagate = False
+
+
+def start_logging() -> None:
+    """
+    Start the writer thread (idempotent), called by the entrypoints. Records logged
+    before are kept in the queue; the queued records are written at exit.
+    """
+    global _listening
+    with _listener_lock:
+        if not _listening:
+            _listener.start()
+            _listening = True
+            atexit.unregister(stop_logging)
+            atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Write the queued records and stop the writer thread (idempotent)."""
+    global _listening
+    with _listener_lock:
+        if _listening:
+            _listener.stop()
+            _listening = False
+
+
+
+def log_event(level: int, message: str, **fields) -> None:
+    """Log `message` with structured `fields` (JSON keys, or `key=value` in text output)."""
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"fields": fields}, stacklevel=2)
+
+
+class LogSampler:
+    """Counts occurrences per key; lets the first one through, then one in `every`."""
+
+    def __init__(self, every: int) -> None:
+        self.every = max(1, every)
+        self._counts: Counter = Counter()
+        self._lock = Lock()
+
+    def hit(self, key: str) -> Optional[int]:
+        """Running count of `key` when this occurrence should be logged, else None."""
+        with self._lock:
+            self._counts[key] += 1
+            count = self._counts[key]
+        return count if count == 1 or count % self.every == 0 else None
+
+
+_sampler = LogSampler(LOG_SAMPLE_EVERY)
+
+
+def log_sampled(level: int, key: str, message: str, **fields) -> None:
+    """
+    Log a repetitive error sampled by `key`, which must have few distinct
+    values (e.g. the source, not the row number).
+    """
+    if not logger.isEnabledFor(level):
+        return
+    count = _sampler.hit(key)
+    if count is not None:
+        logger.log(level, message, extra={"fields": {**fields, "sampleKey": key, "occurrences": count}}, stacklevel=2)
+
+
+class CorrelationIdMiddleware:
+    """ASGI middleware tagging the records of each request with its `X-Request-Id`."""
+
+    HEADER = b"x-request-id"
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = next(
+            (value.decode("latin-1")[:64] for name, value in scope.get("headers", ()) if name == self.HEADER),
+            None,
+        ) or uuid.uuid4().hex[:16]
+
+        async def send_with_id(message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), (self.HEADER, request_id.encode())]}
+            await send(message)
+
+        with correlation(request_id):
+            await self.app(scope, receive, send_with_id if scope["type"] == "http" else send)
@@ -0,0 +1,189 @@
+"""Metrics exposed in the Prometheus text format, on top of `prometheus_client`.
+
+The API serves them on `/metrics` and standalone workers on `--metrics-port`.
+Label sets are kept small on purpose: routes are recorded by their template
+(`/api/scraping/jobs/{job_id}`), never by the concrete path.
+
+Metrics:
+
+- `scrape_stage_seconds{source,stage}`          browser, goto, ready, extract,
+  parse, scrape, save, ingest, broadcast, plus queueWait and total per job,
+- `http_request_duration_seconds{method,route,status}`,
+- `http_response_size_bytes{method,route}`,
+- `mongo_command_duration_seconds{command,collection,outcome}`,
+- `log_records_dropped_total`                  log records dropped on a full
+  logging queue (see `utils.logger`).
+
+Several API worker processes (`run.py --workers N`) share one port, so any
+of them may answer a scrape. run.py then sets `PROMETHEUS_MULTIPROC_DIR`
+before the workers start, `prometheus_client` keeps every process's values
+in `<dir>/<type>_<pid>.db` and `render_metrics` adds them all up. A worker
+that starts (uvicorn also respawns crashed ones) removes the files of dead
+processes with `prune_dead_processes`, so the directory holds live workers
+only; Prometheus sees their totals drop as a counter reset.
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Mapping, Optional, Tuple
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST as CONTENT_TYPE
+from prometheus_client import multiprocess
+
+# Seconds: request latencies sit at the low end, browser stages at the high end
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SCRAPE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+SCRAPE_STAGE_SECONDS = Histogram(
+    "scrape_stage_seconds",
+    "Seconds spent in each stage of a scrape, per source.",
+    ("source", "stage"),
+    buckets=SCRAPE_BUCKETS,
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "API request latency until the response is complete, per route template.",
+    ("method", "route", "status"),
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes",
+    "API response body size, per route template.",
+    ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency as reported by the driver.",
+    ("command", "collection", "outcome"),
+    buckets=LATENCY_BUCKETS,
+)
+LOGS_DROPPED = Counter(
+    "log_records_dropped",
+    "Log records dropped because the logging queue was full.",
+)
+
+
+def observe_stages(source: str, timings: Mapping[str, float]) -> None:
+    """Record a `utils.timing.stage` dict in `scrape_stage_seconds`."""
+    for name, seconds in timings.items():
+        SCRAPE_STAGE_SECONDS.labels(source=source, stage=name).observe(seconds)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency and response size of every HTTP request.
+
+    Server-sent event streams are skipped: their "latency" is the lifetime of
+    the connection. WebSockets are not HTTP requests and are not recorded.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response = {"status": 500, "size": 0, "stream": False}
+
+        async def send_and_measure(message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["stream"] = any(
+                    name == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in message.get("headers", ())
+                )
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            if not response["stream"]:
+                # The router stores the matched route in the scope; unmatched paths share one label
+                route = getattr(scope.get("route"), "path", None) or "unmatched"
+                method = scope["method"]
+                HTTP_REQUEST_SECONDS.labels(method=method, route=route, status=response["status"]).observe(
+                    time.perf_counter() - started
+                )
+                HTTP_RESPONSE_BYTES.labels(method=method, route=route).observe(response["size"])
+
+
+def render_metrics(directory: Optional[str] = None) -> str:
+    """Text exposition of this process, or of every process writing to `directory` when it is set."""
+    if not directory:
+        return generate_latest(REGISTRY).decode()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=directory)
+    return generate_latest(registry).decode()
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def prune_dead_processes(directory: str) -> None:
+    """Remove the `<type>_<pid>.db` files of processes that are no longer running."""
+    for path in glob.glob(os.path.join(directory, "*.db")):
+        pid = os.path.basename(path)[: -len(".db")].rsplit("_", 1)[-1]
+        if pid.isdigit() and not _is_alive(int(pid)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Path prefix -> handler(rest of the path) returning (content type, body), or None for 404
+ExtraRoutes = Mapping[str, Callable[[str], Optional[Tuple[str, str]]]]
+
+
+def _handler(routes: ExtraRoutes):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            path = self.path.split("?", 1)[0]
+            found: Optional[Tuple[str, str]] = (CONTENT_TYPE, render_metrics())
+            for prefix, route in routes.items():
+                if path == prefix or path.startswith(prefix + "/"):
+                    found = route(path[len(prefix):])
+                    break
+            if found is None:
+                self.send_error(404)
+                return
+            body = found[1].encode()
+            self.send_response(200)
+            self.send_header("Content-Type", found[0])
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:  # noqa: A002
+            return None
+
+    return MetricsHandler
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0", routes: Optional[ExtraRoutes] = None) -> ThreadingHTTPServer:
+    """
+    Serve `REGISTRY` on http://host:port/ from a daemon thread (processes without
+    the API), plus the `routes` given by the caller.
+    """
+    server = ThreadingHTTPServer((host, port), _handler(routes or {}))
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
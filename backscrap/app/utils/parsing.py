@@ -0,0 +1,56 @@
+"""Parsing helpers for scraped records.
+
+Scrapers store every field as a cleaned string (e.g. "+1.25", "64123.5").
+These helpers turn them into floats with the same rules the observatory
+applies in `clean_data`: strip `+ $ , %` and treat anything unparsable as
+missing. `canonical_symbol` gives the key used to match the same coin
+across sources.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+_STRIP_CHARS = re.compile(r"[+$,%\s]")
+
+# Symbols that some sources publish under a legacy or alternative ticker.
+DEFAULT_SYMBOL_ALIASES: Dict[str, str] = {
+    "XBT": "BTC",
+    "MIOTA": "IOTA",
+    "BCHABC": "BCH",
+    "BCHSV": "BSV",
+}
+
+
+def to_float(value: Any) -> Optional[float]:
+    """Parse a scraped numeric field; return None when it is missing or invalid."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        text = _STRIP_CHARS.sub("", str(value))
+        if not text:
+            return None
+        try:
+            number = float(text)
+        except ValueError:
+            return None
+    return number if math.isfinite(number) else None
+
+
+def iter_prices(records: Iterable[dict]) -> Iterator[Tuple[str, float]]:
+    """Yield `(symbol, price)` for every record with a symbol and a positive price."""
+    for record in records:
+        symbol = str(record.get("symbol") or "").strip()
+        price = to_float(record.get("price"))
+        if symbol and price is not None and price > 0:
+            yield symbol, price
+
+
+def canonical_symbol(symbol: str, aliases: Optional[Dict[str, str]] = None) -> str:
+    """Return the cross-source key for a raw ticker (upper-cased, aliases resolved)."""
+    key = symbol.strip().upper()
+    return (DEFAULT_SYMBOL_ALIASES if aliases is None else aliases).get(key, key)
@@ -0,0 +1,279 @@
+"""Opt-in sampling profiler for API requests and scrape jobs.
+
+Gated by `PROFILING_ENABLED` (defaults to `DEV_MODE`). When enabled, a request
+is profiled if it carries `X-Profile: 1` (the response then has
+`X-Profile-Id`), and a scrape job if it was queued with `profile=true`.
+
+While a profile runs, a sampler thread records the stack of the event-loop
+thread every `PROFILE_SAMPLE_INTERVAL_MS`, plus the stacks of the threads
+that joined the profile (`joining_profile`, used for the Playwright scrape
+thread). A sampler is used instead of cProfile because cProfile only sees
+the thread that enabled it and attributes nothing to suspended coroutines.
+Time spent awaiting shows up as the event loop waiting in `select`. The
+event loop is shared, so a profile also contains whatever concurrent
+requests ran on it.
+
+Sampling stops after `PROFILE_MAX_SECONDS` or `PROFILE_MAX_SAMPLES`, whichever
+comes first (the profile is then marked `truncated`). Requests answered with a
+`text/event-stream` response are not profiled: their sampling is discarded as
+soon as the stream starts. The sampler thread stores its own profile when it
+exits, so finishing a profile never blocks the event loop on a thread join.
+
+The last `PROFILE_HISTORY_SIZE` profiles are kept in memory per process as
+folded stacks (`thread;frame;...;frame count` per line), the input format
+of flamegraph.pl, inferno and speedscope.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from threading import Lock
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+from backscrap.app.utils.config import (
+    PROFILE_HISTORY_SIZE,
+    PROFILE_MAX_SAMPLES,
+    PROFILE_MAX_SECONDS,
+    PROFILE_SAMPLE_INTERVAL_MS,
+    PROFILING_ENABLED,
+)
+
+# Deeper stacks are cut at the root side
+MAX_STACK_DEPTH = 128
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_ROOT):
+        filename = os.path.relpath(filename, _ROOT)
+    else:
+        filename = "/".join(filename.split(os.sep)[-2:])
+    # `;` separates frames in the folded format
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _fold(thread_name: str, frame) -> str:
+    labels: List[str] = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name.replace(";", ":"))
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """
+    Background thread that counts the folded stacks of a set of threads, for at
+    most `max_seconds` and `max_samples`. When it exits it calls `on_done(self)`
+    from its own thread, unless the profile was discarded.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        max_seconds: float = PROFILE_MAX_SECONDS,
+        max_samples: int = PROFILE_MAX_SAMPLES,
+        on_done: Optional[Callable[["StackSampler"], None]] = None,
+    ) -> None:
+        self.interval = interval_seconds
+        self.max_seconds = max_seconds
+        self.max_samples = max_samples
+        self.on_done = on_done
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.seconds = 0.0
+        self.truncated = False
+        self._discarded = False
+        self._threads: Dict[int, str] = {}
+        self._lock = Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_thread(self, ident: int, name: str) -> None:
+        with self._lock:
+            self._threads[ident] = name
+
+    def remove_thread(self, ident: int) -> None:
+        with self._lock:
+            self._threads.pop(ident, None)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the sampler to finish; returns at once (the thread exits within one interval)."""
+        self._stop.set()
+
+    def discard(self) -> None:
+        """Stop without calling `on_done`."""
+        self._discarded = True
+        self._stop.set()
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            if self.samples >= self.max_samples or time.perf_counter() - started >= self.max_seconds:
+                self.truncated = True
+                break
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+            for ident, name in threads:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[_fold(name, frame)] += 1
+            self.samples += 1
+        self.seconds = time.perf_counter() - started
+        if self.on_done is not None and not self._discarded:
+            self.on_done(self)
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """The last `max_profiles` profiles of this process, oldest evicted first."""
+
+    def __init__(self, max_profiles: int) -> None:
+        self._profiles: Deque[dict] = deque(maxlen=max_profiles)
+        self._lock = Lock()
+
+    def add(self, profile: dict) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def list(self) -> List[dict]:
+        """Profile summaries, newest first (without their stacks)."""
+        with self._lock:
+            profiles = list(self._profiles)
+        return [{key: value for key, value in profile.items() if key != "folded"} for profile in reversed(profiles)]
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        with self._lock:
+            return next((profile for profile in self._profiles if profile["id"] == profile_id), None)
+
+
+profile_store = ProfileStore(PROFILE_HISTORY_SIZE)
+_active_sampler: ContextVar[Optional[StackSampler]] = ContextVar("active_sampler", default=None)
+
+
+@contextmanager
+def profile(kind: str, name: str, enabled: bool = True) -> Iterator[Optional[dict]]:
+    """
+    Sample the calling thread while the block runs and store the profile.
+
+    Yields `{"id", "name"}` of the profile being recorded, or None when
+    profiling is disabled or not requested.
+    """
+    if not (enabled and PROFILING_ENABLED):
+        yield None
+        return
+
+    info = {"id": uuid.uuid4().hex, "name": name}
+    started_at = datetime.now()
+
+    def store(sampler: StackSampler) -> None:
+        profile_store.add({
+            "id": info["id"],
+            "kind": kind,
+            "name": info["name"],
+            "startedAt": started_at.isoformat(),
+            "seconds": round(sampler.seconds, 4),
+            "samples": sampler.samples,
+            "intervalMs": PROFILE_SAMPLE_INTERVAL_MS,
+            "truncated": sampler.truncated,
+            "folded": sampler.folded(),
+        })
+
+    sampler = StackSampler(PROFILE_SAMPLE_INTERVAL_MS / 1000, on_done=store)
+    sampler.add_thread(threading.get_ident(), threading.current_thread().name)
+    token = _active_sampler.set(sampler)
+    sampler.start()
+    try:
+        yield info
+    finally:
+        sampler.stop()
+        _active_sampler.reset(token)
+
+
+def discard_profile() -> None:
+    """Stop the profile active in this context without storing it."""
+    sampler = _active_sampler.get()
+    if sampler is not None:
+        sampler.discard()
+
+
+def joining_profile(func: Callable) -> Callable:
+    """
+    Wrap `func` so the thread that runs it is sampled by the profile active
+    in the caller's context (contextvars don't reach `run_in_executor` threads).
+    Returns `func` unchanged when no profile is active.
+    """
+    sampler = _active_sampler.get()
+    if sampler is None:
+        return func
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        ident = threading.get_ident()
+        sampler.add_thread(ident, threading.current_thread().name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sampler.remove_thread(ident)
+
+    return run
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling the HTTP requests sent with `X-Profile: 1`.
+    Server-sent event streams are not profiled (see the module docstring).
+    """
+
+    HEADER = b"x-profile"
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    @classmethod
+    def _requested(cls, scope) -> bool:
+        return any(
+            name == cls.HEADER and value.strip().lower() in (b"1", b"true", b"yes")
+            for name, value in scope.get("headers", ())
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        if not PROFILING_ENABLED or scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        query = scope.get("query_string", b"").decode("latin-1")
+        name = f"{scope['method']} {scope['path']}" + (f"?{query}" if query else "")
+        with profile("request", name) as info:
+
+            async def send_with_id(message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", ()))
+                    if any(
+                        name == b"content-type" and value.startswith(b"text/event-stream") for name, value in headers
+                    ):
+                        discard_profile()
+                    else:
+                        headers.append((b"x-profile-id", info["id"].encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_id)
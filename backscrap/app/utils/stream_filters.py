@@ -0,0 +1,192 @@
+"""Server-side filtering and batching of broadcaster events for WebSocket clients.
+
+Each event type maps to a broadcaster channel. `EventFilter.apply` trims a
+decoded payload down to the symbols/sources a client asked for, returning
+None when nothing is left, so clients only receive (and parse) what they
+watch. Payloads are decoded once per message for all clients through a small
+LRU keyed by the message string.
+
+`StreamSession` drives one WebSocket: a hub subscription per requested event
+type feeds a bounded pending buffer that is sent as a single JSON frame every
+flush interval (nothing is sent while there is nothing new).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, Iterable, Optional, Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from backscrap.app.pojo.enums.enumslist import ListaCanales
+from backscrap.app.utils.config import WS_FLUSH_MS, WS_MAX_PENDING_EVENTS
+from backscrap.app.utils.fanout import hub
+from backscrap.app.utils.parsing import canonical_symbol
+
+# Bounds for the flush interval a client may request
+MIN_FLUSH_MS = 50
+MAX_FLUSH_MS = 10_000
+
+# Public event type -> broadcaster channel
+EVENT_CHANNELS: Dict[str, str] = {
+    "status": ListaCanales.ScrapingEvents.value,
+    "price": ListaCanales.PriceDeltas.value,
+    "consolidated": ListaCanales.ConsolidationEvents.value,
+    "anomaly": ListaCanales.AnomalyEvents.value,
+}
+
+
+@lru_cache(maxsize=512)
+def decode(message: str) -> Optional[dict]:
+    """Decode a broadcaster message once for every subscriber (treat the result as read-only)."""
+    try:
+        payload = json.loads(message)
+    except (TypeError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+class EventFilter:
+    """Symbols, sources and event types requested by one client (empty = everything)."""
+
+    def __init__(self, symbols: Iterable[str] = (), sources: Iterable[str] = (), types: Iterable[str] = ()):
+        self.symbols: Set[str] = {canonical_symbol(symbol) for symbol in symbols if symbol}
+        self.sources: Set[str] = {source for source in sources if source}
+        unknown = set(types) - set(EVENT_CHANNELS)
+        if unknown:
+            raise ValueError(f"Unknown event type(s): {', '.join(sorted(unknown))}")
+        self.types: Set[str] = set(types) or set(EVENT_CHANNELS)
+
+    def describe(self) -> dict:
+        return {"symbols": sorted(self.symbols), "sources": sorted(self.sources), "types": sorted(self.types)}
+
+    def _wants_symbol(self, symbol: Optional[str]) -> bool:
+        # Source-level events (no symbol) are always of interest
+        return not self.symbols or symbol is None or canonical_symbol(symbol) in self.symbols
+
+    def apply(self, event_type: str, payload: dict) -> Optional[dict]:
+        """Return the part of `payload` this client wants, or None to skip it."""
+        if event_type not in self.types:
+            return None
+        if self.sources and payload.get("source") not in self.sources:
+            return None
+
+        if event_type == "price":
+            quotes = [quote for quote in payload.get("quotes", []) if self._wants_symbol(quote[0])]
+            removed = [symbol for symbol in payload.get("removed", []) if self._wants_symbol(symbol)]
+            if not quotes and not removed:
+                return None
+            return {**payload, "quotes": quotes, "removed": removed}
+
+        if event_type == "consolidated":
+            rows = [row for row in payload.get("symbols", []) if self._wants_symbol(row.get("symbol"))]
+            return {**payload, "symbols": rows} if rows else None
+
+        return payload if self._wants_symbol(payload.get("symbol")) else None
+
+
+def _as_list(value) -> list:
+    """Accept either a JSON list or a comma separated string."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return [str(item) for item in value]
+
+
+class StreamSession:
+    """One WebSocket client: filtered hub subscriptions plus a batched sender."""
+
+    def __init__(self, websocket: WebSocket, event_filter: EventFilter, flush_ms: int = WS_FLUSH_MS,
+                 max_pending: int = WS_MAX_PENDING_EVENTS):
+        self.websocket = websocket
+        self.filter = event_filter
+        self.flush_seconds = self._clamp_flush(flush_ms) / 1000
+        self.dropped = 0
+        self._pending: Deque[dict] = deque(maxlen=max_pending)
+        self._readers: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _clamp_flush(flush_ms) -> int:
+        return max(MIN_FLUSH_MS, min(MAX_FLUSH_MS, int(flush_ms)))
+
+    @classmethod
+    def parse_filter(cls, request: dict) -> EventFilter:
+        return EventFilter(_as_list(request.get("symbols")), _as_list(request.get("sources")), _as_list(request.get("types")))
+
+    async def _read(self, event_type: str) -> None:
+        async with hub.subscribe(EVENT_CHANNELS[event_type]) as subscription:
+            async for message in subscription:
+                payload = decode(message)
+                if payload is None:
+                    continue
+                filtered = self.filter.apply(event_type, payload)
+                if filtered is None:
+                    continue
+                if len(self._pending) == self._pending.maxlen:
+                    self.dropped += 1
+                self._pending.append({"type": event_type, "data": filtered})
+
+    def _sync_readers(self) -> None:
+        """Start/stop hub subscriptions so they match the requested event types."""
+        for event_type in set(self._readers) - self.filter.types:
+            self._readers.pop(event_type).cancel()
+        for event_type in self.filter.types - set(self._readers):
+            self._readers[event_type] = asyncio.create_task(self._read(event_type))
+
+    async def _send(self, frame: dict) -> None:
+        await self.websocket.send_text(json.dumps(frame, separators=(",", ":")))
+
+    async def _subscribed(self) -> None:
+        await self._send({"type": "subscribed", **self.filter.describe(), "flushMs": round(self.flush_seconds * 1000)})
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            if not self._pending:
+                continue
+            events = list(self._pending)
+            self._pending.clear()
+            frame = {"type": "batch", "events": events}
+            if self.dropped:
+                frame["dropped"], self.dropped = self.dropped, 0
+            await self._send(frame)
+
+    async def _handle(self, request) -> None:
+        """Control message: `{"action": "subscribe", "symbols": [...], "sources": [...], "types": [...], "flushMs": 250}`."""
+        if not isinstance(request, dict) or request.get("action") != "subscribe":
+            await self._send({"type": "error", "message": "Expected {\"action\": \"subscribe\", ...}"})
+            return
+        try:
+            self.filter = self.parse_filter(request)
+            if request.get("flushMs") is not None:
+                self.flush_seconds = self._clamp_flush(request["flushMs"]) / 1000
+        except (TypeError, ValueError) as e:
+            await self._send({"type": "error", "message": str(e)})
+            return
+        self._sync_readers()
+        await self._subscribed()
+
+    async def run(self) -> None:
+        """Serve the client until it disconnects."""
+        self._sync_readers()
+        flusher = asyncio.create_task(self._flush_loop())
+        try:
+            await self._subscribed()
+            while True:
+                try:
+                    request = await self.websocket.receive_json()
+                except ValueError:
+                    await self._send({"type": "error", "message": "Control messages must be JSON."})
+                    continue
+                await self._handle(request)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            tasks = [flusher, *self._readers.values()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,22 @@
+"""Wall-clock timing of pipeline stages.
+
+`stage(timings, name)` adds the elapsed seconds of the block to
+`timings[name]`; passing `timings=None` makes it a no-op, so callers that
+don't care about timings pay nothing but a `perf_counter()` call.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+@contextmanager
+def stage(timings: Optional[Dict[str, float]], name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = round(timings.get(name, 0.0) + time.perf_counter() - started, 4)
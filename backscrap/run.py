@@ -1,15 +1,31 @@
-"""Uvicorn entrypoint (logic preserved).
+"""Uvicorn entrypoint.
 
 Starts the FastAPI app on host 0.0.0.0 and port 9000.
 Maintains error logging to a file and same observable behavior.
+
+Multi-worker mode: `python backscrap/run.py --workers 4` (or `API_WORKERS=4`)
+hands uvicorn the import string so each worker process builds its own app,
+Mongo client and broadcaster connection. Events only cross workers with a
+shared `BROADCAST_URL` (e.g. redis://localhost:6379/0); with the default
+memory:// backend each worker only sees the events it published itself.
+Each worker writes its metrics to `PROMETHEUS_MULTIPROC_DIR` (a temporary
+directory unless set) so /metrics reports the totals of all of them.
 """
 
 from __future__ import annotations
 
+import argparse
+import glob
 import logging
+import os
+import tempfile
 
 import uvicorn
-from app.main import app  # Path kept identical to common project layouts
+
+# Path kept identical to common project layouts
+APP_IMPORT = "app.main:app"
+HOST = "0.0.0.0"
+PORT = 9000
 
 # File logging (same semantics as typical original script)
 logging.basicConfig(
@@ -19,9 +35,57 @@ logging.basicConfig(
 )
 
 
+def _logger() -> logging.Logger:
+    """The app's structured logger, imported on use so configuration errors still reach run.log."""
+    from backscrap.app.utils.logger import logger, start_logging
+
+    start_logging()
+    return logger
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Crypto Scraping API.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("API_WORKERS", "1")),
+        help="Number of uvicorn worker processes (default: API_WORKERS or 1).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    workers = max(1, _parse_args().workers)
+    if workers == 1:
+        from app.main import app
+
+        uvicorn.run(app, host=HOST, port=PORT)
+        return
+
+    if os.environ.get("BROADCAST_URL", "memory://").strip().startswith("memory://"):
+        _logger().warning(
+            "BROADCAST_URL is memory://, SSE/WebSocket clients will only receive "
+            "events published by the worker they are connected to."
+        )
+    # Inherited by the worker processes, which import the config (and prometheus_client) after this point
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR", "").strip()
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        # Values of a previous run (same pattern as utils.metrics.prune_dead_processes)
+        for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+            os.remove(path)
+    else:
+        metrics_dir = tempfile.mkdtemp(prefix="backscrap-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+    uvicorn.run(APP_IMPORT, host=HOST, port=PORT, workers=workers)
+
+
 if __name__ == "__main__":
     try:
-        uvicorn.run(app, host="0.0.0.0", port=9000)
+        main()
     except Exception as exc:  # noqa: BLE001
         logging.error("Application startup error: %s", exc)
-        print(f"An error occurred: {exc}")
+        try:
+            _logger().exception(f"An error occurred: {exc}")
+        except ValueError:
+            pass  # Missing configuration: the error is only in run.log
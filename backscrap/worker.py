@@ -0,0 +1,119 @@
+"""Standalone scrape worker entrypoint.
+
+Runs the `ScrappingService` scrapers outside the API: the worker claims jobs
+from the shared `scrape_jobs` collection (leases + heartbeats), so scraping
+scales across processes and machines while the API only queues jobs. Start
+the API with `JOB_EXECUTOR=workers`, then, from the repository root, one or
+more of:
+
+    python -m backscrap.worker --concurrency 2
+
+Workers and API must share `MONGO_DATABASE_URL` and a cross-process
+`BROADCAST_URL` (e.g. redis://localhost:6379/0) so the batches a worker
+stores reach the API's incremental engines and SSE clients.
+
+Scrape stage timings are recorded in the worker process; pass
+`--metrics-port 9100` (or `WORKER_METRICS_PORT`) to expose them to Prometheus.
+The same port serves the profiles of `profile=true` jobs run by this worker
+(`/profiles`, `/profiles/<id>`) when `PROFILING_ENABLED` is set.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+from typing import Optional, Tuple
+
+from backscrap.app.datasource.MongoManagerCriptoScrapping import MongoManagerCriptoScrapping
+from backscrap.app.repository.JobRepository import JobRepository
+from backscrap.app.repository.ScrappingRepository import ScrappingRepository
+from backscrap.app.services.ScrappingService import ScrappingService
+from backscrap.app.services.WorkerService import WorkerService
+from backscrap.app.utils.broadcaster import broadcast_backend, broadcast_shutdown, broadcast_startup, is_process_local
+from backscrap.app.utils.config import (
+    JOB_WORKERS,
+    PROFILING_ENABLED,
+    WARMUP_BROWSER,
+    WORKER_METRICS_PORT,
+    mongo_settings_summary,
+)
+from backscrap.app.utils.logger import logger, start_logging, stop_logging
+from backscrap.app.utils.metrics import start_metrics_server
+from backscrap.app.utils.profiling import profile_store
+
+logging.basicConfig(
+    filename="worker.log",
+    level=logging.ERROR,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a standalone scrape worker.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=JOB_WORKERS,
+        help="Concurrent scrapes (browsers) in this process (default: JOB_WORKERS).",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=WORKER_METRICS_PORT,
+        help="Serve Prometheus metrics on this port (default: WORKER_METRICS_PORT, 0 = off).",
+    )
+    return parser.parse_args()
+
+
+def _profiles(path: str) -> Optional[Tuple[str, str]]:
+    """Same answers as /api/admin/profiles[/<id>] on the API, for this worker's jobs."""
+    if not PROFILING_ENABLED:
+        return None
+    profile_id = path.strip("/")
+    if not profile_id:
+        return "application/json", json.dumps(profile_store.list())
+    stored = profile_store.get(profile_id)
+    return ("text/plain; charset=utf-8", stored["folded"]) if stored else None
+
+
+async def main() -> None:
+    args = _parse_args()
+    concurrency = max(1, args.concurrency)
+    logger.info(mongo_settings_summary())
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port, routes={"/profiles": _profiles})
+        logger.info(f"Metrics served on port {args.metrics_port}")
+    MongoManagerCriptoScrapping.getInstance()
+    await broadcast_startup()
+    logger.info(f"Broadcaster conectado: {broadcast_backend()} (pid {os.getpid()})")
+    if is_process_local():
+        logger.warning("BROADCAST_URL is memory://, stored batches and events will not reach the API.")
+    scrapping_service = ScrappingService(ScrappingRepository())
+    if WARMUP_BROWSER:
+        # The first job then doesn't pay the module imports and the cold browser start
+        try:
+            await scrapping_service.warm_up_browser()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"Browser warm-up failed: {exc}")
+    worker = WorkerService(JobRepository(), scrapping_service, concurrency=concurrency)
+    try:
+        await worker.run()
+    finally:
+        await broadcast_shutdown()
+
+
+if __name__ == "__main__":
+    start_logging()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Worker stopped.")
+    except Exception as exc:  # noqa: BLE001
+        logging.error("Worker error: %s", exc)
+        logger.exception(f"An error occurred: {exc}")
+    finally:
+        # Write out the queued log records before the process exits
+        stop_logging()
@@ -0,0 +1,154 @@
+"""Cross-worker event delivery check for multi-worker deployments.
+
+Starts the API with `--workers N` and a shared broadcaster backend, opens
+several SSE connections (the kernel spreads them over the workers), publishes
+M events straight into the pub/sub backend — exactly what the worker that ran
+a scrape does — and reports how many clients received every event.
+
+By default a local Redis stand-in (fakeredis TCP server) is used, so no
+Redis installation is needed; pass `--broadcast-url redis://host:6379/0` to
+test a real server. With `--broadcast-url memory://` the clients receive
+nothing, which is the single-process behavior the check guards against.
+
+Usage:
+    python benchmarks/broadcast_multiworker.py --workers 4 --clients 40 --events 20
+
+Requires `redis` (and `fakeredis` for the stand-in). MongoDB is not needed:
+engine warm-ups fail fast and are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CHANNEL = "scraping_events"
+
+
+def _start_stand_in(port: int):
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _start_api(workers: int, port: int, broadcast_url: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(ROOT), str(ROOT / "backscrap"), os.environ.get("PYTHONPATH", "")]),
+        "BROADCAST_URL": broadcast_url,
+        "MONGO_DATABASE_URL": os.environ.get("MONGO_DATABASE_URL", "mongodb://127.0.0.1:27017/?serverSelectionTimeoutMS=500"),
+        "MONGO_DATABASE_NAME": os.environ.get("MONGO_DATABASE_NAME", "benchmarks"),
+    }
+    command = [
+        sys.executable, "-m", "uvicorn", "backscrap.app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+    ]
+    return subprocess.Popen(command, env=env, cwd=ROOT, stdout=subprocess.DEVNULL)
+
+
+async def _publish(broadcast_url: str, events: int) -> None:
+    if broadcast_url.startswith("memory://"):
+        return  # Nothing outside the workers can reach an in-memory backend
+    import redis.asyncio as redis
+
+    client = redis.Redis.from_url(broadcast_url)
+    try:
+        for index in range(events):
+            message = {"status": "SUCCESS", "source": f"source-{index % 4}", "message": f"event {index}"}
+            await client.publish(CHANNEL, json.dumps(message))
+    finally:
+        await client.aclose()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    import httpx
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    received = [0] * args.clients
+    connected = 0
+
+    async with httpx.AsyncClient(timeout=None) as http:
+        deadline = time.perf_counter() + args.timeout
+        while time.perf_counter() < deadline:
+            try:
+                if (await http.get(f"{base_url}/health")).status_code == 200:
+                    break
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+
+        async def client(index: int) -> None:
+            nonlocal connected
+            # A fresh connection per client so they land on different workers
+            async with httpx.AsyncClient(timeout=None) as own:
+                async with own.stream("GET", f"{base_url}/api/events/status-stream") as response:
+                    connected += 1
+                    async for line in response.aiter_lines():
+                        if line.startswith("data:"):
+                            received[index] += 1
+                            if received[index] >= args.events:
+                                return
+
+        tasks = [asyncio.create_task(client(i)) for i in range(args.clients)]
+        while connected < args.clients and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(1.0)  # Let every worker finish subscribing its hub pump
+
+        started = time.perf_counter()
+        await _publish(args.broadcast_url, args.events)
+        await asyncio.wait(tasks, timeout=args.wait)
+        elapsed = time.perf_counter() - started
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {
+        "workers": args.workers,
+        "broadcastUrl": args.broadcast_url,
+        "clients": args.clients,
+        "connected": connected,
+        "events": args.events,
+        "clientsComplete": sum(1 for count in received if count >= args.events),
+        "eventsDelivered": sum(received),
+        "seconds": round(elapsed, 3),
+    }
+
+
+def main() -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--stand-in-port", type=int, default=6390)
+    parser.add_argument("--broadcast-url", default=None, help="Default: a local fakeredis stand-in.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for the API and the connections.")
+    parser.add_argument("--wait", type=float, default=10.0, help="Seconds to wait for the deliveries.")
+    args = parser.parse_args()
+
+    stand_in = None
+    if args.broadcast_url is None:
+        stand_in = _start_stand_in(args.stand_in_port)
+        args.broadcast_url = f"redis://127.0.0.1:{args.stand_in_port}/0"
+
+    api = _start_api(args.workers, args.port, args.broadcast_url)
+    try:
+        return asyncio.run(run(args))
+    finally:
+        api.terminate()
+        api.wait(timeout=30)
+        if stand_in is not None:
+            stand_in.shutdown()
+
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=2))
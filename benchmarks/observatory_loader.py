@@ -0,0 +1,117 @@
+"""Observatory loader benchmark: legacy per-record flattening vs. the columnar loader.
+
+Builds synthetic /api/scraping/results payloads (string-formatted numbers,
+ISO timestamps, `--coins` records per snapshot, two sources), then times:
+
+- `legacy`   — the previous `load_data` + `clean_data`: a nested loop that
+  mutates each record and calls `pd.to_datetime` per record, followed by
+  `astype(str).str.replace(...)` over the four numeric columns,
+- `columnar` — `observatory/loader.py::snapshots_to_frame`.
+
+Both outputs are compared before timings are reported.
+
+Usage:
+    python benchmarks/observatory_loader.py
+    python benchmarks/observatory_loader.py --rows 10000 100000 1000000 --coins 100 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "observatory"))
+
+from loader import NUMERIC_COLUMNS, snapshots_to_frame  # noqa: E402
+
+
+def legacy_load(raw_data: list) -> pd.DataFrame:
+    """The loader as it was before the columnar path (kept verbatim for comparison)."""
+    records = []
+    for entry in raw_data:
+        for d in entry["data"]:
+            d["source"] = entry["source"]
+            d["timestamp"] = pd.to_datetime(entry["timestamp"])
+            d["snapshotId"] = entry.get("id")
+            records.append(d)
+    if not records:
+        return pd.DataFrame()
+    df = pd.DataFrame(records)
+    for col in NUMERIC_COLUMNS:
+        df[col] = (
+            df[col]
+            .astype(str)
+            .str.replace(r"[+$,%]", "", regex=True)
+            .pipe(pd.to_numeric, errors="coerce")
+        )
+    return df
+
+
+def make_payload(rows: int, coins: int, seed: int = 7) -> list:
+    """Snapshot documents shaped like the API response, `coins` records each."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    base_prices = [rng.uniform(0.01, 60000) for _ in range(coins)]
+    payload = []
+    for index in range((rows + coins - 1) // coins):
+        records = []
+        for coin in range(min(coins, rows - index * coins)):
+            # Prices move in ticks, so many values repeat across snapshots
+            price = round(base_prices[coin] * (1 + rng.randint(-50, 50) / 10000), 2)
+            records.append({
+                "row": coin + 1,
+                "symbol": f"C{coin}",
+                "name": f"Coin {coin}",
+                "price": f"${price:,.2f}",
+                "change24h": f"{rng.randint(-900, 900) / 100:+.2f}%",
+                "volume24h": f"${rng.randint(1, 5000) * 1000:,}",
+                "marketCap": f"${int(base_prices[coin] * 1e6):,}",
+            })
+        payload.append({
+            "id": f"{index:024x}",
+            "source": "CoinGecko" if index % 2 else "Coinmarketcap",
+            "timestamp": (start + timedelta(minutes=2 * index)).isoformat(),
+            "data": records,
+        })
+    return payload
+
+
+def _time(loader: Callable[[list], pd.DataFrame], rows: int, coins: int, repeat: int) -> tuple:
+    best, frame = float("inf"), None
+    for _ in range(repeat):
+        payload = make_payload(rows, coins)  # Fresh copy: the legacy loader mutates records
+        started = time.perf_counter()
+        frame = loader(payload)
+        best = min(best, time.perf_counter() - started)
+    return best, frame
+
+
+def _same(legacy: pd.DataFrame, columnar: pd.DataFrame) -> bool:
+    columns = list(legacy.columns)
+    return legacy.shape == columnar.shape and legacy[columns].equals(columnar[columns])
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--coins", type=int, default=100, help="Records per snapshot (scrape depth).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size; the best time is reported.")
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} {'legacy s':>10} {'columnar s':>11} {'speedup':>8}  same")
+    for rows in args.rows:
+        legacy_s, legacy = _time(legacy_load, rows, args.coins, args.repeat)
+        columnar_s, columnar = _time(snapshots_to_frame, rows, args.coins, args.repeat)
+        print(f"{rows:>10} {legacy_s:>10.3f} {columnar_s:>11.3f} {legacy_s / columnar_s:>7.1f}x  {_same(legacy, columnar)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Load test for the SSE fan-out hub.
+
+Two modes:
+
+- `hub`  (default) — N in-process subscribers on the shared hub, a fraction of
+  them deliberately slow; measures publish/deliver throughput and the drop
+  counters of the chosen overflow policy.
+- `http` — starts uvicorn on a local port with only the events router and
+  opens N concurrent SSE connections with httpx, then publishes M events and
+  waits until every client received them (or the timeout expires).
+
+Usage:
+    python benchmarks/sse_fanout_load.py --clients 2000 --events 200
+    python benchmarks/sse_fanout_load.py --mode http --clients 2000 --events 50
+
+No MongoDB is needed; the required environment variables get dummy defaults.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("MONGO_DATABASE_URL", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DATABASE_NAME", "benchmarks")
+
+from backscrap.app.pojo.enums.enumslist import ListaCanales  # noqa: E402
+from backscrap.app.utils.broadcaster import broadcast_shutdown, broadcast_startup, broadcaster  # noqa: E402
+from backscrap.app.utils.fanout import FanoutHub, OverflowPolicy  # noqa: E402
+
+CHANNEL = ListaCanales.ScrapingEvents.value
+
+
+def _raise_fd_limit(needed: int) -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = min(hard, max(soft, needed))
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def _message(index: int) -> str:
+    return json.dumps({"status": "SUCCESS", "source": f"source-{index % 4}", "message": f"event {index}"})
+
+
+async def run_hub(clients: int, events: int, slow_ratio: float, policy: OverflowPolicy, queue_size: int) -> dict:
+    hub = FanoutHub(broadcaster, queue_size=queue_size, policy=policy)
+    slow_clients = int(clients * slow_ratio)
+    received = [0] * clients
+    done = asyncio.Event()
+    # Set once every consumer subscribed (asyncio.Barrier needs Python 3.11)
+    ready = asyncio.Event()
+    subscribed = [0]
+
+    async def consumer(index: int) -> None:
+        async with hub.subscribe(CHANNEL) as subscription:
+            subscribed[0] += 1
+            if subscribed[0] == clients:
+                ready.set()
+            await ready.wait()
+            async for _ in subscription:
+                received[index] += 1
+                if index < slow_clients:
+                    await asyncio.sleep(0.01)
+                if done.is_set() and subscription.depth == 0:
+                    return
+
+    tasks = [asyncio.create_task(consumer(i)) for i in range(clients)]
+    await ready.wait()
+
+    started = time.perf_counter()
+    for i in range(events):
+        await broadcaster.publish(channel=CHANNEL, message=_message(i))
+        if i % 50 == 0:
+            await asyncio.sleep(0)
+    publish_seconds = time.perf_counter() - started
+
+    # Let fast consumers drain, then collect stats while slow ones still lag
+    while sum(1 for i in range(slow_clients, clients) if received[i] < events) and time.perf_counter() - started < 30:
+        await asyncio.sleep(0.01)
+    drain_seconds = time.perf_counter() - started
+    stats = hub.stats()
+
+    done.set()
+    await broadcaster.publish(channel=CHANNEL, message=_message(events))
+    await asyncio.sleep(0.1)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await hub.close()
+
+    fast = received[slow_clients:]
+    return {
+        "mode": "hub",
+        "clients": clients,
+        "slowClients": slow_clients,
+        "events": events,
+        "policy": policy.value,
+        "queueSize": queue_size,
+        "publishSeconds": round(publish_seconds, 4),
+        "fastDrainSeconds": round(drain_seconds, 4),
+        "deliveriesPerSecond": round(sum(fast) / drain_seconds, 1) if drain_seconds else None,
+        "fastClientsComplete": sum(1 for count in fast if count >= events),
+        "hub": stats["channels"].get(CHANNEL, {}),
+    }
+
+
+async def run_http(clients: int, events: int, port: int, timeout: float) -> dict:
+    import httpx
+    import uvicorn
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI
+
+    from backscrap.app.controller.ServerEventsController import router
+    from backscrap.app.utils.fanout import hub
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        yield
+        await hub.close()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(router)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", backlog=clients))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    received = [0] * clients
+    connected = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=0)
+
+    async def client(index: int, http: httpx.AsyncClient) -> None:
+        nonlocal connected
+        async with http.stream("GET", f"http://127.0.0.1:{port}/api/events/status-stream") as response:
+            connected += 1
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    received[index] += 1
+                    if received[index] >= events:
+                        return
+
+    async with httpx.AsyncClient(limits=limits, timeout=None) as http:
+        connect_started = time.perf_counter()
+        tasks = [asyncio.create_task(client(i, http)) for i in range(clients)]
+        while hub.stats()["subscribers"] < clients and time.perf_counter() - connect_started < timeout:
+            await asyncio.sleep(0.05)
+        connect_seconds = time.perf_counter() - connect_started
+
+        started = time.perf_counter()
+        for i in range(events):
+            await broadcaster.publish(channel=CHANNEL, message=_message(i))
+        await asyncio.wait(tasks, timeout=timeout)
+        deliver_seconds = time.perf_counter() - started
+        stats = hub.stats()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    server.should_exit = True
+    await server_task
+    return {
+        "mode": "http",
+        "clients": clients,
+        "connected": connected,
+        "events": events,
+        "connectSeconds": round(connect_seconds, 3),
+        "deliverSeconds": round(deliver_seconds, 3),
+        "eventsDelivered": sum(received),
+        "eventsPerSecond": round(sum(received) / deliver_seconds, 1) if deliver_seconds else None,
+        "clientsComplete": sum(1 for count in received if count >= events),
+        "hub": stats["channels"].get(CHANNEL, {}),
+    }
+
+
+async def main(args: argparse.Namespace) -> dict:
+    await broadcast_startup()
+    try:
+        if args.mode == "http":
+            return await run_http(args.clients, args.events, args.port, args.timeout)
+        return await run_hub(args.clients, args.events, args.slow_ratio, OverflowPolicy(args.policy), args.queue_size)
+    finally:
+        await broadcast_shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("hub", "http"), default="hub")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--slow-ratio", type=float, default=0.05, help="Fraction of deliberately slow clients (hub mode).")
+    parser.add_argument("--policy", choices=[p.value for p in OverflowPolicy], default=OverflowPolicy.DROP_OLDEST.value)
+    parser.add_argument("--queue-size", type=int, default=100)
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    arguments = parser.parse_args()
+    _raise_fd_limit(arguments.clients * 2 + 256)
+    print(json.dumps(asyncio.run(main(arguments)), indent=2))
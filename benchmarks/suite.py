@@ -0,0 +1,407 @@
+"""End-to-end benchmark suite: storage, API, event fan-out and observatory.
+
+Runs offline. The storage and API benchmarks use the MongoDB at `--mongo-url`
+(a throwaway database, dropped afterwards) or, by default, an in-process
+mongomock-motor stand-in, so no mongod is needed. Absolute numbers of the
+stand-in are not comparable with a real server; compare runs of the same kind.
+
+Benchmarks (`--only` picks a subset):
+
+- `storage`     — `ScrappingRepository.save_scrapping_results` throughput
+  (batches and records per second, `--batches` batches of `--coins` records),
+- `results`     — `/api/scraping/results` latency (p50/p95), response size and
+  peak Python memory of one request at growing collection sizes (`--sizes`),
+  for the full history, an incremental `since` request and a one-day window
+  filtered to two symbols,
+- `fanout`      — SSE fan-out hub: N in-process subscribers (`--clients`),
+  `--events` events (see `sse_fanout_load.py`),
+- `observatory` — load/clean time and frame memory of the columnar loader at
+  `--loader-rows` rows (see `observatory_loader.py`),
+- `startup`     — cold start of the API in `--startup-runs` fresh interpreters:
+  time to import `backscrap.app.main`, to run the lifespan startup and to
+  answer the first `/health`, plus which heavy modules got imported.
+
+Results are written as JSON to `--output` (default:
+`benchmarks/results/<UTC time>-<commit>.json`) together with the commit,
+Python version and arguments. Two result files are compared with `--compare`,
+which prints the relative change of every metric.
+
+Usage:
+    python benchmarks/suite.py
+    python benchmarks/suite.py --sizes 1000 10000 50000 --mongo-url mongodb://localhost:27017
+    python benchmarks/suite.py --only results observatory --output /tmp/after.json
+    python benchmarks/suite.py --compare /tmp/before.json /tmp/after.json
+
+Requires `httpx`, plus `mongomock-motor` for the stand-in.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+BENCHMARKS = ("storage", "results", "fanout", "observatory", "startup")
+# Optional dependencies that should only be imported when their feature is used
+HEAVY_MODULES = ("pandas", "cv2", "playwright", "numpy")
+DATABASE_NAME = "benchmarks_suite"
+# Snapshots alternate between two sources, each scraped every 2 minutes (the scheduler's default)
+SNAPSHOT_INTERVAL = timedelta(minutes=1)
+
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(("git", *args), cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _configure_mongo(mongo_url: Optional[str]) -> str:
+    """Point the app's Mongo singleton at the benchmark database; returns the backend label."""
+    os.environ["MONGO_DATABASE_URL"] = mongo_url or "mongodb://localhost:27017"
+    os.environ["MONGO_DATABASE_NAME"] = DATABASE_NAME
+    if mongo_url:
+        return "mongod"
+    from mongomock_motor import AsyncMongoMockClient
+
+    import backscrap.app.datasource.MongoManager as mongo_manager
+
+    mongo_manager.AsyncIOMotorClient = AsyncMongoMockClient
+    return "stand-in"
+
+
+def _database():
+    from backscrap.app.datasource.MongoManagerCriptoScrapping import MongoManagerCriptoScrapping
+
+    return MongoManagerCriptoScrapping.getInstance()
+
+
+def _collection():
+    from backscrap.app.pojo.enums.enumslist import ListaCollecciones
+
+    return _database().db[ListaCollecciones.ScrappingResults.value]
+
+
+def _records(coins: int, tick: int) -> List[dict]:
+    """One scrape worth of records, already cleaned like the scrapers leave them."""
+    return [
+        {
+            "row": coin + 1,
+            "symbol": f"C{coin}",
+            "name": f"Coin {coin}",
+            "price": f"{(coin + 1) * 10 + tick % 97 / 100:.2f}",
+            "change24h": f"{(tick % 19 - 9) / 10:+.2f}",
+            "volume24h": str((coin + 1) * 1_000_000),
+            "marketCap": str((coin + 1) * 1_000_000_000),
+        }
+        for coin in range(coins)
+    ]
+
+
+def _snapshots(count: int, coins: int, start: datetime, offset: int = 0) -> List[dict]:
+    return [
+        {
+            "source": "CoinGecko" if index % 2 else "Coinmarketcap",
+            "timestamp": start + SNAPSHOT_INTERVAL * index,
+            "data": _records(coins, index),
+        }
+        for index in range(offset, offset + count)
+    ]
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
+
+
+async def bench_storage(batches: int, coins: int) -> dict:
+    from backscrap.app.repository.ScrappingRepository import ScrappingRepository
+
+    repository = ScrappingRepository()
+    await _collection().delete_many({})
+    start = datetime.now() - SNAPSHOT_INTERVAL * batches
+    records = _records(coins, 0)
+    failures = 0
+    started = time.perf_counter()
+    for index in range(batches):
+        # The collection keeps the records list, so every batch gets its own copy
+        response = await repository.save_scrapping_results(
+            "CoinGecko", start + SNAPSHOT_INTERVAL * index, [dict(record) for record in records]
+        )
+        failures += response.status != 2
+    seconds = time.perf_counter() - started
+    await _collection().delete_many({})
+    return {
+        "batches": batches,
+        "recordsPerBatch": coins,
+        "failures": failures,
+        "seconds": round(seconds, 4),
+        "batchesPerSecond": round(batches / seconds, 1),
+        "recordsPerSecond": round(batches * coins / seconds, 1),
+    }
+
+
+async def bench_results(sizes: List[int], coins: int, repeat: int) -> dict:
+    import httpx
+    from fastapi import FastAPI
+
+    from backscrap.app.controller.ScrappingController import router
+
+    app = FastAPI()
+    app.include_router(router)
+    collection = _collection()
+    await collection.delete_many({})
+    largest = max(sizes)
+    start = datetime.now() - SNAPSHOT_INTERVAL * largest
+    day = timedelta(days=1)
+
+    report: Dict[str, dict] = {}
+    stored = 0
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for size in sorted(sizes):
+            for offset in range(stored, size, 5000):
+                await collection.insert_many(_snapshots(min(5000, size - offset), coins, start, offset))
+            stored = size
+            newest = start + SNAPSHOT_INTERVAL * (size - 1)
+            variants = {
+                "full": {},
+                # What the observatory asks for every refresh: the last few snapshots
+                "since": {"since": (newest - SNAPSHOT_INTERVAL * 10).isoformat()},
+                "windowSymbols": {"start": (newest - day).isoformat(), "symbols": ["C0", "C1"]},
+            }
+            report[str(size)] = {}
+            for variant, params in variants.items():
+                latencies, size_bytes = [], 0
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    response = await client.get("/api/scraping/results", params=params)
+                    latencies.append(time.perf_counter() - started)
+                    response.raise_for_status()
+                    size_bytes = len(response.content)
+                # One extra traced request: tracemalloc slows allocations down
+                tracemalloc.start()
+                await client.get("/api/scraping/results", params=params)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                report[str(size)][variant] = {
+                    "p50Ms": round(_percentile(latencies, 50) * 1000, 2),
+                    "p95Ms": round(_percentile(latencies, 95) * 1000, 2),
+                    "meanMs": round(statistics.fmean(latencies) * 1000, 2),
+                    "responseBytes": size_bytes,
+                    "peakMemoryBytes": peak,
+                }
+    await collection.delete_many({})
+    return report
+
+
+async def bench_fanout(clients: int, events: int) -> dict:
+    from sse_fanout_load import run_hub
+
+    from backscrap.app.utils.broadcaster import broadcast_shutdown, broadcast_startup
+    from backscrap.app.utils.fanout import OverflowPolicy
+
+    await broadcast_startup()
+    try:
+        result = await run_hub(clients, events, slow_ratio=0.0, policy=OverflowPolicy.DROP_OLDEST, queue_size=100)
+    finally:
+        await broadcast_shutdown()
+    return {
+        key: result[key]
+        for key in ("clients", "events", "publishSeconds", "fastDrainSeconds", "deliveriesPerSecond", "fastClientsComplete")
+    }
+
+
+def bench_observatory(rows: List[int], coins: int, repeat: int) -> dict:
+    # observatory_loader puts observatory/ on the path for `loader`
+    from observatory_loader import make_payload
+
+    from loader import snapshots_to_frame
+
+    report = {}
+    for count in rows:
+        best, frame = float("inf"), None
+        for _ in range(repeat):
+            payload = make_payload(count, coins)
+            started = time.perf_counter()
+            frame = snapshots_to_frame(payload)
+            best = min(best, time.perf_counter() - started)
+        report[str(count)] = {
+            "seconds": round(best, 4),
+            "rowsPerSecond": round(count / best, 1),
+            "frameBytes": int(frame.memory_usage(deep=True).sum()),
+        }
+    return report
+
+
+# Runs in a fresh interpreter; argv[1] is "stand-in" to swap Motor for mongomock-motor after the import
+STARTUP_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import backscrap.app.main as main
+imported = time.perf_counter()
+if sys.argv[1] == "stand-in":
+    from mongomock_motor import AsyncMongoMockClient
+    import backscrap.app.datasource.MongoManager as mongo_manager
+    mongo_manager.AsyncIOMotorClient = AsyncMongoMockClient
+from fastapi.testclient import TestClient
+resumed = time.perf_counter()
+with TestClient(main.app) as client:
+    ready = time.perf_counter()
+    status = client.get("/health").status_code
+    answered = time.perf_counter()
+print(json.dumps({
+    "importSeconds": imported - started,
+    "lifespanSeconds": ready - resumed,
+    "firstResponseSeconds": (imported - started) + (answered - resumed),
+    "status": status,
+    "modules": len(sys.modules),
+    "heavyModules": [name for name in json.loads(sys.argv[2]) if name in sys.modules],
+}))
+"""
+
+
+def bench_startup(runs: int, backend: str) -> dict:
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "LOG_LEVEL": "WARNING", "EMBEDDED_SCHEDULER": "false"}
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            (sys.executable, "-c", STARTUP_PROBE, backend, json.dumps(HEAVY_MODULES)),
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        )
+        sample = json.loads(completed.stdout.strip().splitlines()[-1])
+        sample["processSeconds"] = time.perf_counter() - started
+        samples.append(sample)
+    report = {
+        key: {
+            "median": round(statistics.median(sample[key] for sample in samples), 4),
+            "min": round(min(sample[key] for sample in samples), 4),
+        }
+        for key in ("importSeconds", "lifespanSeconds", "firstResponseSeconds", "processSeconds")
+    }
+    report["modules"] = samples[-1]["modules"]
+    report["heavyModules"] = samples[-1]["heavyModules"]
+    report["healthStatus"] = samples[-1]["status"]
+    return report
+
+
+async def run(args: argparse.Namespace) -> dict:
+    selected = args.only or list(BENCHMARKS)
+    backend = _configure_mongo(args.mongo_url)
+    benchmarks: Dict[str, dict] = {}
+    timings: Dict[str, float] = {}
+
+    async def timed(name: str, compute) -> None:
+        print(f"Running {name}...", file=sys.stderr)
+        started = time.perf_counter()
+        result = compute()
+        benchmarks[name] = await result if asyncio.iscoroutine(result) else result
+        timings[name] = round(time.perf_counter() - started, 2)
+
+    try:
+        if "storage" in selected:
+            await timed("storage", lambda: bench_storage(args.batches, args.coins))
+        if "results" in selected:
+            await timed("results", lambda: bench_results(args.sizes, args.coins, args.repeat))
+        if "fanout" in selected:
+            await timed("fanout", lambda: bench_fanout(args.clients, args.events))
+        if "observatory" in selected:
+            await timed("observatory", lambda: bench_observatory(args.loader_rows, args.coins, args.repeat))
+        if "startup" in selected:
+            await timed("startup", lambda: bench_startup(args.startup_runs, backend))
+    finally:
+        if args.mongo_url and {"storage", "results"} & set(selected):
+            await _database().client.drop_database(DATABASE_NAME)
+
+    return {
+        "meta": {
+            "createdAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git("rev-parse", "--short", "HEAD"),
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mongo": backend,
+            "arguments": {key: value for key, value in vars(args).items() if key not in ("compare", "output", "mongo_url")},
+            "suiteSeconds": timings,
+            "maxRssKb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def _flatten(tree: dict, prefix: str = "") -> Dict[str, float]:
+    values = {}
+    for key, value in tree.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            values.update(_flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[path] = value
+    return values
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Print every metric present in both files with its relative change."""
+    old = json.loads(Path(old_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+    print(f"old: {old['meta'].get('commit')} ({old['meta'].get('mongo')})  new: {new['meta'].get('commit')} ({new['meta'].get('mongo')})")
+    old_values, new_values = _flatten(old["benchmarks"]), _flatten(new["benchmarks"])
+    width = max((len(path) for path in new_values), default=10)
+    print(f"{'metric':<{width}} {'old':>14} {'new':>14} {'change':>8}")
+    for path, value in new_values.items():
+        if path not in old_values:
+            continue
+        before = old_values[path]
+        change = f"{(value - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"{path:<{width}} {before:>14} {value:>14} {change:>8}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Benchmarks to run (default: all).")
+    parser.add_argument("--mongo-url", default=None, help="Real MongoDB to use; default: in-process stand-in.")
+    parser.add_argument("--coins", type=int, default=15, help="Records per snapshot (scrape depth).")
+    parser.add_argument("--batches", type=int, default=2000, help="Batches stored by the storage benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000], help="Snapshots in the collection.")
+    parser.add_argument("--repeat", type=int, default=5, help="Requests/runs per measurement.")
+    parser.add_argument("--clients", type=int, default=1000, help="Fan-out subscribers.")
+    parser.add_argument("--events", type=int, default=200, help="Fan-out events.")
+    parser.add_argument("--loader-rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--startup-runs", type=int, default=5, help="Fresh interpreters started by the startup benchmark.")
+    parser.add_argument("--output", default=None, help="Result file (default: benchmarks/results/<time>-<commit>.json).")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files and exit.")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    results = asyncio.run(run(args))
+    output = Path(args.output) if args.output else (
+        ROOT / "benchmarks" / "results"
+        / f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{results['meta']['commit'] or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(json.dumps(results["benchmarks"], indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
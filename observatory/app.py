@@ -1,24 +1,39 @@
 """Streamlit dashboard for visualizing scraped crypto data (logic preserved).
 
-- Reads snapshots from the FastAPI endpoint.
-- Normalizes records and renders several charts with Plotly and Seaborn.
+- Reads snapshots from the FastAPI endpoint for the time window and symbols picked
+  in the sidebar (pushed down as `start`/`end`/`symbols`): the whole window once,
+  then only the snapshots newer than the last one seen (`since`), appended to the
+  DataFrame kept in `st.session_state`. Rolling windows drop the rows that fall out
+  of them, so memory stays bounded by the window. Changing the window or the symbols,
+  or "Reset data", forces a full reload.
+- Normalizes records with the columnar loader (`loader.py`) and renders several charts with Plotly.
+- Charts live in tabs that only run when selected; their aggregates and figures
+  are memoized per (data version, selected sources), so reruns that don't bring
+  new data or change the sources reuse them.
 - Keeps the same column expectations: price, change24h, volume24h, marketCap.
 - UI text/messages are now in English only. Behavior is unchanged.
 """
 
 from __future__ import annotations
 
-from typing import List
+import time
+from typing import Any, Callable, List, NamedTuple, Optional
 
-import matplotlib.pyplot as plt
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import requests
-import seaborn as sns
 import streamlit as st
 
+from loader import snapshots_to_frame
+
 # ===== API URL (unchanged logic) =====
 API_URL = "http://localhost:9000/api/scraping/results"
+SERIES_URL = "http://localhost:9000/api/analytics/series"
+SYMBOLS_URL = "http://localhost:9000/api/scraping/symbols"
+
+# Line charts ask the API for at most this many points per series (≈ one per pixel column)
+CHART_WIDTH_PX = 1200
 
 # ===== PAGE CONFIG =====
 st.set_page_config(
@@ -33,53 +48,195 @@ st.caption("Integrated data from CoinGecko and CoinMarketCap")
 # ===== DATA FUNCTIONS =====
 
 
-@st.cache_data(ttl=60)  # cache data for 60 seconds
-def load_data() -> pd.DataFrame:
-    """Fetch data from the API, normalize records, and return a DataFrame."""
+# Incremental refresh: new snapshots are requested at most every REFRESH_SECONDS.
+# The `since` cursor trails the newest timestamp by REFRESH_OVERLAP so snapshots
+# committed slightly out of order are not missed; duplicates are dropped by id.
+REFRESH_SECONDS = 60
+REFRESH_OVERLAP = pd.Timedelta(seconds=30)
+STATE_KEYS = ("snapshots", "snapshot_ids", "last_timestamp", "loaded_at", "data_version", "chart_cache")
+MAJOR_SYMBOLS = ["BTC", "ETH", "SOL", "BNB", "USDT"]
+# Plotted over time when no symbol is picked in the sidebar
+DEFAULT_LINE_SYMBOLS = ("BTC", "ETH", "SOL")
+
+# Time windows offered in the sidebar: rolling ones (a length back from now) keep
+# refreshing and trimming; "Custom range" is a fixed pair of dates.
+TIME_WINDOWS = {
+    "Last 6 hours": pd.Timedelta(hours=6),
+    "Last 24 hours": pd.Timedelta(hours=24),
+    "Last 7 days": pd.Timedelta(days=7),
+    "Last 30 days": pd.Timedelta(days=30),
+    "Custom range": None,
+}
+DEFAULT_WINDOW = "Last 24 hours"
+
+
+class Query(NamedTuple):
+    """What the dashboard asks the API for; any change triggers a full reload of the window."""
+
+    window: str
+    start: Optional[pd.Timestamp]  # Only for "Custom range"
+    end: Optional[pd.Timestamp]
+    symbols: tuple  # Empty = all symbols
+
+
+def window_bounds(query: Query) -> tuple:
+    """(start, end) of the query right now; rolling windows have no end."""
+    length = TIME_WINDOWS.get(query.window)
+    if length is None:
+        return query.start, query.end
+    return pd.Timestamp.now() - length, None
+
+
+def fetch_snapshots(
+    since: Optional[pd.Timestamp] = None,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    symbols: tuple = (),
+) -> Optional[list]:
+    """Fetch raw snapshot documents in [start, end] for `symbols` (newer than `since` if given); None on error."""
+    bounds = (("since", since), ("start", start), ("end", end))
+    params = [(name, value.isoformat()) for name, value in bounds if value is not None]
+    params += [("symbols", symbol) for symbol in symbols]
     try:
-        response = requests.get(API_URL, timeout=10)
+        response = requests.get(API_URL, params=params, timeout=10)
         response.raise_for_status()
-        raw_data = response.json()
-
-        records = []
-        for entry in raw_data:
-            for d in entry["data"]:
-                d["source"] = entry["source"]
-                d["timestamp"] = pd.to_datetime(entry["timestamp"])
-                records.append(d)
-
-        if not records:
-            return pd.DataFrame()
-
-        return pd.DataFrame(records)
+        return response.json() or []
     except requests.RequestException as e:
         st.error(f"Error connecting to the API: {e}")
-        return pd.DataFrame()
+        return None
+
+
+def to_frame(raw_data: list) -> pd.DataFrame:
+    """Normalize snapshot documents into one typed row per coin and snapshot (see loader.py)."""
+    try:
+        return snapshots_to_frame(raw_data)
     except Exception as e:  # noqa: BLE001
         st.error(f"An unexpected error occurred while processing the data: {e}")
         return pd.DataFrame()
 
 
-def clean_data(df: pd.DataFrame) -> pd.DataFrame:
-    """Clean and cast numeric columns to proper dtypes (logic preserved)."""
-    if df.empty:
-        return df
+@st.cache_data(ttl=300)
+def load_symbols() -> List[str]:
+    """Symbols stored by any source, for the sidebar picker; empty on error."""
+    try:
+        response = requests.get(SYMBOLS_URL, timeout=10)
+        response.raise_for_status()
+        return response.json() or []
+    except (requests.RequestException, ValueError):
+        return []
+
 
-    for col in ["price", "change24h", "volume24h", "marketCap"]:
-        df[col] = (
-            df[col]
-            .astype(str)
-            .str.replace(r"[+$,%]", "", regex=True)
-            .pipe(pd.to_numeric, errors="coerce")
-        )
-    return df
+@st.cache_data(ttl=60)
+def load_price_series(symbols: tuple, start: pd.Timestamp, end: pd.Timestamp, width: int = CHART_WIDTH_PX) -> pd.DataFrame:
+    """Fetch downsampled price series (LTTB, per symbol and source) for a line chart; empty on error."""
+    params = [("symbols", symbol) for symbol in symbols]
+    params += [("start", start.isoformat()), ("end", end.isoformat()), ("width", width)]
+    try:
+        response = requests.get(SERIES_URL, params=params, timeout=10)
+        response.raise_for_status()
+        series = response.json()["series"]
+    except (requests.RequestException, KeyError, ValueError):
+        return pd.DataFrame()
+    frames = [
+        pd.DataFrame({
+            "timestamp": pd.to_datetime(item["timestamps"]),
+            "price": item["prices"],
+            "symbol": item["symbol"],
+            "source": item["source"],
+        })
+        for item in series
+        if item["timestamps"]
+    ]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def reset_data() -> None:
+    """Drop the session's snapshots so the next run reloads the whole window."""
+    for key in STATE_KEYS:
+        st.session_state.pop(key, None)
+
+
+def load_data(query: Query) -> pd.DataFrame:
+    """Return the session's cleaned snapshots for `query`, appending the new ones at most every REFRESH_SECONDS."""
+    state = st.session_state
+    if state.get("query") != query:
+        reset_data()
+        state["query"] = query
+    now = time.monotonic()
+    if "snapshots" in state and now - state["loaded_at"] < REFRESH_SECONDS:
+        return state["snapshots"]
+
+    first_load = "snapshots" not in state
+    since = None if first_load or state["last_timestamp"] is None else state["last_timestamp"] - REFRESH_OVERLAP
+    start, end = window_bounds(query)
+    raw_data = fetch_snapshots(since, start, end, query.symbols)
+    if raw_data is None:
+        return state.get("snapshots", pd.DataFrame())
+
+    seen = set() if first_load else state["snapshot_ids"]
+    fresh = [entry for entry in raw_data if entry.get("id") not in seen]
+    new_rows = to_frame(fresh)
+    snapshots = state.get("snapshots", pd.DataFrame())
+    changed = not new_rows.empty
+    if changed:
+        snapshots = new_rows if snapshots.empty else pd.concat([snapshots, new_rows], ignore_index=True)
+    if start is not None and not snapshots.empty:
+        # Rolling window: rows that fell out of it are dropped, so memory stays bounded
+        expired = snapshots["timestamp"] < start
+        if expired.any():
+            snapshots = snapshots[~expired].reset_index(drop=True)
+            changed = True
+    if changed:
+        state["data_version"] = state.get("data_version", 0) + 1
+
+    last_timestamp = snapshots["timestamp"].max() if not snapshots.empty else None
+    if last_timestamp is not None:
+        # Only snapshots inside the overlap can be returned again by the next `since`
+        seen = set(snapshots.loc[snapshots["timestamp"] >= last_timestamp - REFRESH_OVERLAP, "snapshotId"])
+    state["snapshots"] = snapshots
+    state["snapshot_ids"] = seen
+    state["last_timestamp"] = last_timestamp
+    state["loaded_at"] = now
+    return snapshots
+
+
+def memoized(name: str, sources: tuple, compute: Callable[[], Any]) -> Any:
+    """Per-session memo of chart aggregates and figures, keyed by (data version, selected sources)."""
+    state = st.session_state
+    version = state.get("data_version", 0)
+    cache = state.setdefault("chart_cache", {})
+    key = (name, version, sources)
+    if key not in cache:
+        # Entries of older data versions are never asked for again
+        for stale in [entry for entry in cache if entry[1] != version]:
+            del cache[stale]
+        cache[key] = compute()
+    return cache[key]
+
+
+def display_query() -> Query:
+    """Render the time-window and symbol pickers; their values are sent to the API."""
+    st.sidebar.header("🔎 Data query")
+    windows = list(TIME_WINDOWS)
+    window = st.sidebar.selectbox("Time window", windows, index=windows.index(DEFAULT_WINDOW))
+    start = end = None
+    if TIME_WINDOWS[window] is None:
+        today = pd.Timestamp.now().normalize()
+        picked = st.sidebar.date_input("Date range", value=(today - pd.Timedelta(days=7), today))
+        if picked:
+            # While picking, the range has a single date
+            start = pd.Timestamp(picked[0])
+            end = pd.Timestamp(picked[-1]) + pd.Timedelta(days=1) - pd.Timedelta(milliseconds=1)
+    symbols = st.sidebar.multiselect("Symbols (empty = all)", options=load_symbols())
+    return Query(window, start, end, tuple(sorted(symbols)))
 
 
 def display_sidebar(df: pd.DataFrame) -> List[str]:
     """Render sidebar filters and return the selected sources (logic preserved)."""
     st.sidebar.header("⚙️ Display filters")
 
-    if st.sidebar.button("Force data refresh"):
+    if st.sidebar.button("Reset data (full reload)"):
+        reset_data()
         st.cache_data.clear()
         st.rerun()
 
@@ -87,7 +244,7 @@ def display_sidebar(df: pd.DataFrame) -> List[str]:
         st.sidebar.warning("No data available to filter.")
         return []
 
-    all_sources = df["source"].unique()
+    all_sources = memoized("sources", (), lambda: sorted(df["source"].unique()))
     selected_sources = st.sidebar.multiselect(
         "Select data source(s)",
         options=all_sources,
@@ -96,184 +253,231 @@ def display_sidebar(df: pd.DataFrame) -> List[str]:
     return selected_sources
 
 
-df_raw = load_data()
+# ===== CHARTS =====
+# Each builder returns a Plotly figure from the filtered frame; results are memoized by `memoized`.
+
+
+def fig_top_market_cap(df: pd.DataFrame) -> go.Figure:
+    top_market_cap = (
+        df.groupby("name", as_index=False)["marketCap"]
+        .mean()
+        .nlargest(10, "marketCap")
+    )
+    return px.bar(
+        top_market_cap,
+        x="marketCap",
+        y="name",
+        orientation="h",
+        color="marketCap",
+        color_continuous_scale="Blues",
+        title="Average Market Capitalization (Top 10)",
+    )
+
+
+def fig_change_heatmap(df: pd.DataFrame) -> go.Figure:
+    pivot = df.pivot_table(values="change24h", index="name", columns="source", aggfunc="mean").dropna()
+    fig = px.imshow(
+        pivot,
+        color_continuous_scale="RdYlGn",
+        color_continuous_midpoint=0,
+        text_auto=".2f",
+        aspect="auto",
+        title="Average 24h Change (%) by Source",
+    )
+    fig.update_layout(height=max(400, 22 * len(pivot)))
+    return fig
+
+
+def fig_volume_vs_market_cap(df: pd.DataFrame) -> go.Figure:
+    return px.scatter(
+        df.dropna(subset=["marketCap", "volume24h", "price"]),
+        x="marketCap",
+        y="volume24h",
+        color="name",
+        size="price",
+        hover_name="name",
+        facet_col="source",
+        log_x=True,
+        log_y=True,
+        title="24h Volume vs. Market Capitalization",
+    )
+
+
+def fig_price_by_source(df: pd.DataFrame) -> go.Figure:
+    return px.box(
+        df[df["symbol"].isin(MAJOR_SYMBOLS)],
+        x="symbol",
+        y="price",
+        color="source",
+        title="Price Distribution for Major Cryptos",
+    )
+
+
+def fig_market_share(df: pd.DataFrame) -> go.Figure:
+    market_share = (
+        df.groupby("name", as_index=False)["marketCap"]
+        .mean()
+        .nlargest(8, "marketCap")
+    )
+    return px.pie(
+        market_share,
+        values="marketCap",
+        names="name",
+        title="Market Value Distribution (Top 8)",
+        hole=0.5,
+        color_discrete_sequence=px.colors.sequential.Tealgrn,
+    )
+
+
+def fig_volatility(df: pd.DataFrame) -> go.Figure:
+    volatility = (
+        df.groupby("symbol")["change24h"]
+        .std()
+        .sort_values(ascending=False)
+        .head(10)
+    )
+    return px.bar(
+        x=volatility.values,
+        y=volatility.index,
+        orientation="h",
+        color=volatility.values,
+        color_continuous_scale="Reds",
+        title="Top 10 Most Volatile Cryptocurrencies",
+    )
+
 
-if df_raw.empty:
+def fig_price_evolution(df: pd.DataFrame, sources: tuple, symbols: tuple) -> Optional[go.Figure]:
+    if df["timestamp"].nunique() < 2:
+        return None
+    symbols = symbols or DEFAULT_LINE_SYMBOLS
+    line_data = load_price_series(symbols, df["timestamp"].min(), df["timestamp"].max())
+    if not line_data.empty:
+        line_data = line_data[line_data["source"].isin(sources)]
+    else:
+        # API without the series endpoint: plot the raw points
+        line_data = df[df["symbol"].isin(symbols)]
+    return px.line(
+        line_data,
+        x="timestamp",
+        y="price",
+        color="symbol",
+        line_dash="source",
+        title=f"Price Evolution ({', '.join(symbols)})",
+    )
+
+
+# (tab label, subheader, figure builder, explanation)
+CHARTS = [
+    (
+        "💰 Market cap",
+        "💰 Top 10 Cryptocurrencies by Market Capitalization",
+        fig_top_market_cap,
+        """
+        This horizontal bar chart shows the **Top 10 cryptocurrencies by average market capitalization**.
+        - **Use case**: Quickly identify the largest, most established assets.
+        - **Interpretation**: Higher market cap usually indicates broader adoption and relative stability.
+        """,
+    ),
+    (
+        "🌡️ 24h change",
+        "🌡️ 24h Percentage Change Heatmap",
+        fig_change_heatmap,
+        """
+        This heatmap compares the **average 24-hour percent change** per cryptocurrency across data sources.
+        - **Colors**: Green = gain, Red = loss, Yellow/white ≈ near zero change.
+        - **Use case**: Spot recent performance and cross-source discrepancies at a glance.
+        """,
+    ),
+    (
+        "⚖️ Volume vs. cap",
+        "⚖️ Volume vs. Market Capitalization",
+        fig_volume_vs_market_cap,
+        """
+        This scatter plot explores the relationship between **market capitalization** (x-axis) and
+        **24h trading volume** (y-axis). Both axes are in log scale to better spread the data.
+        - **Bubble size**: current price
+        - **Use case**: Understand if large-cap assets also have high trading volume (liquidity/activity).
+        """,
+    ),
+    (
+        "📈 Price by source",
+        "📈 Price Comparison by Source",
+        fig_price_by_source,
+        """
+        This box plot displays the **price distribution** for top cryptocurrencies across sources and over time.
+        - **Interpretation**: Taller boxes indicate higher variability. Check if a source consistently reports
+          higher/lower prices than others.
+        """,
+    ),
+    (
+        "🪙 Market share",
+        "🪙 Market Share (Top 8)",
+        fig_market_share,
+        """
+        This donut chart shows the **market share** of the 8 largest cryptocurrencies by market cap.
+        - **Use case**: Understand how much of the top-8 basket each coin represents (e.g., BTC/ETH dominance).
+        """,
+    ),
+    (
+        "⚔️ Volatility",
+        "⚔️ Volatility Ranking",
+        fig_volatility,
+        """
+        This bar chart ranks the 10 most **volatile** cryptocurrencies using the standard deviation of
+        their 24h percentage change.
+        - **Interpretation**: Longer bars = larger fluctuations. Volatility implies potential upside and risk.
+        """,
+    ),
+    (
+        "📅 Over time",
+        "📅 Price Evolution Over Time",
+        None,  # Needs the selected sources too; handled below
+        """
+        This line chart shows **price evolution** over time for the symbols picked in the sidebar
+        (BTC, ETH and SOL when none is picked).
+        - **Use case**: Observe trends, patterns, and volatility across scraping snapshots.
+        - **Note**: long histories are downsampled by the API (LTTB) to about one point per pixel.
+        """,
+    ),
+]
+
+
+query = display_query()
+df_cleaned = load_data(query)
+
+if df_cleaned.empty:
     st.warning(
-        "Data could not be loaded. Please verify the backend is running and the database has snapshots."
+        "No data for the selected time window and symbols. Please verify the backend is running "
+        "and the database has snapshots, or widen the query in the sidebar."
     )
 else:
-    df_cleaned = clean_data(df_raw.copy())
-    selected_sources = display_sidebar(df_cleaned)
-    df_filtered = df_cleaned[df_cleaned["source"].isin(selected_sources)]
+    selected_sources = tuple(display_sidebar(df_cleaned))
+    df_filtered = memoized(
+        "filtered", selected_sources, lambda: df_cleaned[df_cleaned["source"].isin(selected_sources)]
+    )
 
     if df_filtered.empty:
         st.info("Select at least one data source in the sidebar to view the charts.")
     else:
-        # ===== 1️⃣ TOP 10 BY MARKET CAP =====
-        with st.container(border=True):
-            st.subheader("💰 Top 10 Cryptocurrencies by Market Capitalization")
-            top_market_cap = (
-                df_filtered.groupby("name", as_index=False)["marketCap"]
-                .mean()
-                .nlargest(10, "marketCap")
-            )
-            fig1 = px.bar(
-                top_market_cap,
-                x="marketCap",
-                y="name",
-                orientation="h",
-                color="marketCap",
-                color_continuous_scale="Blues",
-                title="Average Market Capitalization (Top 10)",
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-            with st.expander("ℹ️ What does this chart show?"):
-                st.markdown(
-                    """
-                    This horizontal bar chart shows the **Top 10 cryptocurrencies by average market capitalization**.
-                    - **Use case**: Quickly identify the largest, most established assets.
-                    - **Interpretation**: Higher market cap usually indicates broader adoption and relative stability.
-                    """
-                )
-
-        # ===== 2️⃣ 24H CHANGE HEATMAP =====
-        with st.container(border=True):
-            st.subheader("🌡️ 24h Percentage Change Heatmap")
-            pivot = df_filtered.pivot_table(
-                values="change24h", index="name", columns="source", aggfunc="mean"
-            )
-            fig2, ax = plt.subplots(figsize=(8, 8))
-            sns.heatmap(pivot.dropna(), cmap="RdYlGn", center=0, annot=True, fmt=".2f", ax=ax)
-            st.pyplot(fig2)
-            with st.expander("ℹ️ What does this chart show?"):
-                st.markdown(
-                    """
-                    This heatmap compares the **average 24-hour percent change** per cryptocurrency across data sources.
-                    - **Colors**: Green = gain, Red = loss, Yellow/white ≈ near zero change.
-                    - **Use case**: Spot recent performance and cross-source discrepancies at a glance.
-                    """
-                )
-
-        # ===== 3️⃣ VOLUME VS MARKET CAP (SCATTER) =====
-        with st.container(border=True):
-            st.subheader("⚖️ Volume vs. Market Capitalization")
-            fig3 = px.scatter(
-                df_filtered.dropna(subset=["marketCap", "volume24h", "price"]),
-                x="marketCap",
-                y="volume24h",
-                color="name",
-                size="price",
-                hover_name="name",
-                facet_col="source",
-                log_x=True,
-                log_y=True,
-                title="24h Volume vs. Market Capitalization",
-            )
-            st.plotly_chart(fig3, use_container_width=True)
-            with st.expander("ℹ️ What does this chart show?"):
-                st.markdown(
-                    """
-                    This scatter plot explores the relationship between **market capitalization** (x-axis) and
-                    **24h trading volume** (y-axis). Both axes are in log scale to better spread the data.
-                    - **Bubble size**: current price
-                    - **Use case**: Understand if large-cap assets also have high trading volume (liquidity/activity).
-                    """
-                )
-
-        # ===== 4️⃣ PRICE COMPARISON ACROSS SOURCES =====
-        with st.container(border=True):
-            st.subheader("📈 Price Comparison by Source")
-            top_coins = df_filtered[df_filtered["symbol"].isin(["BTC", "ETH", "SOL", "BNB", "USDT"])]
-            fig4 = px.box(
-                top_coins,
-                x="symbol",
-                y="price",
-                color="source",
-                title="Price Distribution for Major Cryptos",
-            )
-            st.plotly_chart(fig4, use_container_width=True)
-            with st.expander("ℹ️ What does this chart show?"):
-                st.markdown(
-                    """
-                    This box plot displays the **price distribution** for top cryptocurrencies across sources and over time.
-                    - **Interpretation**: Taller boxes indicate higher variability. Check if a source consistently reports
-                      higher/lower prices than others.
-                    """
-                )
-
-        # ===== 5️⃣ MARKET SHARE (DONUT) =====
-        with st.container(border=True):
-            st.subheader("🪙 Market Share (Top 8)")
-            market_share = (
-                df_filtered.groupby("name", as_index=False)["marketCap"]
-                .mean()
-                .nlargest(8, "marketCap")
-            )
-            fig5 = px.pie(
-                market_share,
-                values="marketCap",
-                names="name",
-                title="Market Value Distribution (Top 8)",
-                hole=0.5,
-                color_discrete_sequence=px.colors.sequential.Tealgrn,
-            )
-            st.plotly_chart(fig5, use_container_width=True)
-            with st.expander("ℹ️ What does this chart show?"):
-                st.markdown(
-                    """
-                    This donut chart shows the **market share** of the 8 largest cryptocurrencies by market cap.
-                    - **Use case**: Understand how much of the top-8 basket each coin represents (e.g., BTC/ETH dominance).
-                    """
-                )
-
-        # ===== 6️⃣ VOLATILITY RANKING (STD of 24H CHANGE) =====
-        with st.container(border=True):
-            st.subheader("⚔️ Volatility Ranking")
-            volatility = (
-                df_filtered.groupby("symbol")["change24h"]
-                .std()
-                .sort_values(ascending=False)
-                .head(10)
-            )
-            fig6 = px.bar(
-                x=volatility.values,
-                y=volatility.index,
-                orientation="h",
-                color=volatility.values,
-                color_continuous_scale="Reds",
-                title="Top 10 Most Volatile Cryptocurrencies",
-            )
-            st.plotly_chart(fig6, use_container_width=True)
-            with st.expander("ℹ️ What does this chart show?"):
-                st.markdown(
-                    """
-                    This bar chart ranks the 10 most **volatile** cryptocurrencies using the standard deviation of
-                    their 24h percentage change.
-                    - **Interpretation**: Longer bars = larger fluctuations. Volatility implies potential upside and risk.
-                    """
-                )
-
-        # ===== 7️⃣ TIME SERIES (IF MULTIPLE SNAPSHOTS) =====
-        if df_filtered["timestamp"].nunique() > 1:
-            with st.container(border=True):
-                st.subheader("📅 Price Evolution Over Time")
-                line_data = df_filtered[df_filtered["symbol"].isin(["BTC", "ETH", "SOL"])]
-                fig7 = px.line(
-                    line_data,
-                    x="timestamp",
-                    y="price",
-                    color="symbol",
-                    title="Price Evolution (BTC, ETH, SOL)",
-                )
-                st.plotly_chart(fig7, use_container_width=True)
-                with st.expander("ℹ️ What does this chart show?"):
-                    st.markdown(
-                        """
-                        This line chart shows **price evolution** over time for selected major cryptocurrencies.
-                        - **Use case**: Observe trends, patterns, and volatility across scraping snapshots.
-                        """
+        # Only the selected tab runs (on_change="rerun"), so a rerun builds at most one chart
+        tabs = st.tabs([chart[0] for chart in CHARTS], key="chart_tab", on_change="rerun")
+        for tab, (label, subheader, build, explanation) in zip(tabs, CHARTS):
+            if tab.open is False:
+                continue
+            with tab, st.container(border=True):
+                st.subheader(subheader)
+                if build is None:
+                    figure = memoized(
+                        label, selected_sources, lambda: fig_price_evolution(df_filtered, selected_sources, query.symbols)
                     )
+                else:
+                    figure = memoized(label, selected_sources, lambda: build(df_filtered))
+                if figure is None:
+                    st.info("At least two snapshots are needed to plot the evolution over time.")
+                else:
+                    st.plotly_chart(figure, use_container_width=True)
+                with st.expander("ℹ️ What does this chart show?"):
+                    st.markdown(explanation)
 
 st.markdown(
     """
@@ -0,0 +1,59 @@
+"""Columnar loader for the snapshot documents returned by /api/scraping/results.
+
+Each document is `{"id", "source", "timestamp", "data": [record, ...]}`. The
+records of all snapshots are concatenated once and handed to pandas in a
+single call; the per-snapshot fields (source, timestamp, snapshot id) are
+parsed once per snapshot and repeated with `np.repeat` instead of being
+written into every record. The numeric columns arrive as strings such as
+"$1,234.5" or "+2.1%": they are cleaned once per distinct value
+(`pd.factorize`) rather than once per row, since prices, volumes and caps
+repeat across snapshots and sources.
+"""
+
+from __future__ import annotations
+
+from itertools import chain
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_COLUMNS = ["price", "change24h", "volume24h", "marketCap"]
+# Currency, thousands separator, sign and percent characters stripped before parsing
+NUMERIC_NOISE = r"[+$,%]"
+
+
+def to_number(values: pd.Series) -> pd.Series:
+    """Parse a column of numeric strings; unparseable values become NaN."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    parsed = pd.to_numeric(
+        pd.Series(uniques, dtype=object).astype(str).str.replace(NUMERIC_NOISE, "", regex=True),
+        errors="coerce",
+    ).to_numpy()
+    if (codes < 0).any():
+        # Code -1 (missing value) picks the appended NaN
+        parsed = np.append(parsed.astype(float), np.nan)
+    # Same dtype as parsing every row: int64 when all values are integers, float64 otherwise
+    return pd.Series(parsed[codes], index=values.index, name=values.name)
+
+
+def snapshots_to_frame(raw_data: Iterable[dict]) -> pd.DataFrame:
+    """Flatten snapshot documents into one typed row per coin and snapshot."""
+    snapshots: List[dict] = [entry for entry in raw_data if entry.get("data")]
+    if not snapshots:
+        return pd.DataFrame()
+
+    counts = np.fromiter((len(entry["data"]) for entry in snapshots), dtype=np.int64, count=len(snapshots))
+    frame = pd.DataFrame.from_records(list(chain.from_iterable(entry["data"] for entry in snapshots)))
+
+    timestamps = pd.to_datetime([entry["timestamp"] for entry in snapshots])
+    frame["source"] = np.repeat(np.array([entry["source"] for entry in snapshots], dtype=object), counts)
+    frame["timestamp"] = np.repeat(timestamps.to_numpy(), counts)
+    frame["snapshotId"] = np.repeat(np.array([entry.get("id") for entry in snapshots], dtype=object), counts)
+
+    for column in NUMERIC_COLUMNS:
+        if column in frame:
+            frame[column] = to_number(frame[column])
+    return frame
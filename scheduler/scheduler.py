@@ -1,18 +1,36 @@
-"""Simple scraping task scheduler (logic preserved, English only).
+"""Adaptive asyncio scraping scheduler.
 
-- Fetches available sources from the API at startup.
-- Schedules a background POST to /api/scraping/run?source=<src> every 2 minutes.
+- Fetches the available sources from the API at startup and refreshes the list
+  every `SCHEDULER_SOURCES_REFRESH` seconds (new sources join, removed ones stop).
+- Triggers POST /api/scraping/run?source=<src>&priority=scheduled through one
+  pooled httpx client, so manual runs queued in the API go first.
+- Each source has its own interval:
+    * volatility — the rolling volatility from /api/indicators is turned into a
+      per-second rate and the interval is the time the price needs to move
+      `SCHEDULER_TARGET_MOVE` (log return); calm sources are scraped less often,
+      moving ones more often,
+    * duration — scrape completion is observed on /api/events/status-stream and
+      the interval never drops below `SCHEDULER_DURATION_MULTIPLIER` times the
+      smoothed scrape duration (a source is never triggered while in flight),
+    * clamped to [`SCHEDULER_MIN_INTERVAL`, `SCHEDULER_MAX_INTERVAL`] and spread
+      with ±`SCHEDULER_JITTER` so sources don't fire together,
+    * a 503 (circuit open) postpones the source by its `Retry-After`.
 - Logs to 'scheduler.log' and prints concise console messages.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import math
+import os
+import random
 import sys
 import time
+from typing import Dict, List, Optional, Set
 
-import requests
-import schedule
+import httpx
 
 # Basic logging configuration for the scheduler (unchanged behavior)
 logging.basicConfig(
@@ -20,78 +38,260 @@ logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
 )
+# One line per request would drown the scheduling decisions
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 # Base URL of your API. Ensure the port matches run.py
-API_BASE_URL = "http://localhost:9000"
+API_BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:9000")
 
+# Interval bounds and the default used until there is data (seconds)
+BASE_INTERVAL = float(os.environ.get("SCHEDULER_BASE_INTERVAL", "120"))
+MIN_INTERVAL = float(os.environ.get("SCHEDULER_MIN_INTERVAL", "30"))
+MAX_INTERVAL = float(os.environ.get("SCHEDULER_MAX_INTERVAL", "600"))
+# Expected absolute log return between two scrapes of the same source
+TARGET_MOVE = float(os.environ.get("SCHEDULER_TARGET_MOVE", "0.0015"))
+DURATION_MULTIPLIER = float(os.environ.get("SCHEDULER_DURATION_MULTIPLIER", "2"))
+JITTER = float(os.environ.get("SCHEDULER_JITTER", "0.1"))
+SOURCES_REFRESH_SECONDS = float(os.environ.get("SCHEDULER_SOURCES_REFRESH", "300"))
+INDICATORS_REFRESH_SECONDS = float(os.environ.get("SCHEDULER_INDICATORS_REFRESH", "60"))
+# A scrape without a completion event after this long is considered lost
+SCRAPE_TIMEOUT_SECONDS = float(os.environ.get("SCHEDULER_SCRAPE_TIMEOUT", "300"))
 
-def get_dynamic_sources() -> list[str]:
-    """Retrieve the list of available scraping sources directly from the API."""
-    sources_endpoint = f"{API_BASE_URL}/api/scraping/sources"
-    try:
-        response = requests.get(sources_endpoint, timeout=5)
-        response.raise_for_status()  # raise for 4xx/5xx
-        sources = response.json()
-        if isinstance(sources, list) and sources:
-            logging.info("Sources obtained dynamically from the API: %s", sources)
-            return sources
-        logging.warning("The API did not return any sources to schedule.")
-        return []
-    except requests.RequestException as e:
-        # Critical if we cannot contact the API to obtain initial configuration
-        logging.critical(
-            "Could not connect to the API to obtain sources at %s. Error: %s",
-            sources_endpoint,
-            e,
+# Smoothing of the observed scrape duration and of the spacing between scrapes
+DURATION_ALPHA = 0.3
+SPACING_ALPHA = 0.1
+# Per-source volatility = this quantile of the volatility of its symbols
+VOLATILITY_QUANTILE = 0.75
+TERMINAL_STATUSES = {"SUCCESS", "FAILURE", "ERROR"}
+
+
+class SourceState:
+    """Scheduling state of one source."""
+
+    def __init__(self, name: str, now: float):
+        self.name = name
+        self.interval = BASE_INTERVAL
+        # First run spread over the jitter window so sources don't start together
+        self.next_run = now + random.uniform(0, JITTER * BASE_INTERVAL)
+        self.in_flight_since: Optional[float] = None
+        self.last_started: Optional[float] = None
+        self.spacing: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.volatility: Optional[float] = None
+
+    def observe_duration(self, seconds: float) -> None:
+        self.duration = seconds if self.duration is None else (
+            DURATION_ALPHA * seconds + (1 - DURATION_ALPHA) * self.duration
         )
-        return []
 
+    def observe_start(self, now: float) -> None:
+        if self.last_started is not None:
+            spacing = now - self.last_started
+            self.spacing = spacing if self.spacing is None else (
+                SPACING_ALPHA * spacing + (1 - SPACING_ALPHA) * self.spacing
+            )
+        self.last_started = now
+
+    def recompute_interval(self) -> float:
+        interval = BASE_INTERVAL
+        if self.volatility:
+            # Volatility is per snapshot: scale by the observed spacing to a per-second rate
+            rate = self.volatility / math.sqrt(self.spacing or BASE_INTERVAL)
+            interval = (TARGET_MOVE / rate) ** 2
+        if self.duration is not None:
+            interval = max(interval, self.duration * DURATION_MULTIPLIER)
+        self.interval = min(MAX_INTERVAL, max(MIN_INTERVAL, interval))
+        return self.interval
 
-def trigger_scraping_job(source: str) -> None:
-    """Invoke the API endpoint to start a scraping task for a single source."""
-    endpoint = f"{API_BASE_URL}/api/scraping/run?source={source}"
-    try:
-        response = requests.post(endpoint, timeout=10)
+    def schedule_next(self, now: float) -> None:
+        self.next_run = now + self.interval * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+def _quantile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class AdaptiveScheduler:
+    """Triggers scrapes per source on adaptive, jittered intervals."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.sources: Dict[str, SourceState] = {}
+        self._wake = asyncio.Event()
+        self._triggers: Set[asyncio.Task] = set()
+
+    async def get_dynamic_sources(self) -> Optional[List[str]]:
+        """Retrieve the list of available scraping sources directly from the API (None if unreachable)."""
+        try:
+            response = await self.client.get("/api/scraping/sources", timeout=5)
+            response.raise_for_status()  # raise for 4xx/5xx
+            sources = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logging.error("Could not obtain sources from %s. Error: %s", API_BASE_URL, e)
+            return None
+        if isinstance(sources, list):
+            return [str(source) for source in sources]
+        logging.warning("The API returned an unexpected sources payload: %s", sources)
+        return None
+
+    def apply_sources(self, sources: List[str]) -> None:
+        now = time.monotonic()
+        added = [source for source in sources if source not in self.sources]
+        removed = [source for source in self.sources if source not in sources]
+        for source in added:
+            self.sources[source] = SourceState(source, now)
+        for source in removed:
+            del self.sources[source]
+        if added or removed:
+            logging.info("Sources updated. Added: %s, removed: %s", added, removed)
+            print(f"Sources: {', '.join(sorted(self.sources)) or '(none)'}")
+            self._wake.set()
+
+    async def refresh_sources(self) -> None:
+        while True:
+            await asyncio.sleep(SOURCES_REFRESH_SECONDS)
+            sources = await self.get_dynamic_sources()
+            if sources is not None:
+                self.apply_sources(sources)
+
+    async def refresh_volatility(self) -> None:
+        """Fold the rolling volatility of every symbol into one value per source."""
+        while True:
+            try:
+                response = await self.client.get("/api/indicators", timeout=10)
+                rows = response.json() if response.status_code == 200 else []
+            except (httpx.HTTPError, ValueError) as e:
+                logging.warning("Could not read indicators: %s", e)
+                rows = []
+            by_source: Dict[str, List[float]] = {}
+            for row in rows:
+                volatility = row.get("volatility")
+                if isinstance(volatility, (int, float)) and volatility > 0:
+                    by_source.setdefault(row.get("source"), []).append(float(volatility))
+            for name, state in self.sources.items():
+                values = by_source.get(name)
+                state.volatility = _quantile(values, VOLATILITY_QUANTILE) if values else None
+                previous = state.interval
+                if abs(state.recompute_interval() - previous) >= 1:
+                    logging.info("Interval for '%s': %.0fs -> %.0fs (volatility=%s, duration=%s)",
+                                 name, previous, state.interval, state.volatility, state.duration)
+            await asyncio.sleep(INDICATORS_REFRESH_SECONDS)
+
+    def _completed(self, source: str, status: str) -> None:
+        state = self.sources.get(source)
+        if state is None or state.in_flight_since is None:
+            return
+        now = time.monotonic()
+        state.observe_duration(now - state.in_flight_since)
+        state.in_flight_since = None
+        state.recompute_interval()
+        logging.info("Scraping '%s' finished with %s in %.1fs.", source, status, state.duration)
+
+    async def watch_status(self) -> None:
+        """Measure scrape durations from the SSE status stream (reconnects on failure)."""
+        while True:
+            try:
+                async with self.client.stream("GET", "/api/events/status-stream", timeout=None) as response:
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        try:
+                            event = json.loads(line[5:].strip())
+                        except ValueError:
+                            continue
+                        if isinstance(event, dict) and event.get("status") in TERMINAL_STATUSES:
+                            self._completed(event.get("source"), event["status"])
+            except httpx.HTTPError as e:
+                logging.warning("Status stream unavailable: %s", e)
+            await asyncio.sleep(5)
+
+    async def trigger_scraping_job(self, state: SourceState) -> None:
+        """Invoke the API endpoint to start a scraping task for a single source."""
+        now = time.monotonic()
+        try:
+            response = await self.client.post(
+                "/api/scraping/run", params={"source": state.name, "priority": "scheduled"}, timeout=10
+            )
+        except httpx.HTTPError as e:
+            logging.error("Could not connect to the API at %s. Error: %s", API_BASE_URL, e)
+            print(f"Could not connect to the API to start the task for '{state.name}'. Is the FastAPI server running?")
+            return
+        if response.status_code == 503:
+            # The source's circuit breaker is open: wait until the API allows a probe
+            retry_after = float(response.headers.get("Retry-After") or state.interval)
+            state.next_run = max(state.next_run, now + retry_after)
+            logging.info("Circuit open for '%s'; next attempt in %.0fs.", state.name, retry_after)
+            return
         if response.status_code == 202:
-            logging.info("Scraping task for '%s' started successfully.", source)
-            print(f"Task for '{source}' started.")
+            state.in_flight_since = now
+            state.observe_start(now)
+            logging.info(
+                "Scraping job %s for '%s' queued (next in %.0fs).",
+                response.json().get("jobId"),
+                state.name,
+                state.interval,
+            )
+            print(f"Task for '{state.name}' started (every ~{state.interval:.0f}s).")
         else:
             logging.error(
                 "Error starting task for '%s'. Status: %s, Body: %s",
-                source,
+                state.name,
                 response.status_code,
                 response.text,
             )
-            print(f"Error starting task for '{source}'. Check scheduler.log")
-    except requests.RequestException as e:
-        logging.error("Could not connect to the API at %s. Error: %s", endpoint, e)
-        print(
-            f"Could not connect to the API to start the task for '{source}'. "
-            "Is the FastAPI server running?"
-        )
+            print(f"Error starting task for '{state.name}'. Check scheduler.log")
 
+    async def dispatch(self) -> None:
+        """Fire every due source, then sleep until the next one is due."""
+        while True:
+            now = time.monotonic()
+            for state in list(self.sources.values()):
+                if state.in_flight_since is not None:
+                    if now - state.in_flight_since < SCRAPE_TIMEOUT_SECONDS:
+                        continue
+                    logging.warning("No completion event for '%s'; triggering again.", state.name)
+                    state.in_flight_since = None
+                if state.next_run <= now:
+                    state.schedule_next(now)
+                    task = asyncio.create_task(self.trigger_scraping_job(state))
+                    self._triggers.add(task)
+                    task.add_done_callback(self._triggers.discard)
+            upcoming = [state.next_run for state in self.sources.values()]
+            delay = min(upcoming) - time.monotonic() if upcoming else SOURCES_REFRESH_SECONDS
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=min(max(delay, 0.05), 5))
+            except asyncio.TimeoutError:
+                pass
 
-if __name__ == "__main__":
-    print("🚀 Starting scraping task scheduler...")
+    async def run(self, sources: List[str]) -> None:
+        self.apply_sources(sources)
+        await asyncio.gather(self.dispatch(), self.watch_status(), self.refresh_volatility(), self.refresh_sources())
 
-    # Obtain sources dynamically
-    sources_to_scrape = get_dynamic_sources()
 
-    if not sources_to_scrape:
-        print(
-            "❌ Could not obtain sources from the API or the list is empty. "
-            "The scheduler will not start."
-        )
-        sys.exit(1)  # Exit if there's nothing to do
+async def main() -> int:
+    print("🚀 Starting scraping task scheduler...")
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+    async with httpx.AsyncClient(base_url=API_BASE_URL, limits=limits) as client:
+        scheduler = AdaptiveScheduler(client)
+        # Obtain sources dynamically
+        sources_to_scrape = await scheduler.get_dynamic_sources()
+        if not sources_to_scrape:
+            print(
+                "❌ Could not obtain sources from the API or the list is empty. "
+                "The scheduler will not start."
+            )
+            return 1  # Exit if there's nothing to do
 
-    print(f"✅ Scheduler ready. Tasks will run for: {', '.join(sources_to_scrape)}.")
-    print("Each task will run every 2 minutes.")
+        print(f"✅ Scheduler ready. Tasks will run for: {', '.join(sources_to_scrape)}.")
+        print(f"Intervals adapt between {MIN_INTERVAL:.0f}s and {MAX_INTERVAL:.0f}s (default {BASE_INTERVAL:.0f}s).")
+        await scheduler.run(sources_to_scrape)
+    return 0
 
-    # Schedule execution for each source
-    for src in sources_to_scrape:
-        schedule.every(2).minutes.do(trigger_scraping_job, source=src)
 
-    # Infinite loop to keep the scheduler running
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+if __name__ == "__main__":
+    try:
+        sys.exit(asyncio.run(main()))
+    except KeyboardInterrupt:
+        pass